@@ -0,0 +1,3 @@
+"""
+Scripts de benchmark da aplicação de processamento multimídia.
+"""
@@ -0,0 +1,95 @@
+"""
+Benchmark do tempo até a primeira saída dos modelos, com e sem pesos mapeados.
+
+Cada medida roda em um processo novo, como em uma nova execução do programa:
+o tempo inclui o carregamento dos pesos, a montagem da rede e uma primeira
+inferência pequena, mas não a importação das bibliotecas.
+
+Uso:
+    python -m benchmarks.model_startup [--upscale-model ARQ]
+                                       [--whisper-model NOME] [--runs N]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Código executado em cada processo filho
+UPSCALE_CHILD = """
+import json, sys, time
+import numpy as np
+from config.settings import MODEL_REGISTRY
+from core.image_enhancer import ImageEnhancer
+MODEL_REGISTRY['mmap_weights'] = sys.argv[2] == '1'
+inicio = time.perf_counter()
+enhancer = ImageEnhancer(model_path=sys.argv[1], tile=0, use_cache=False)
+enhancer.enhance_array(np.zeros((32, 32, 3), dtype=np.uint8))
+print(json.dumps(time.perf_counter() - inicio))
+"""
+
+WHISPER_CHILD = """
+import json, sys, time
+import torch
+from config.settings import MODEL_REGISTRY
+from core.transcriber import Transcriber
+MODEL_REGISTRY['mmap_weights'] = sys.argv[2] == '1'
+inicio = time.perf_counter()
+modelo, _ = Transcriber(model_name=sys.argv[1]).load_model()
+with torch.no_grad():
+    modelo.embed_audio(torch.zeros(1, modelo.dims.n_mels, 3000))
+print(json.dumps(time.perf_counter() - inicio))
+"""
+
+
+def measure(codigo, model, mmap, runs):
+    """
+    Mede o tempo até a primeira saída em processos novos.
+
+    Args:
+        codigo (str): Código do processo filho.
+        model (str): Modelo passado ao processo filho.
+        mmap (bool): Se os pesos mapeados devem ser usados.
+        runs (int): Número de processos medidos.
+
+    Returns:
+        float: Mediana dos tempos, em segundos.
+    """
+    tempos = []
+    for _ in range(runs):
+        saida = subprocess.run(
+            [sys.executable, '-c', codigo, model, '1' if mmap else '0'],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        tempos.append(json.loads(saida.stdout.strip().splitlines()[-1]))
+    return statistics.median(tempos)
+
+
+def main():
+    """Compara o carregamento original com o mapeado para cada modelo."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--upscale-model', default='auto')
+    parser.add_argument('--whisper-model', default=None)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    casos = [('upscale', UPSCALE_CHILD, args.upscale_model)]
+    if args.whisper_model:
+        casos.append(('whisper', WHISPER_CHILD, args.whisper_model))
+
+    for nome, codigo, model in casos:
+        # A primeira execução com mmap converte os pesos; não entra na média
+        measure(codigo, model, True, 1)
+        original = measure(codigo, model, False, args.runs)
+        mapeado = measure(codigo, model, True, args.runs)
+        print(
+            f'{nome:8s} original {original:.3f} s, mapeado {mapeado:.3f} s '
+            f'({original / mapeado:.2f}x)'
+        )
+
+
+if __name__ == '__main__':
+    main()
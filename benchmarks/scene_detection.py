@@ -0,0 +1,145 @@
+"""
+Benchmark da detecção de cenas: busca exaustiva vs. duas passagens.
+
+Uso:
+    python -m benchmarks.scene_detection VIDEO [--step N] [--threshold T]
+    python -m benchmarks.scene_detection --synthetic
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from core.frame_extractor import FrameExtractor
+
+
+def create_synthetic_video(path, num_frames=3000, fps=30, num_cuts=20):
+    """
+    Gera um vídeo com cortes secos em posições conhecidas.
+
+    Args:
+        path (str): Caminho do vídeo a ser criado.
+        num_frames (int, optional): Número total de frames.
+        fps (int, optional): Taxa de quadros.
+        num_cuts (int, optional): Número de cortes.
+
+    Returns:
+        list: Índices dos frames onde cada corte acontece.
+    """
+    rng = np.random.default_rng(0)
+    cortes = sorted(
+        rng.choice(np.arange(60, num_frames), num_cuts, replace=False)
+    )
+    writer = cv2.VideoWriter(
+        path, cv2.VideoWriter_fourcc(*'MJPG'), fps, (640, 360)
+    )
+
+    def nova_cena():
+        # Conteúdo suave: o movimento lento fica abaixo do limiar
+        ruido = rng.integers(0, 255, (360, 640, 3), dtype=np.uint8)
+        suave = cv2.GaussianBlur(ruido, (0, 0), 25)
+        return cv2.normalize(suave, None, 0, 255, cv2.NORM_MINMAX)
+
+    base = nova_cena()
+    for indice in range(num_frames):
+        if indice in cortes:
+            base = nova_cena()
+        frame = np.roll(base, indice % 640, axis=1)
+        writer.write(frame)
+
+    writer.release()
+    return [int(c) for c in cortes]
+
+
+def compare_cuts(reference, candidate, tolerance=2):
+    """
+    Conta quantos cortes de referência têm correspondente dentro da tolerância.
+
+    Returns:
+        int: Número de cortes encontrados pelos dois métodos.
+    """
+    return sum(
+        1
+        for corte in reference
+        if any(abs(corte - outro) <= tolerance for outro in candidate)
+    )
+
+
+def precision_recall(truth, detected, tolerance=2):
+    """
+    Compara cortes detectados com os cortes verdadeiros.
+
+    Args:
+        truth (list): Índices dos cortes verdadeiros.
+        detected (list): Índices detectados.
+        tolerance (int, optional): Distância máxima, em frames, de um acerto.
+
+    Returns:
+        tuple: (precisão, revocação), entre 0 e 1.
+    """
+    acertos = compare_cuts(truth, detected, tolerance)
+    corretos = compare_cuts(detected, truth, tolerance)
+    precisao = corretos / len(detected) if detected else 1.0
+    revocacao = acertos / len(truth) if truth else 1.0
+    return precisao, revocacao
+
+
+def main():
+    """Executa os dois detectores sobre o mesmo vídeo e compara o resultado."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('video', nargs='?', help='Vídeo a ser analisado')
+    parser.add_argument('--synthetic', action='store_true')
+    parser.add_argument('--step', type=int, default=None)
+    parser.add_argument('--threshold', type=float, default=None)
+    args = parser.parse_args()
+
+    verdade = None
+    if args.synthetic or not args.video:
+        video_path = os.path.join(tempfile.gettempdir(), 'bench_cenas.avi')
+        verdade = create_synthetic_video(video_path)
+    else:
+        video_path = args.video
+
+    extractor = FrameExtractor()
+
+    inicio = time.perf_counter()
+    exaustivo = extractor.find_cuts_exhaustive(
+        video_path, diff_threshold=args.threshold
+    )
+    tempo_exaustivo = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    duas_passagens = extractor.find_cuts_two_pass(
+        video_path, diff_threshold=args.threshold, coarse_step=args.step
+    )
+    tempo_duas_passagens = time.perf_counter() - inicio
+
+    iguais = compare_cuts(exaustivo, duas_passagens)
+
+    print(f'Vídeo: {video_path}')
+    print(f'Exaustivo:       {tempo_exaustivo:8.2f}s  {len(exaustivo)} cortes')
+    print(
+        f'Duas passagens:  {tempo_duas_passagens:8.2f}s  '
+        f'{len(duas_passagens)} cortes'
+    )
+    print(f'Aceleração:      {tempo_exaustivo / tempo_duas_passagens:8.2f}x')
+    print(f'Cortes coincidentes (±2 frames): {iguais}/{len(exaustivo)}')
+
+    if verdade is not None:
+        for nome, cortes in (
+            ('Exaustivo', exaustivo),
+            ('Duas passagens', duas_passagens),
+        ):
+            precisao, revocacao = precision_recall(verdade, cortes)
+            print(
+                f'{nome + ":":16s} precisão {precisao:.2f}  '
+                f'revocação {revocacao:.2f} ({len(verdade)} cortes reais)'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark da transcrição sequencial contra a decodificação em lotes.
+
+Transcreve o mesmo áudio com o caminho sequencial (whisper.transcribe em
+blocos) e com a decodificação em lotes para cada tamanho de lote pedido,
+no mesmo processo e com o modelo já carregado, e mostra o fator de tempo
+real (tempo de processamento / duração do áudio) de cada um.
+
+Uso:
+    python -m benchmarks.transcription_batching ARQUIVO [--model NOME]
+                                                [--preset NOME]
+                                                [--batch-sizes 1,4,8]
+"""
+
+import argparse
+import time
+
+import torch
+import whisper
+
+from config.settings import TRANSCRIPTION_SETTINGS
+from core.transcriber import Transcriber
+from core.voice_activity import SAMPLE_RATE
+
+
+def measure(transcriber, audio):
+    """
+    Mede o tempo de uma transcrição completa do áudio.
+
+    Args:
+        transcriber (Transcriber): Transcritor configurado.
+        audio (numpy.ndarray): Amostras a 16 kHz.
+
+    Returns:
+        tuple: (segundos, número de segmentos).
+    """
+    inicio = time.perf_counter()
+    resultado = transcriber._transcribe_audio(audio)
+    return time.perf_counter() - inicio, len(resultado['segments'])
+
+
+def main():
+    """Compara o caminho sequencial com os tamanhos de lote pedidos."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('audio')
+    parser.add_argument('--model', default=None)
+    parser.add_argument('--preset', default='fast')
+    parser.add_argument('--batch-sizes', default='1,4,8')
+    args = parser.parse_args()
+
+    audio = whisper.load_audio(args.audio)
+    duracao = len(audio) / SAMPLE_RATE
+    torch.set_num_threads(Transcriber._thread_budget())
+
+    casos = [('sequencial', False, None)] + [
+        (f'lote {n}', True, int(n)) for n in args.batch_sizes.split(',')
+    ]
+    for nome, batched, tamanho in casos:
+        if tamanho:
+            TRANSCRIPTION_SETTINGS['batch_size'] = tamanho
+        transcriber = Transcriber(
+            model_name=args.model,
+            preset=args.preset,
+            use_cache=False,
+            use_batch=batched,
+        )
+        transcriber.load_model()
+        segundos, segmentos = measure(transcriber, audio)
+        print(
+            f'{nome:12s} {segundos:7.2f} s  RTF {segundos / duracao:.3f}  '
+            f'{segmentos} segmentos'
+        )
+
+
+if __name__ == '__main__':
+    main()
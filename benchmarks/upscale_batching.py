@@ -0,0 +1,70 @@
+"""
+Benchmark do upscaling em lote: vazão em megapixels por segundo.
+
+Uso:
+    python -m benchmarks.upscale_batching [--width W] [--height H] [--images N]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from core.image_enhancer import ImageEnhancer
+
+
+def measure_throughput(enhancer, arrays, batch_size):
+    """
+    Mede a vazão de enhance_arrays para um tamanho de lote.
+
+    Args:
+        enhancer (ImageEnhancer): Aprimorador com o modelo carregado.
+        arrays (list): Imagens de teste.
+        batch_size (int): Imagens por passagem da rede.
+
+    Returns:
+        float: Megapixels de entrada processados por segundo.
+    """
+    inicio = time.perf_counter()
+    for i in range(0, len(arrays), batch_size):
+        enhancer.enhance_arrays(arrays[i : i + batch_size])
+    duracao = time.perf_counter() - inicio
+
+    megapixels = sum(a.shape[0] * a.shape[1] for a in arrays) / 1e6
+    return megapixels / duracao
+
+
+def main():
+    """Compara a vazão com lotes de 1, 4 e 8 imagens."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--width', type=int, default=160)
+    parser.add_argument('--height', type=int, default=120)
+    parser.add_argument('--images', type=int, default=16)
+    parser.add_argument('--scale', type=int, default=4)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    arrays = [
+        rng.integers(0, 255, (args.height, args.width, 3), dtype=np.uint8)
+        for _ in range(args.images)
+    ]
+
+    enhancer = ImageEnhancer(scale=args.scale)
+    enhancer.load_model()
+
+    # Aquecimento para não medir a primeira alocação
+    enhancer.enhance_arrays(arrays[:1])
+
+    print(
+        f'{args.images} imagens de {args.width}x{args.height}, '
+        f'escala {args.scale}x'
+    )
+    base = None
+    for batch_size in (1, 4, 8):
+        vazao = measure_throughput(enhancer, arrays, batch_size)
+        base = base or vazao
+        print(f'Lote {batch_size}: {vazao:.4f} MP/s ({vazao / base:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
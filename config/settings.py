@@ -15,6 +15,14 @@ LOG_DIR = os.path.join(BASE_DIR, 'logs')
 if not getattr(sys, 'frozen', False):
     os.makedirs(LOG_DIR, exist_ok=True)
 
+# Diretório de caches persistentes (calibração, resultados). No executável
+# compilado BASE_DIR é a pasta temporária do pacote, então o cache fica ao
+# lado do executável, como os logs (ver utils/logging_utils.py)
+if getattr(sys, 'frozen', False):
+    CACHE_DIR = os.path.join(os.path.dirname(sys.executable), 'cache')
+else:
+    CACHE_DIR = os.path.join(BASE_DIR, 'cache')
+
 # Configurações de vídeo
 VIDEO_SETTINGS = {
     'silence_threshold': -53,
@@ -33,16 +41,100 @@ FRAME_EXTRACTION = {
     'max_frames': 100,
     'default_interval': 180,
     'min_scene_length': 30,
+    'diff_threshold': 30,
+    'coarse_step': 10,  # Passo (em frames) da passagem grossa
+    'coarse_width': 160,  # Largura usada na passagem grossa
+    'coarse_threshold_ratio': 0.8,  # Fração do limiar na passagem grossa
 }
 
 # Configurações de upscaling de imagens
-UPSCALE_SETTINGS = {'model_name': 'RealESRGAN_x4plus.pth', 'scale': 4}
+UPSCALE_SETTINGS = {
+    'model_name': 'auto',  # Arquivo em models/ ou 'auto' (mais barato)
+    'scale': 4,
+    'tile': 'auto',  # Tamanho do tile em pixels, 0 (sem tiles) ou 'auto'
+    'tile_pad': 10,  # Sobreposição entre tiles para evitar emendas
+    'memory_budget': 0.5,  # Fração da memória livre usada pelo modo 'auto'
+    'batch_size': 4,  # Imagens por passagem da rede em process_directory
+    'bucket_size': 64,  # Múltiplo para agrupar tamanhos (1 = só idênticos)
+    'read_workers': 2,  # Threads que decodificam as próximas imagens
+    'write_workers': 2,  # Threads que codificam e salvam os resultados
+    'queue_depth': 4,  # Unidades decodificadas/pendentes de gravação
+    # Backend em CPU: eager, channels_last, bf16, torchscript, compile, onnx
+    'backend': 'eager',
+    'workers': 'auto',  # Processos em process_directory (1 ou 'auto')
+    'calibration_images': 4,  # Imagens (distintas) por candidato na calibração
+    'stream_min_megapixels': 24,  # A partir daqui, processar em faixas
+    'stream_strip_pixels': 1000000,  # Pixels de entrada por faixa
+    'stream_overlap': 16,  # Linhas de sobreposição entre faixas
+    'resize_only_max_scale': 1.25,  # Até este fator, só Lanczos (modo alvo)
+    'result_cache': True,  # Reaproveitar resultados de imagens idênticas
+    'result_cache_mb': 2048,  # Tamanho máximo do cache de resultados
+    'video_codec': 'libx264',  # Codec de vídeo da saída (ffmpeg)
+    'video_crf': 18,  # Qualidade do vídeo de saída (menor é melhor)
+    'video_audio_codec': 'copy',  # Áudio copiado do vídeo original
+    'video_static_tolerance': 2,  # Diferença máxima para repetir um quadro
+}
 
 # Configurações de transcrição
 TRANSCRIPTION_SETTINGS = {
     'model': 'base',  # Modelo Whisper
-    'language': 'pt',  # Idioma padrão
+    'language': 'pt',  # Idioma padrão ('auto' detecta uma vez por arquivo)
     'threads': 12,  # Número de threads para processamento
+    'vad': False,  # Transcrever apenas os trechos com fala
+    'vad_margin_db': 12,  # Energia acima do ruído de fundo para ser fala
+    'vad_min_silence': 1.0,  # Pausas menores (s) não dividem a fala
+    'vad_min_speech': 0.25,  # Trechos de fala menores (s) são ignorados
+    'vad_padding': 0.3,  # Margem (s) mantida antes e depois da fala
+    'vad_max_window': 30,  # Segundos de fala por chamada ao Whisper
+    'long_file_minutes': 20,  # A partir daqui, dividir entre processos
+    'chunk_minutes': 5,  # Duração aproximada de cada parte
+    'chunk_search_seconds': 30,  # Distância máxima do corte ao alvo
+    'chunk_overlap': 2.0,  # Segundos repetidos entre partes vizinhas
+    'worker_threads': 4,  # Threads por processo no modo de arquivo longo
+    'preset': 'balanced',  # Preset de decodificação (TRANSCRIPTION_PRESETS)
+    'cache': True,  # Reaproveitar transcrições do mesmo arquivo e opções
+    'cache_mb': 256,  # Tamanho máximo do cache de transcrições
+    'stream_block_seconds': 60,  # Áudio por bloco gravado/reportado
+    'checkpoint': True,  # Gravar pontos de retomada de transcrições
+    'checkpoint_interval': 60,  # Segundos entre pontos de retomada
+    'checkpoint_max_days': 7,  # Pontos mais antigos são descartados
+    'batched': False,  # Decodificar janelas de 30 s em lotes (sem contexto)
+    'batch_size': 8,  # Janelas por lote na decodificação em lotes
+    'language_candidates': 9,  # Janelas de 30 s lidas para detectar o idioma
+    'language_samples': 3,  # Janelas com mais fala usadas na detecção
+}
+
+# Presets de decodificação do Whisper, do mais rápido ao mais preciso
+_TEMPERATURE_FALLBACK = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+TRANSCRIPTION_PRESETS = {
+    # Busca gulosa, sem novas tentativas e sem contexto entre janelas
+    'fast': {
+        'temperature': 0.0,
+        'beam_size': None,
+        'best_of': None,
+        'condition_on_previous_text': False,
+    },
+    # Padrão do whisper: busca gulosa com novas tentativas amostradas
+    'balanced': {
+        'temperature': _TEMPERATURE_FALLBACK,
+        'beam_size': None,
+        'best_of': 5,
+        'condition_on_previous_text': True,
+    },
+    # Beam search com novas tentativas
+    'accurate': {
+        'temperature': _TEMPERATURE_FALLBACK,
+        'beam_size': 5,
+        'best_of': 5,
+        'condition_on_previous_text': True,
+    },
+}
+
+# Cache de modelos compartilhado entre abas e execuções
+MODEL_REGISTRY = {
+    'max_memory_mb': 4096,  # Limite de memória dos modelos em cache
+    'idle_timeout': 600,  # Segundos ociosos até descarregar (0 desativa)
+    'mmap_weights': True,  # Converter pesos uma vez e lê-los com mmap
 }
 
 # Extensões suportadas
@@ -0,0 +1,226 @@
+"""
+Decodificação do Whisper em lotes de janelas independentes de até 30 s.
+"""
+
+import torch
+import whisper
+from whisper.audio import HOP_LENGTH, N_FFT, N_SAMPLES, mel_filters
+from whisper.tokenizer import get_tokenizer
+
+from core.voice_activity import SAMPLE_RATE, find_split_points, group_windows
+
+# Duração máxima de uma janela (a entrada do codificador do Whisper)
+WINDOW_SECONDS = 30.0
+
+# Segundos por token de tempo do Whisper
+TIME_PRECISION = 0.02
+
+# Limites usados por whisper.transcribe para repetir uma janela com
+# temperatura maior ou considerá-la silêncio
+COMPRESSION_RATIO_THRESHOLD = 2.4
+LOGPROB_THRESHOLD = -1.0
+NO_SPEECH_THRESHOLD = 0.6
+
+
+def log_mel_batch(recortes, n_mels, device):
+    """
+    Calcula o espectrograma log-mel de várias janelas de uma vez.
+
+    Equivale a whisper.log_mel_spectrogram aplicado a cada janela
+    completada com zeros até 30 s, mas com uma única STFT para o lote; a
+    normalização usa o máximo de cada janela, não o do lote.
+
+    Args:
+        recortes (list): Amostras (numpy.ndarray a 16 kHz) de cada janela.
+        n_mels (int): Número de bandas mel do modelo.
+        device (str): Dispositivo do cálculo.
+
+    Returns:
+        torch.Tensor: Espectrogramas (janelas, n_mels, 3000).
+    """
+    audio = torch.stack(
+        [whisper.pad_or_trim(torch.from_numpy(r), N_SAMPLES) for r in recortes]
+    ).to(device)
+    stft = torch.stft(
+        audio,
+        N_FFT,
+        HOP_LENGTH,
+        window=torch.hann_window(N_FFT, device=device),
+        return_complex=True,
+    )
+    magnitudes = stft[..., :-1].abs() ** 2
+    log_spec = torch.clamp(
+        mel_filters(device, n_mels) @ magnitudes, min=1e-10
+    ).log10()
+    log_spec = torch.maximum(
+        log_spec, log_spec.amax(dim=(-2, -1), keepdim=True) - 8.0
+    )
+    return (log_spec + 4.0) / 4.0
+
+
+def split_windows(audio, trechos):
+    """
+    Agrupa trechos do áudio em janelas de no máximo WINDOW_SECONDS.
+
+    Trechos mais longos que uma janela são divididos antes nos pontos
+    mais silenciosos (find_split_points), para não cortar palavras.
+
+    Args:
+        audio (numpy.ndarray): Amostras a 16 kHz.
+        trechos (list): Pares (inicio, fim) em segundos a transcrever.
+
+    Returns:
+        list: Listas de pares (inicio, fim), uma por janela.
+    """
+    partes = []
+    for inicio, fim in trechos:
+        if fim - inicio <= WINDOW_SECONDS:
+            partes.append((inicio, fim))
+            continue
+
+        recorte = audio[int(inicio * SAMPLE_RATE) : int(fim * SAMPLE_RATE)]
+        cortes = [
+            inicio + corte / SAMPLE_RATE
+            for corte in find_split_points(
+                recorte, WINDOW_SECONDS - 3, 3, SAMPLE_RATE
+            )
+        ]
+        limites = [inicio] + cortes + [fim]
+        partes.extend(zip(limites, limites[1:]))
+    return group_windows(partes, WINDOW_SECONDS)
+
+
+def tokens_to_segments(tokens, tokenizer, duracao):
+    """
+    Converte os tokens de uma janela em segmentos com tempos.
+
+    Cada segmento é um token de tempo inicial, o texto e um token de tempo
+    final; texto sem tempo final termina no fim da janela.
+
+    Args:
+        tokens (list): Tokens decodificados (texto e tempos).
+        tokenizer (whisper.tokenizer.Tokenizer): Tokenizador do modelo.
+        duracao (float): Duração da janela, em segundos.
+
+    Returns:
+        list: Dicionários com 'start', 'end', 'text' e 'tokens', com
+              tempos relativos à janela.
+    """
+    segmentos = []
+    inicio = 0.0
+    texto = []
+    for token in list(tokens) + [None]:
+        if token is not None and token < tokenizer.timestamp_begin:
+            texto.append(token)
+            continue
+
+        if token is None:
+            tempo = duracao
+        else:
+            tempo = (token - tokenizer.timestamp_begin) * TIME_PRECISION
+        if texto:
+            segmentos.append(
+                {
+                    'start': min(inicio, duracao),
+                    'end': min(max(tempo, inicio), duracao),
+                    'text': tokenizer.decode(texto),
+                    'tokens': texto,
+                }
+            )
+            texto = []
+        inicio = tempo
+    return segmentos
+
+
+def decode_batch(model, recortes, language, preset, fp16):
+    """
+    Transcreve um lote de janelas independentes de uma só vez.
+
+    O lote passa pelo codificador uma única vez e pelo decodificador com
+    todas as janelas juntas. As janelas cujo resultado falha nos limites de
+    whisper.transcribe (texto repetitivo ou pouco provável) são
+    decodificadas de novo, também juntas, com a próxima temperatura do
+    preset; as que parecem silêncio não geram segmentos.
+
+    Args:
+        model (whisper.model.Whisper): Modelo carregado.
+        recortes (list): Amostras de cada janela (no máximo 30 s).
+        language (str or None): Idioma (None detecta em cada janela).
+        preset (dict): Preset de TRANSCRIPTION_PRESETS.
+        fp16 (bool): Usar meia precisão.
+
+    Returns:
+        list: Segmentos de cada janela, com tempos relativos à janela.
+    """
+    temperaturas = preset['temperature']
+    if not isinstance(temperaturas, (list, tuple)):
+        temperaturas = (temperaturas,)
+    tokenizer = get_tokenizer(
+        model.is_multilingual,
+        num_languages=model.num_languages,
+        language=language,
+        task='transcribe',
+    )
+
+    mel = log_mel_batch(recortes, model.dims.n_mels, model.device)
+    with torch.no_grad():
+        features = model.embed_audio(mel.half() if fp16 else mel)
+
+    resultados = [None] * len(recortes)
+    pendentes = list(range(len(recortes)))
+    for temperatura in temperaturas:
+        opcoes = whisper.DecodingOptions(
+            language=language,
+            temperature=temperatura,
+            beam_size=preset['beam_size'] if temperatura == 0 else None,
+            best_of=preset['best_of'] if temperatura > 0 else None,
+            fp16=fp16,
+        )
+        if (opcoes.beam_size or opcoes.best_of or 1) > 1:
+            # whisper.decode não replica as features de cada janela para os
+            # vários candidatos (beam search / best_of) quando há mais de
+            # uma janela: nesse caso, uma janela por chamada
+            decodificados = [
+                whisper.decode(model, features[i], opcoes) for i in pendentes
+            ]
+        else:
+            decodificados = whisper.decode(model, features[pendentes], opcoes)
+
+        falhas = []
+        for i, resultado in zip(pendentes, decodificados):
+            resultados[i] = resultado
+            if not _is_silence(resultado) and (
+                resultado.compression_ratio > COMPRESSION_RATIO_THRESHOLD
+                or resultado.avg_logprob < LOGPROB_THRESHOLD
+            ):
+                falhas.append(i)
+        pendentes = falhas
+        if not pendentes:
+            break
+
+    saida = []
+    for recorte, resultado in zip(recortes, resultados):
+        if _is_silence(resultado):
+            saida.append([])
+            continue
+
+        segmentos = tokens_to_segments(
+            resultado.tokens, tokenizer, len(recorte) / SAMPLE_RATE
+        )
+        for segmento in segmentos:
+            segmento.update(
+                temperature=resultado.temperature,
+                avg_logprob=resultado.avg_logprob,
+                compression_ratio=resultado.compression_ratio,
+                no_speech_prob=resultado.no_speech_prob,
+            )
+        saida.append(segmentos)
+    return saida
+
+
+def _is_silence(resultado):
+    """Indica se uma janela decodificada deve ser tratada como silêncio."""
+    return (
+        resultado.no_speech_prob > NO_SPEECH_THRESHOLD
+        and resultado.avg_logprob < LOGPROB_THRESHOLD
+    )
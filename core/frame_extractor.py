@@ -3,7 +3,10 @@ Módulo para extração de frames-chave de vídeos.
 """
 
 import os
+import time
+import itertools
 import cv2
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from scenedetect import open_video, SceneManager
 from scenedetect.detectors import ContentDetector, ThresholdDetector
 from scenedetect.scene_manager import save_images
@@ -14,24 +17,252 @@ from utils.logging_utils import (
     log_process_start,
     log_process_end,
 )
-from utils.file_utils import ensure_dir_exists
+from utils.file_utils import ensure_dir_exists, is_supported_file
+from utils.video_stream import sample_frames
 
 logger = setup_logger('frame_extractor')
 
 
+def parse_timecode(value):
+    """
+    Converte um tempo em texto para segundos.
+
+    Args:
+        value (str): Tempo em segundos ('75.5') ou no formato 'MM:SS' /
+                     'HH:MM:SS'. Texto vazio significa sem limite.
+
+    Returns:
+        float or None: Tempo em segundos, ou None se não informado.
+    """
+    value = (value or '').strip()
+    if not value:
+        return None
+
+    segundos = 0.0
+    for parte in value.split(':'):
+        segundos = segundos * 60 + float(parte)
+
+    if segundos < 0:
+        raise ValueError(f'Tempo inválido: {value}')
+    return segundos
+
+
+def parse_roi(value):
+    """
+    Converte uma região de interesse em texto para tupla.
+
+    Args:
+        value (str): Região no formato 'x,y,largura,altura'. Texto vazio
+                     significa o frame inteiro.
+
+    Returns:
+        tuple or None: (x, y, largura, altura), ou None se não informada.
+    """
+    value = (value or '').strip()
+    if not value:
+        return None
+
+    partes = [int(p) for p in value.replace(' ', '').split(',')]
+    if len(partes) != 4:
+        raise ValueError(
+            f'Região de interesse deve ter 4 valores (x,y,largura,altura): {value}'
+        )
+    return tuple(partes)
+
+
+# Métodos de extração disponíveis para processamento em lote
+EXTRACTION_METHODS = {
+    'cenas': 'extract_keyframes',
+    'regulares': 'extract_regular_frames',
+    'diferenca': 'detect_scenes_by_diff',
+    'duas_passagens': 'detect_scenes_two_pass',
+}
+
+
+def _init_batch_worker():
+    """Inicializa um processo do lote sem paralelismo interno do OpenCV."""
+    # Cada processo já ocupa um núcleo; threads extras só disputariam CPU
+    cv2.setNumThreads(1)
+
+
+def _image_mtimes(directory):
+    """Data de modificação (ns) de cada imagem de um diretório, se existir."""
+    if not os.path.isdir(directory):
+        return {}
+    return {
+        entrada.name: entrada.stat().st_mtime_ns
+        for entrada in os.scandir(directory)
+        if is_supported_file(entrada.name, 'image')
+    }
+
+
+def _run_batch_item(extractor, method, video_path, output_dir, kwargs):
+    """
+    Executa um método de extração para um vídeo do lote.
+
+    Função de módulo para poder ser enviada a um processo do pool.
+
+    Returns:
+        dict: Resultado do vídeo (frames salvos nesta execução, frames
+              analisados, tempo e erro, se houver).
+    """
+    resultado = {
+        'video_path': video_path,
+        'output_dir': output_dir,
+        'frames_saved': 0,
+        'frames_analyzed': 0,
+        'duration': 0.0,
+        'error': None,
+    }
+    inicio = time.time()
+
+    try:
+        antes = _image_mtimes(output_dir)
+        getattr(extractor, EXTRACTION_METHODS[method])(
+            video_path, output_dir=output_dir, **kwargs
+        )
+        # Só as imagens gravadas agora: a pasta pode ter as de outra execução
+        depois = _image_mtimes(output_dir)
+        resultado['frames_saved'] = sum(
+            1 for nome, mtime in depois.items() if antes.get(nome) != mtime
+        )
+        resultado['frames_analyzed'] = extractor.count_frames(video_path)
+    except Exception as e:
+        resultado['error'] = str(e)
+
+    resultado['duration'] = time.time() - inicio
+    return resultado
+
+
 class FrameExtractor:
     """Classe para extração de frames de vídeos."""
 
-    def __init__(self, threshold=None, max_frames=None):
+    def __init__(
+        self, threshold=None, max_frames=None, start=None, end=None, roi=None
+    ):
         """
         Inicializa o extrator de frames com os parâmetros especificados.
 
         Args:
             threshold (float, optional): Limiar para detecção de cenas.
             max_frames (int, optional): Número máximo aproximado de frames desejado.
+            start (float, optional): Início do trecho analisado, em segundos.
+            end (float, optional): Fim do trecho analisado, em segundos.
+            roi (tuple, optional): Região de interesse (x, y, largura, altura)
+                                   usada no cálculo das métricas de cena.
         """
         self.threshold = threshold or FRAME_EXTRACTION['threshold']
         self.max_frames = max_frames or FRAME_EXTRACTION['max_frames']
+        self.start = start
+        self.end = end
+        self.roi = roi
+        # Região ajustada ao tamanho dos frames do vídeo aberto
+        self._frame_roi = roi
+
+        if (
+            self.start is not None
+            and self.end is not None
+            and self.end <= self.start
+        ):
+            raise ValueError(
+                f'Fim ({self.end}s) deve ser maior que o início ({self.start}s).'
+            )
+        if self.roi is not None:
+            x, y, largura, altura = self.roi
+            if x < 0 or y < 0 or largura <= 0 or altura <= 0:
+                raise ValueError(f'Região de interesse inválida: {self.roi}')
+
+    def _open_capture(self, video_path):
+        """
+        Abre o vídeo com OpenCV já posicionado no início do trecho.
+
+        Args:
+            video_path (str): Caminho para o arquivo de vídeo.
+
+        Returns:
+            tuple: (cap, start_frame, end_frame) - O VideoCapture, o índice do
+                   primeiro frame do trecho e o índice onde a leitura deve
+                   parar (None para ler até o fim).
+        """
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            logger.error(f'Não foi possível abrir o vídeo {video_path}')
+            raise ValueError(f'Não foi possível abrir o vídeo {video_path}')
+
+        if self.roi is not None:
+            try:
+                self._frame_roi = self._fit_roi(
+                    int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                    int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                )
+            except ValueError:
+                cap.release()
+                raise
+
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        start_frame = int(round(self.start * fps)) if self.start else 0
+        end_frame = (
+            int(round(self.end * fps)) if self.end is not None else None
+        )
+
+        if start_frame > 0:
+            # Buscar diretamente o início em vez de decodificar até ele
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+            logger.info(
+                f'Posicionado em {self.start:.2f}s (frame {start_frame}).'
+            )
+
+        return cap, start_frame, end_frame
+
+    def _fit_roi(self, largura, altura):
+        """
+        Ajusta a região de interesse ao tamanho dos frames do vídeo.
+
+        Uma região que passa da borda é reduzida até ela, com um aviso.
+
+        Args:
+            largura (int): Largura dos frames (0 se desconhecida).
+            altura (int): Altura dos frames (0 se desconhecida).
+
+        Returns:
+            tuple: Região (x, y, largura, altura) dentro do frame.
+
+        Raises:
+            ValueError: Se a região começar fora do frame.
+        """
+        x, y, w, h = self.roi
+        if largura <= 0 or altura <= 0:
+            return tuple(self.roi)
+
+        if x >= largura or y >= altura:
+            raise ValueError(
+                f'Região de interesse {self.roi} fora do frame '
+                f'({largura}x{altura}).'
+            )
+
+        ajustada = (x, y, min(w, largura - x), min(h, altura - y))
+        if ajustada != tuple(self.roi):
+            logger.warning(
+                f'Região de interesse {self.roi} passa da borda do frame '
+                f'({largura}x{altura}); usando {ajustada}.'
+            )
+        return ajustada
+
+    def _crop_roi(self, frame):
+        """
+        Recorta a região de interesse de um frame, se configurada.
+
+        Args:
+            frame (numpy.ndarray): Frame completo.
+
+        Returns:
+            numpy.ndarray: Recorte do frame (uma view, sem cópia).
+        """
+        if self._frame_roi is None:
+            return frame
+
+        x, y, largura, altura = self._frame_roi
+        return frame[y : y + altura, x : x + largura]
 
     def extract_keyframes(
         self, video_path, output_dir=None, usar_threshold_detector=False
@@ -60,13 +291,28 @@ class FrameExtractor:
             output_dir=output_dir,
             threshold=self.threshold,
             usar_threshold_detector=usar_threshold_detector,
+            start=self.start,
+            end=self.end,
+            roi=self.roi,
         )
 
         try:
             logger.info('Abrindo o vídeo...')
             video = open_video(video_path)
+            if self.start:
+                # Inteiros seriam interpretados como número de frame
+                video.seek(float(self.start))
 
             scene_manager = SceneManager()
+            if self.roi is not None:
+                # O SceneManager usa coordenadas inclusivas (X0, Y0, X1, Y1)
+                x, y, largura, altura = self._fit_roi(*video.frame_size)
+                scene_manager.crop = (
+                    x,
+                    y,
+                    x + largura - 1,
+                    y + altura - 1,
+                )
 
             # Escolher o detector com base no parâmetro
             if usar_threshold_detector:
@@ -87,7 +333,11 @@ class FrameExtractor:
             logger.info(
                 'Detectando cenas... Isso pode levar algum tempo para vídeos longos.'
             )
-            scene_manager.detect_scenes(video=video, show_progress=True)
+            scene_manager.detect_scenes(
+                video=video,
+                end_time=float(self.end) if self.end is not None else None,
+                show_progress=True,
+            )
 
             lista_cenas = scene_manager.get_scene_list()
             num_cenas = len(lista_cenas)
@@ -147,32 +397,32 @@ class FrameExtractor:
             video_path=video_path,
             output_dir=output_dir,
             intervalo=intervalo,
+            start=self.start,
+            end=self.end,
         )
 
         try:
             logger.info(f'Salvando frames regulares do vídeo: {video_path}')
 
-            cap = cv2.VideoCapture(video_path)
-            if not cap.isOpened():
-                logger.error(f'Não foi possível abrir o vídeo {video_path}')
-                raise ValueError(
-                    f'Não foi possível abrir o vídeo {video_path}'
-                )
+            cap, start_frame, end_frame = self._open_capture(video_path)
 
-            frame_count = 0
+            frame_count = start_frame
             saved_count = 0
 
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    break
+            while end_frame is None or frame_count < end_frame:
+                if (frame_count - start_frame) % intervalo == 0:
+                    ret, frame = cap.read()
+                    if not ret:
+                        break
 
-                if frame_count % intervalo == 0:
                     frame_path = os.path.join(
                         output_dir, f'frame_{frame_count:06d}.jpg'
                     )
                     cv2.imwrite(frame_path, frame)
                     saved_count += 1
+                elif not cap.grab():
+                    # Frames descartados não precisam ser convertidos
+                    break
 
                 frame_count += 1
 
@@ -214,7 +464,7 @@ class FrameExtractor:
             output_dir = os.path.join(base_dir, 'cenas_detectadas')
 
         output_dir = ensure_dir_exists(output_dir)
-        diff_threshold = diff_threshold or 30  # Valor padrão
+        diff_threshold = diff_threshold or FRAME_EXTRACTION['diff_threshold']
         min_scene_length = (
             min_scene_length or FRAME_EXTRACTION['min_scene_length']
         )
@@ -226,6 +476,9 @@ class FrameExtractor:
             output_dir=output_dir,
             diff_threshold=diff_threshold,
             min_scene_length=min_scene_length,
+            start=self.start,
+            end=self.end,
+            roi=self.roi,
         )
 
         try:
@@ -233,27 +486,22 @@ class FrameExtractor:
                 f'Detectando cenas por diferença de quadros no vídeo: {video_path}'
             )
 
-            cap = cv2.VideoCapture(video_path)
-            if not cap.isOpened():
-                logger.error(f'Não foi possível abrir o vídeo {video_path}')
-                raise ValueError(
-                    f'Não foi possível abrir o vídeo {video_path}'
-                )
+            cap, start_frame, end_frame = self._open_capture(video_path)
 
             prev_frame = None
-            frame_count = 0
+            frame_count = start_frame
             scene_count = 0
-            last_scene_frame = 0
+            last_scene_frame = start_frame
 
-            while True:
+            while end_frame is None or frame_count < end_frame:
                 ret, frame = cap.read()
                 if not ret:
                     break
 
-                gray_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                # A métrica é calculada apenas sobre a região de interesse
+                gray_frame = self._gray_metric_frame(frame)
                 if prev_frame is not None:
-                    diff = cv2.absdiff(prev_frame, gray_frame)
-                    diff_score = diff.sum() / (diff.shape[0] * diff.shape[1])
+                    diff_score = self._diff_score(prev_frame, gray_frame)
 
                     if (
                         diff_score > diff_threshold
@@ -283,3 +531,495 @@ class FrameExtractor:
         except Exception as e:
             logger.error(f'Erro ao detectar cenas: {str(e)}', exc_info=True)
             raise
+
+    def _gray_metric_frame(self, frame, width=None):
+        """
+        Prepara um frame para o cálculo da métrica de diferença.
+
+        Args:
+            frame (numpy.ndarray): Frame BGR completo.
+            width (int, optional): Se fornecido, reduz o recorte para esta largura.
+
+        Returns:
+            numpy.ndarray: Recorte em tons de cinza.
+        """
+        gray = cv2.cvtColor(self._crop_roi(frame), cv2.COLOR_BGR2GRAY)
+        if width and gray.shape[1] > width:
+            height = max(1, round(gray.shape[0] * width / gray.shape[1]))
+            gray = cv2.resize(
+                gray, (width, height), interpolation=cv2.INTER_AREA
+            )
+        return gray
+
+    @staticmethod
+    def _diff_score(prev_gray, gray):
+        """Diferença absoluta média entre dois frames em tons de cinza."""
+        diff = cv2.absdiff(prev_gray, gray)
+        return diff.sum() / (diff.shape[0] * diff.shape[1])
+
+    def find_cuts_exhaustive(
+        self, video_path, diff_threshold=None, min_scene_length=None
+    ):
+        """
+        Localiza cortes avaliando todos os frames em resolução completa.
+
+        Usa a mesma métrica e as mesmas regras de detect_scenes_by_diff, mas
+        apenas retorna os índices, sem salvar imagens.
+
+        Args:
+            video_path (str): Caminho para o arquivo de vídeo.
+            diff_threshold (float, optional): Limiar da diferença média entre quadros.
+            min_scene_length (int, optional): Número mínimo de quadros entre cortes.
+
+        Returns:
+            list: Índices dos frames onde cada nova cena começa.
+        """
+        diff_threshold = diff_threshold or FRAME_EXTRACTION['diff_threshold']
+        min_scene_length = (
+            min_scene_length or FRAME_EXTRACTION['min_scene_length']
+        )
+
+        cap, start_frame, end_frame = self._open_capture(video_path)
+        cortes = []
+        prev_gray = None
+        frame_count = start_frame
+        last_scene_frame = start_frame
+
+        while end_frame is None or frame_count < end_frame:
+            ret, frame = cap.read()
+            if not ret:
+                break
+
+            gray = self._gray_metric_frame(frame)
+            if (
+                prev_gray is not None
+                and self._diff_score(prev_gray, gray) > diff_threshold
+                and (frame_count - last_scene_frame) > min_scene_length
+            ):
+                cortes.append(frame_count)
+                last_scene_frame = frame_count
+
+            prev_gray = gray
+            frame_count += 1
+
+        cap.release()
+        return cortes
+
+    def find_cuts_two_pass(
+        self,
+        video_path,
+        diff_threshold=None,
+        min_scene_length=None,
+        coarse_step=None,
+        on_cut=None,
+    ):
+        """
+        Localiza cortes em duas passagens: grossa e de refinamento.
+
+        A passagem grossa decodifica só uma amostra dos frames, em baixa
+        resolução (veja _coarse_samples): os quadros-chave, ou um a cada
+        coarse_step frames em vídeos só com quadros-chave. Cada intervalo
+        entre amostras cuja diferença passe de uma fração do limiar vira
+        candidato. A passagem de refinamento volta a cada candidato e avalia
+        os seus frames em resolução completa com as mesmas regras de
+        find_cuts_exhaustive, posicionando o corte no frame exato.
+
+        Em vídeos com GOP longo, as amostras ficam tão distantes quanto os
+        quadros-chave: um corte cujas cenas se parecem nos dois extremos do
+        intervalo pode não virar candidato (find_cuts_exhaustive não tem
+        essa limitação).
+
+        Args:
+            video_path (str): Caminho para o arquivo de vídeo.
+            diff_threshold (float, optional): Limiar da diferença média entre quadros.
+            min_scene_length (int, optional): Número mínimo de quadros entre cortes.
+            coarse_step (int, optional): Passo em frames da passagem grossa.
+            on_cut (callable, optional): Chamado como on_cut(indice, frame)
+                                         para cada corte confirmado.
+
+        Returns:
+            list: Índices dos frames onde cada nova cena começa.
+        """
+        diff_threshold = diff_threshold or FRAME_EXTRACTION['diff_threshold']
+        min_scene_length = (
+            min_scene_length or FRAME_EXTRACTION['min_scene_length']
+        )
+        coarse_step = max(1, coarse_step or FRAME_EXTRACTION['coarse_step'])
+        coarse_width = FRAME_EXTRACTION['coarse_width']
+        coarse_threshold = (
+            diff_threshold * FRAME_EXTRACTION['coarse_threshold_ratio']
+        )
+
+        cap, start_frame, end_frame = self._open_capture(video_path)
+
+        # Passagem grossa: janelas (primeiro, último) suspeitas de conter corte
+        janelas = []
+        prev_small = None
+        prev_idx = start_frame
+        amostras = 0
+
+        for indice, small in self._coarse_samples(
+            video_path, cap, start_frame, end_frame, coarse_step, coarse_width
+        ):
+            amostras += 1
+            if prev_small is None:
+                # Trecho entre o início pedido e a primeira amostra
+                if indice > start_frame:
+                    janelas.append((start_frame, indice))
+            elif self._diff_score(prev_small, small) > coarse_threshold:
+                janelas.append((prev_idx, indice))
+            prev_small = small
+            prev_idx = indice
+
+        # Os frames após a última amostra não foram comparados
+        ultimo = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) - 1
+        if end_frame is not None:
+            ultimo = min(ultimo, end_frame - 1)
+        if ultimo > prev_idx:
+            janelas.append((prev_idx, ultimo))
+
+        logger.info(
+            f'Passagem grossa: {len(janelas)} janelas candidatas em '
+            f'{amostras} amostras.'
+        )
+
+        # Passagem de refinamento em resolução e taxa completas
+        cortes = []
+        last_scene_frame = start_frame
+        lido, lido_gray = None, None
+
+        for inicio, fim in janelas:
+            if inicio == lido:
+                # Janela contígua à anterior: continuar sem nova busca
+                prev_gray = lido_gray
+            else:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, inicio)
+                ret, frame = cap.read()
+                if not ret:
+                    continue
+                prev_gray = self._gray_metric_frame(frame)
+            lido, lido_gray = inicio, prev_gray
+
+            for indice in range(inicio + 1, fim + 1):
+                ret, frame = cap.read()
+                if not ret:
+                    break
+
+                gray = self._gray_metric_frame(frame)
+                lido, lido_gray = indice, gray
+                if (
+                    self._diff_score(prev_gray, gray) > diff_threshold
+                    and (indice - last_scene_frame) > min_scene_length
+                ):
+                    cortes.append(indice)
+                    last_scene_frame = indice
+                    if on_cut:
+                        on_cut(indice, frame)
+                prev_gray = gray
+
+        cap.release()
+        return cortes
+
+    def _coarse_samples(
+        self, video_path, cap, start_frame, end_frame, step, width
+    ):
+        """
+        Amostra os frames da passagem grossa em tons de cinza reduzidos.
+
+        Usa utils.video_stream.sample_frames, que descarta os pacotes não
+        amostrados antes de decodificá-los; se o ffmpeg não conseguir (por
+        exemplo, uma versão sem filtros de bitstream na entrada), lê um a
+        cada step frames com OpenCV, avançando os demais com grab().
+
+        Args:
+            video_path (str): Caminho para o arquivo de vídeo.
+            cap (cv2.VideoCapture): Vídeo aberto por _open_capture.
+            start_frame (int): Primeiro frame do trecho.
+            end_frame (int or None): Frame onde o trecho termina.
+            step (int): Passo em frames entre amostras.
+            width (int): Largura máxima das amostras.
+
+        Yields:
+            tuple: (indice, amostra) em ordem de índice.
+        """
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        largura = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        altura = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        recorte = self._frame_roi
+        if recorte is not None:
+            largura, altura = recorte[2], recorte[3]
+        if largura > width:
+            altura = max(1, round(altura * width / largura))
+            largura = width
+
+        # O ffmpeg vai direto ao início do trecho, sem ler o que vem antes
+        amostras = sample_frames(
+            video_path,
+            step,
+            fps,
+            (largura, altura),
+            recorte,
+            start_frame / fps,
+        )
+        try:
+            primeira = next(amostras, None)
+        except RuntimeError as e:
+            logger.warning(f'Amostragem pelo ffmpeg indisponível: {e}')
+            primeira = None
+            amostras = None
+
+        if amostras is not None:
+            if primeira is None:
+                return
+            for segundos, small in itertools.chain([primeira], amostras):
+                indice = int(round(segundos * fps))
+                if indice < start_frame:
+                    continue
+                if end_frame is not None and indice >= end_frame:
+                    break
+                yield indice, small
+            amostras.close()
+            return
+
+        frame_count = start_frame
+        while end_frame is None or frame_count < end_frame:
+            if (frame_count - start_frame) % step == 0:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                yield frame_count, self._gray_metric_frame(frame, width)
+            elif not cap.grab():
+                break
+            frame_count += 1
+
+    def detect_scenes_two_pass(
+        self,
+        video_path,
+        output_dir=None,
+        diff_threshold=None,
+        min_scene_length=None,
+        coarse_step=None,
+    ):
+        """
+        Detecta cenas por diferença de quadros com busca grossa e refinamento.
+
+        Usa as regras de detect_scenes_by_diff, decodificando em resolução
+        completa apenas as janelas próximas a cortes candidatos (veja
+        find_cuts_two_pass).
+
+        Args:
+            video_path (str): Caminho para o arquivo de vídeo.
+            output_dir (str, optional): Pasta onde os frames das cenas serão salvos.
+            diff_threshold (int, optional): Limiar para considerar uma diferença significativa entre quadros.
+            min_scene_length (int, optional): Número mínimo de quadros para considerar uma nova cena.
+            coarse_step (int, optional): Passo em frames da passagem grossa.
+
+        Returns:
+            str: Diretório onde os frames foram salvos.
+        """
+        if output_dir is None:
+            base_dir = os.path.dirname(video_path)
+            output_dir = os.path.join(base_dir, 'cenas_detectadas')
+
+        output_dir = ensure_dir_exists(output_dir)
+
+        log_process_start(
+            logger,
+            'detect_scenes_two_pass',
+            video_path=video_path,
+            output_dir=output_dir,
+            diff_threshold=diff_threshold,
+            min_scene_length=min_scene_length,
+            coarse_step=coarse_step,
+            start=self.start,
+            end=self.end,
+            roi=self.roi,
+        )
+
+        try:
+            salvos = []
+
+            def salvar_cena(indice, frame):
+                salvos.append(indice)
+                frame_path = os.path.join(
+                    output_dir, f'scene_{len(salvos):03d}.jpg'
+                )
+                cv2.imwrite(frame_path, frame)
+                logger.info(
+                    f'Cena {len(salvos)} detectada no frame {indice} e salva em {frame_path}'
+                )
+
+            self.find_cuts_two_pass(
+                video_path,
+                diff_threshold=diff_threshold,
+                min_scene_length=min_scene_length,
+                coarse_step=coarse_step,
+                on_cut=salvar_cena,
+            )
+
+            logger.info(
+                f'Detecção de cenas concluída. Total de {len(salvos)} cenas detectadas.'
+            )
+
+            log_process_end(logger, 'detect_scenes_two_pass')
+            return output_dir
+
+        except Exception as e:
+            logger.error(f'Erro ao detectar cenas: {str(e)}', exc_info=True)
+            raise
+
+    def count_frames(self, video_path):
+        """
+        Conta os frames do trecho configurado a partir dos metadados do vídeo.
+
+        Args:
+            video_path (str): Caminho para o arquivo de vídeo.
+
+        Returns:
+            int: Número aproximado de frames entre o início e o fim.
+        """
+        cap = cv2.VideoCapture(video_path)
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        cap.release()
+
+        start_frame = int(round(self.start * fps)) if self.start else 0
+        end_frame = total
+        if self.end is not None:
+            end_frame = min(total, int(round(self.end * fps)))
+        return max(0, end_frame - start_frame)
+
+    def extract_batch(
+        self,
+        videos,
+        output_dir=None,
+        method='cenas',
+        max_workers=None,
+        progress_callback=None,
+        **kwargs,
+    ):
+        """
+        Extrai frames de vários vídeos em paralelo usando um pool de processos.
+
+        Cada vídeo é salvo em uma subpasta de output_dir com o seu nome e
+        extensão (ep1.mp4 em ep1_mp4), com um sufixo numérico se dois
+        vídeos do lote tiverem o mesmo nome.
+
+        Args:
+            videos (str or list): Pasta com vídeos ou lista de caminhos.
+            output_dir (str, optional): Diretório base para as subpastas.
+            method (str, optional): 'cenas', 'regulares', 'diferenca' ou
+                                    'duas_passagens'.
+            max_workers (int, optional): Número de processos. Padrão: núcleos disponíveis.
+            progress_callback (callable, optional): Chamado como
+                callback(concluidos, total, resultado) a cada vídeo finalizado.
+            **kwargs: Argumentos repassados ao método de extração.
+
+        Returns:
+            dict: Resumo do lote (vídeos, frames salvos, fps obtido e falhas).
+        """
+        if method not in EXTRACTION_METHODS:
+            raise ValueError(f'Método de extração desconhecido: {method}')
+
+        if isinstance(videos, str):
+            base_dir = videos
+            videos = sorted(
+                os.path.join(videos, f)
+                for f in os.listdir(videos)
+                if is_supported_file(f, 'video')
+            )
+        else:
+            videos = list(videos)
+            base_dir = os.path.dirname(videos[0]) if videos else '.'
+
+        if output_dir is None:
+            output_dir = os.path.join(base_dir, 'frames_lote')
+        output_dir = ensure_dir_exists(output_dir)
+
+        max_workers = max_workers or os.cpu_count() or 1
+        max_workers = max(1, min(max_workers, len(videos) or 1))
+
+        log_process_start(
+            logger,
+            'extract_batch',
+            num_videos=len(videos),
+            output_dir=output_dir,
+            method=method,
+            max_workers=max_workers,
+        )
+
+        inicio = time.time()
+        resultados = []
+
+        if not videos:
+            logger.warning('Nenhum vídeo encontrado para o lote.')
+        else:
+            with ProcessPoolExecutor(
+                max_workers=max_workers, initializer=_init_batch_worker
+            ) as executor:
+                futures = []
+                usados = set()
+                for video_path in videos:
+                    nome = subpasta = os.path.basename(video_path).replace(
+                        '.', '_'
+                    )
+                    n = 1
+                    while subpasta.lower() in usados:
+                        n += 1
+                        subpasta = f'{nome}_{n}'
+                    usados.add(subpasta.lower())
+                    futures.append(
+                        executor.submit(
+                            _run_batch_item,
+                            self,
+                            method,
+                            video_path,
+                            os.path.join(output_dir, subpasta),
+                            kwargs,
+                        )
+                    )
+
+                for future in as_completed(futures):
+                    resultado = future.result()
+                    resultados.append(resultado)
+
+                    if resultado['error']:
+                        logger.error(
+                            f"Falha em {resultado['video_path']}: {resultado['error']}"
+                        )
+                    else:
+                        logger.info(
+                            f"{resultado['video_path']}: {resultado['frames_saved']} frames "
+                            f"salvos em {resultado['duration']:.2f}s"
+                        )
+
+                    if progress_callback:
+                        progress_callback(
+                            len(resultados), len(videos), resultado
+                        )
+
+        duracao = time.time() - inicio
+        sucesso = [r for r in resultados if not r['error']]
+        frames_analisados = sum(r['frames_analyzed'] for r in sucesso)
+
+        resumo = {
+            'output_dir': output_dir,
+            'videos': len(videos),
+            'processed': len(sucesso),
+            'failures': [
+                (r['video_path'], r['error']) for r in resultados if r['error']
+            ],
+            'frames_saved': sum(r['frames_saved'] for r in sucesso),
+            'frames_analyzed': frames_analisados,
+            'duration': duracao,
+            'fps': frames_analisados / duracao if duracao > 0 else 0.0,
+            'results': resultados,
+        }
+
+        logger.info(
+            f"Lote concluído: {resumo['processed']}/{resumo['videos']} vídeos, "
+            f"{resumo['frames_saved']} frames salvos, "
+            f"{resumo['fps']:.1f} fps, {len(resumo['failures'])} falhas."
+        )
+        log_process_end(logger, 'extract_batch', duracao)
+        return resumo
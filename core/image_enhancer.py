@@ -3,39 +3,291 @@ Módulo para melhoramento e upscaling de imagens.
 """
 
 import os
+import json
+import math
+import time
+import platform
+import tempfile
+from collections import deque, defaultdict
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+    ProcessPoolExecutor,
+    as_completed,
+)
+from concurrent.futures.process import BrokenProcessPool
+import cv2
 import numpy as np
 import torch
 from PIL import Image
-from basicsr.archs.rrdbnet_arch import RRDBNet
 from realesrgan import RealESRGANer
 from tqdm import tqdm
 
-from config.settings import UPSCALE_SETTINGS
+from config.settings import UPSCALE_SETTINGS, CACHE_DIR
+from core.inference_backends import (
+    export_onnx,
+    onnx_available,
+    onnx_cache_path,
+    prepare_model,
+)
+from core.model_registry import model_registry
+from core.upscale_cache import ResultCache
+from core.upscale_manifest import UpscaleManifest
+from core.upscale_models import (
+    MODELS_DIR,
+    DEFAULT_BYTES_PER_PIXEL,
+    activation_bytes_per_pixel,
+    build_network,
+    describe_model,
+    load_state_dict,
+    select_model,
+)
 from utils.logging_utils import (
     setup_logger,
     log_process_start,
     log_process_end,
 )
-from utils.file_utils import ensure_dir_exists, is_supported_file
+from utils.file_utils import (
+    atomic_output,
+    ensure_dir_exists,
+    get_output_path,
+    is_supported_file,
+    remove_partial_files,
+)
+from utils.image_stream import RowSource, write_png_rows, write_tiff_rows
+from utils.video_stream import VideoReader, VideoWriter
+from utils.system_utils import get_available_memory, get_cpu_count
 
 logger = setup_logger('image_enhancer')
 
+# Menor tile aceito pelo modo automático
+MIN_TILE_SIZE = 32
+
+# Gravar o manifesto a cada N imagens salvas
+MANIFEST_SAVE_INTERVAL = 10
+
+# Formatos que podem ser gravados em faixas no modo fora da memória
+STREAM_FORMATS = {
+    '.png': write_png_rows,
+    '.tif': write_tiff_rows,
+    '.tiff': write_tiff_rows,
+}
+
+# Arquivo com o melhor número de processos medido em cada máquina
+LAYOUT_CACHE_PATH = os.path.join(CACHE_DIR, 'upscale_layout.json')
+
+# Aprimorador carregado em cada processo do pool (ver _init_upscale_worker)
+_worker_enhancer = None
+
+
+def parse_target(value):
+    """
+    Converte uma resolução alvo em texto para os argumentos do aprimorador.
+
+    Args:
+        value (str): Alvo como '1920' ou '1920x' (largura mínima), 'x1080'
+                     (altura mínima), '1920x1080' (ambas) ou '8mp'
+                     (megapixels). Texto vazio significa sem alvo.
+
+    Returns:
+        dict: target_width, target_height e target_megapixels (None quando
+              não informados).
+    """
+    alvo = {
+        'target_width': None,
+        'target_height': None,
+        'target_megapixels': None,
+    }
+    value = (value or '').strip().lower().replace(' ', '')
+    if not value:
+        return alvo
+
+    try:
+        if value.endswith('mp'):
+            alvo['target_megapixels'] = float(value[:-2])
+        else:
+            largura, _, altura = value.partition('x')
+            alvo['target_width'] = int(largura) if largura else None
+            alvo['target_height'] = int(altura) if altura else None
+    except ValueError:
+        raise ValueError(f'Resolução alvo inválida: {value}')
+
+    if not any(alvo.values()) or any(
+        v is not None and v <= 0 for v in alvo.values()
+    ):
+        raise ValueError(f'Resolução alvo inválida: {value}')
+    return alvo
+
+
+def _init_upscale_worker(opcoes, threads, processos):
+    """
+    Inicializa um processo do pool: divide os núcleos e carrega o modelo.
+
+    Args:
+        opcoes (dict): Argumentos para ImageEnhancer.
+        threads (int): Threads de PyTorch neste processo.
+        processos (int): Total de processos do pool.
+    """
+    global _worker_enhancer
+
+    # Cada processo usa sua parte dos núcleos; o OpenCV fica sequencial
+    torch.set_num_threads(threads)
+    cv2.setNumThreads(1)
+
+    _worker_enhancer = ImageEnhancer(**opcoes)
+    _worker_enhancer.memory_share = 1 / processos
+    if not _worker_enhancer.has_target:
+        _worker_enhancer.load_model()
+
+
+def _upscale_worker_item(input_path, output_path):
+    """
+    Processa uma imagem em um processo do pool.
+
+    Args:
+        input_path (str): Imagem de entrada.
+        output_path (str): Caminho de saída.
+
+    Returns:
+        dict: input_path, output_path, megapixels, seconds (tempo de
+              processamento), pid do processo e cached (se o resultado veio
+              do cache).
+    """
+    inicio = time.perf_counter()
+    with Image.open(input_path) as imagem:
+        imagem_array = np.array(imagem.convert('RGB'))
+
+    cache = _worker_enhancer.result_cache
+    chave = None
+    origem = None
+    if cache is not None:
+        chave = _worker_enhancer._cache_key(imagem_array, output_path)
+        origem = cache.lookup(chave, os.path.splitext(output_path)[1])
+
+    if origem is not None:
+        ResultCache.materialize(origem, output_path)
+    else:
+        saida = _worker_enhancer.enhance_array(imagem_array)
+        _worker_enhancer._write_result(saida, output_path, chave)
+
+    return {
+        'cached': origem is not None,
+        'input_path': input_path,
+        'output_path': output_path,
+        'megapixels': imagem_array.shape[0] * imagem_array.shape[1] / 1e6,
+        'seconds': time.perf_counter() - inicio,
+        'pid': os.getpid(),
+    }
+
+
+def _load_layouts():
+    """Lê o cache de layouts de processos (vazio se não existir)."""
+    try:
+        with open(LAYOUT_CACHE_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_layouts(layouts):
+    """Grava o cache de layouts de processos."""
+    ensure_dir_exists(CACHE_DIR)
+    with atomic_output(LAYOUT_CACHE_PATH) as temp_path:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(layouts, f, indent=2)
+
+
+class _PreloadedRealESRGANer(RealESRGANer):
+    """RealESRGANer que usa uma rede já carregada, sem reler os pesos."""
+
+    def __init__(
+        self,
+        scale,
+        model,
+        tile=0,
+        tile_pad=10,
+        pre_pad=0,
+        half=False,
+        device=None,
+    ):
+        # O construtor original sempre executa torch.load(model_path)
+        self.scale = scale
+        self.tile_size = tile
+        self.tile_pad = tile_pad
+        self.pre_pad = pre_pad
+        self.mod_scale = None
+        self.half = half
+        self.device = device
+        self.model = model
+
 
 class ImageEnhancer:
     """Classe para aprimoramento e upscale de imagens."""
 
-    def __init__(self, model_path='models', scale=None):
+    def __init__(
+        self,
+        model_path=None,
+        scale=None,
+        tile=None,
+        tile_pad=None,
+        batch_size=None,
+        backend=None,
+        workers=None,
+        target_width=None,
+        target_height=None,
+        target_megapixels=None,
+        use_cache=None,
+    ):
         """
         Inicializa o aprimorador de imagens com o modelo especificado.
 
         Args:
-            model_path (str, optional): Caminho para o arquivo do modelo.
+            model_path (str, optional): Arquivo do modelo na pasta 'models'
+                ou 'auto' para escolher o modelo mais barato que atende à
+                escala pedida.
             scale (int, optional): Fator de escala para upscaling.
+            tile (int or str, optional): Tamanho do tile em pixels, 0 para
+                processar a imagem inteira ou 'auto' para escolher o maior
+                tile que cabe no orçamento de memória.
+            tile_pad (int, optional): Sobreposição entre tiles em pixels.
+            batch_size (int, optional): Imagens por passagem da rede em
+                                        process_directory (1 desativa o lote).
+            backend (str, optional): Backend de inferência em CPU ('eager',
+                'channels_last', 'bf16', 'torchscript', 'compile' ou
+                'onnx'). Na GPU a rede sempre roda em fp16.
+            workers (int or str, optional): Processos usados por
+                process_directory, cada um com núcleos/N threads, ou 'auto'
+                para usar o número calibrado para esta máquina.
+            target_width (int, optional): Largura mínima desejada.
+            target_height (int, optional): Altura mínima desejada.
+            target_megapixels (float, optional): Tamanho mínimo desejado.
+                Com qualquer alvo definido, scale é ignorado: cada imagem
+                recebe o menor aumento que atinge o alvo.
+            use_cache (bool, optional): Reaproveitar, em process_directory,
+                resultados de imagens com pixels idênticos já processadas.
         """
         self.model_path = model_path or UPSCALE_SETTINGS['model_name']
         self.scale = scale or UPSCALE_SETTINGS['scale']
+        self.tile = UPSCALE_SETTINGS['tile'] if tile is None else tile
+        self.tile_pad = (
+            UPSCALE_SETTINGS['tile_pad'] if tile_pad is None else tile_pad
+        )
+        self.batch_size = batch_size or UPSCALE_SETTINGS['batch_size']
+        self.backend = backend or UPSCALE_SETTINGS['backend']
+        self.workers = workers or UPSCALE_SETTINGS['workers']
+        # Fração do orçamento de memória deste processo (pool de processos)
+        self.memory_share = 1.0
+        self.target_width = target_width
+        self.target_height = target_height
+        self.target_megapixels = target_megapixels
+        self._auto_model = self.model_path.lower() in ('auto', 'models')
+        self._target_enhancers = {}
+        if use_cache is None:
+            use_cache = UPSCALE_SETTINGS['result_cache']
+        self.result_cache = ResultCache() if use_cache else None
         self.upsampler = None
         self.device = None
+        self.model_info = None
 
     def load_model(self):
         """
@@ -56,65 +308,29 @@ class ImageEnhancer:
             )
             logger.info(f'Usando dispositivo: {self.device}')
 
-            # Localizar o modelo
-            if self.model_path.lower() == 'models':
-                # Substituir por nome de arquivo do modelo
-                self.model_path = 'RealESRGAN_x4plus.pth'
-
-            models_subdir = os.path.join(
-                os.path.dirname(os.path.dirname(__file__)), 'models'
-            )
-            model_filename = os.path.basename(self.model_path)
-            model_full_path = os.path.join(models_subdir, model_filename)
+            self._resolve_model()
 
-            if not os.path.exists(models_subdir):
-                raise FileNotFoundError(
-                    f"Diretório 'models' não encontrado: {models_subdir}"
-                )
+            # Obter a rede do registro compartilhado (carrega só uma vez)
+            half = self.device.type == 'cuda'
+            if half:
+                precisao = 'fp16'
+            elif self.backend == 'eager':
+                precisao = 'fp32'
+            else:
+                precisao = self.backend
+            chave = (self.model_path, str(self.device), precisao)
+            modelo = model_registry.get(chave, self._load_network)
 
-            if os.path.isdir(model_full_path):
-                raise FileNotFoundError(
-                    f'Foi fornecido um diretório em vez de um arquivo de modelo: {model_full_path}'
-                )
-
-            if not os.path.exists(model_full_path):
-                raise FileNotFoundError(
-                    f'Modelo não encontrado: {model_full_path}'
-                )
-            if not os.access(model_full_path, os.R_OK):
-                raise PermissionError(
-                    f'Sem permissão de leitura no arquivo do modelo: {model_full_path}'
-                )
-            self.model_path = model_full_path
-
-            # Carregar os pesos do modelo
-            logger.info(f'Carregando pesos do modelo de {self.model_path}')
-            pesos = torch.load(self.model_path, map_location=self.device)[
-                'params_ema'
-            ]
-
-            # Definir a arquitetura do modelo
-            modelo = RRDBNet(
-                num_in_ch=3,
-                num_out_ch=3,
-                num_feat=64,
-                num_block=23,
-                num_grow_ch=32,
-                scale=4,
-            )
-            modelo.load_state_dict(pesos, strict=True)
-            modelo.to(self.device)
-
-            # Configurar o upsampler
-            self.upsampler = RealESRGANer(
-                scale=2,
-                model_path=self.model_path,
+            # Configurar o upsampler. A escala precisa ser a nativa da rede
+            # para que os tiles sejam posicionados corretamente; a escala
+            # pedida é aplicada depois via outscale.
+            self.upsampler = _PreloadedRealESRGANer(
+                scale=self.model_info['scale'],
                 model=modelo,
                 tile=0,
+                tile_pad=self.tile_pad,
                 pre_pad=0,
-                half=(
-                    self.device.type == 'cuda'
-                ),  # Usar precisão reduzida apenas na GPU
+                half=half,  # Usar precisão reduzida apenas na GPU
                 device=self.device,
             )
 
@@ -125,6 +341,418 @@ class ImageEnhancer:
             logger.error(f'Erro ao carregar modelo: {str(e)}', exc_info=True)
             raise
 
+    def _resolve_model(self):
+        """
+        Localiza o arquivo do modelo e detecta sua arquitetura, sem carregá-lo.
+
+        Returns:
+            str: Caminho completo do modelo.
+        """
+        if self.model_info is not None:
+            return self.model_path
+
+        # Localizar o modelo
+        if self.model_path.lower() in ('auto', 'models'):
+            self.model_path = select_model(self.scale)
+
+        models_subdir = MODELS_DIR
+        model_filename = os.path.basename(self.model_path)
+        model_full_path = os.path.join(models_subdir, model_filename)
+
+        if not os.path.exists(models_subdir):
+            raise FileNotFoundError(
+                f"Diretório 'models' não encontrado: {models_subdir}"
+            )
+
+        if os.path.isdir(model_full_path):
+            raise FileNotFoundError(
+                f'Foi fornecido um diretório em vez de um arquivo de modelo: {model_full_path}'
+            )
+
+        if not os.path.exists(model_full_path):
+            raise FileNotFoundError(
+                f'Modelo não encontrado: {model_full_path}'
+            )
+        if not os.access(model_full_path, os.R_OK):
+            raise PermissionError(
+                f'Sem permissão de leitura no arquivo do modelo: {model_full_path}'
+            )
+        self.model_path = model_full_path
+
+        # Arquitetura e escala nativa são detectadas a partir dos pesos
+        self.model_info = describe_model(self.model_path)
+        logger.info(
+            f"Arquitetura {self.model_info['arch']}, escala nativa "
+            f"{self.model_info['scale']}x"
+        )
+        return self.model_path
+
+    def _build_network(self, device):
+        """
+        Carrega os pesos e monta a rede detectada, em fp32.
+
+        Args:
+            device (torch.device): Dispositivo da rede.
+
+        Returns:
+            torch.nn.Module: A rede em modo de avaliação.
+        """
+        logger.info(f'Carregando pesos do modelo de {self.model_path}')
+        pesos = load_state_dict(self.model_path, device)
+
+        # Usar os tensores lidos no lugar dos parâmetros da rede, sem
+        # copiá-los: em CPU eles continuam mapeados do cache de pesos
+        modelo = build_network(self.model_info)
+        modelo.load_state_dict(pesos, strict=True, assign=True)
+        modelo.eval()
+        return modelo.to(device)
+
+    def _load_network(self):
+        """
+        Carrega os pesos e monta a rede detectada no dispositivo atual.
+
+        Returns:
+            torch.nn.Module: A rede pronta para inferência.
+        """
+        modelo = self._build_network(self.device)
+        if self.device.type == 'cuda':
+            return modelo.half()
+
+        modelo, backend = prepare_model(modelo, self.backend, self.model_path)
+        logger.info(f'Backend de inferência em CPU: {backend}')
+        return modelo
+
+    def compute_tile_size(self, width, height):
+        """
+        Determina o tamanho do tile para uma imagem.
+
+        No modo 'auto', escolhe o maior tile cuja memória de ativação cabe
+        em UPSCALE_SETTINGS['memory_budget'] da memória livre do dispositivo,
+        de modo que o pico de memória da rede não dependa da resolução da
+        imagem.
+
+        Args:
+            width (int): Largura da imagem de entrada.
+            height (int): Altura da imagem de entrada.
+
+        Returns:
+            int: Tamanho do tile em pixels (0 para não usar tiles).
+        """
+        if self.tile != 'auto':
+            return int(self.tile)
+
+        orcamento, bytes_por_pixel = self._activation_budget()
+        if orcamento <= 0:
+            logger.warning(
+                'Memória disponível desconhecida; usando tiles de 256 px.'
+            )
+            return 256
+
+        if width * height * bytes_por_pixel <= orcamento:
+            return 0
+
+        lado = math.isqrt(int(orcamento / bytes_por_pixel))
+        lado -= 2 * self.tile_pad
+        return max(MIN_TILE_SIZE, lado // 8 * 8)
+
+    def _activation_budget(self):
+        """
+        Calcula o orçamento de memória para as ativações da rede.
+
+        Returns:
+            tuple: (orcamento, bytes_por_pixel) - Bytes disponíveis para
+                   ativações e custo estimado por pixel de entrada.
+        """
+        bytes_por_pixel = (
+            activation_bytes_per_pixel(self.model_info)
+            if self.model_info
+            else DEFAULT_BYTES_PER_PIXEL
+        )
+        if self.device is not None and self.device.type == 'cuda':
+            memoria_livre, _ = torch.cuda.mem_get_info(self.device)
+            bytes_por_pixel /= 2  # Precisão reduzida na GPU
+        else:
+            memoria_livre = get_available_memory()
+
+        return (
+            memoria_livre
+            * UPSCALE_SETTINGS['memory_budget']
+            * self.memory_share,
+            bytes_por_pixel,
+        )
+
+    def _bucket_shape(self, width, height):
+        """Arredonda o tamanho de uma imagem para o bucket do lote."""
+        bucket = UPSCALE_SETTINGS['bucket_size']
+        if bucket <= 1:
+            # Agrupar apenas imagens de tamanho idêntico
+            return height, width
+        return (
+            math.ceil(height / bucket) * bucket,
+            math.ceil(width / bucket) * bucket,
+        )
+
+    def enhance_arrays(self, arrays):
+        """
+        Aumenta a resolução de várias imagens em uma única passagem da rede.
+
+        As imagens são completadas (por reflexão) até o mesmo tamanho,
+        empilhadas em um tensor, processadas juntas e depois recortadas.
+
+        Args:
+            arrays (list): Imagens RGB como numpy.ndarray (H, W, 3) uint8.
+
+        Returns:
+            list: Imagens processadas, na mesma ordem da entrada.
+        """
+        upsampler, device = self.load_model()
+        escala_nativa = upsampler.scale
+
+        # RRDBNet x2/x1 exige dimensões múltiplas de 4 / escala nativa
+        multiplo = 1
+        if self.model_info['arch'] == 'rrdbnet':
+            multiplo = 4 // escala_nativa
+        altura = max(a.shape[0] for a in arrays)
+        largura = max(a.shape[1] for a in arrays)
+        altura = math.ceil(altura / multiplo) * multiplo
+        largura = math.ceil(largura / multiplo) * multiplo
+        lote = np.stack(
+            [
+                np.pad(
+                    a,
+                    (
+                        (0, altura - a.shape[0]),
+                        (0, largura - a.shape[1]),
+                        (0, 0),
+                    ),
+                    mode='reflect',
+                )
+                for a in arrays
+            ]
+        )
+
+        entrada = torch.from_numpy(lote).to(device).permute(0, 3, 1, 2)
+        entrada = entrada.float().div_(255)
+        # Mesma ordem de canais que RealESRGANer.enhance entrega à rede
+        entrada = entrada.flip(1)
+        if upsampler.half:
+            entrada = entrada.half()
+
+        with torch.no_grad():
+            saida = upsampler.model(entrada)
+
+        saida = saida.flip(1).float().clamp_(0, 1).mul_(255).round_()
+        saida = saida.byte().permute(0, 2, 3, 1).cpu().numpy()
+
+        resultados = []
+        for a, s in zip(arrays, saida):
+            h, w = a.shape[:2]
+            s = s[: h * escala_nativa, : w * escala_nativa]
+            if self.scale != escala_nativa:
+                s = cv2.resize(
+                    s,
+                    (int(w * self.scale), int(h * self.scale)),
+                    interpolation=cv2.INTER_LANCZOS4,
+                )
+            resultados.append(np.ascontiguousarray(s))
+        return resultados
+
+    def _plan_batches(self, paths):
+        """
+        Agrupa imagens por bucket de tamanho em lotes que cabem na memória.
+
+        Args:
+            paths (list): Caminhos das imagens.
+
+        Returns:
+            tuple: (lotes, individuais) - Listas de caminhos a processar em
+                   lote e caminhos que precisam do caminho com tiles.
+        """
+        orcamento, bytes_por_pixel = self._activation_budget()
+        buckets = {}
+        individuais = []
+
+        for path in paths:
+            try:
+                with Image.open(path) as imagem:
+                    largura, altura = imagem.size
+            except Exception:
+                # O erro é registrado quando a imagem for lida
+                individuais.append(path)
+                continue
+            h, w = self._bucket_shape(largura, altura)
+
+            por_lote = self.batch_size
+            if self.tile != 'auto':
+                por_lote = self.batch_size if self.tile == 0 else 0
+            elif orcamento > 0:
+                por_lote = min(
+                    self.batch_size,
+                    int(orcamento // (h * w * bytes_por_pixel)),
+                )
+
+            if por_lote < 2:
+                individuais.append(path)
+            else:
+                buckets.setdefault((h, w, por_lote), []).append(path)
+
+        lotes = []
+        for (_, _, por_lote), grupo in buckets.items():
+            for i in range(0, len(grupo), por_lote):
+                lotes.append(grupo[i : i + por_lote])
+        return lotes, individuais
+
+    def enhance_array(self, imagem_array):
+        """
+        Aumenta a resolução de uma imagem já decodificada.
+
+        Args:
+            imagem_array (numpy.ndarray): Imagem RGB (H, W, 3) uint8.
+
+        Returns:
+            numpy.ndarray: Imagem processada.
+        """
+        if self.has_target:
+            return self._enhance_to_target(imagem_array)
+
+        upsampler, _ = self.load_model()
+
+        altura, largura = imagem_array.shape[:2]
+        upsampler.tile_size = self.compute_tile_size(largura, altura)
+        if upsampler.tile_size:
+            logger.info(
+                f'Processando em tiles de {upsampler.tile_size} px '
+                f'(pad {self.tile_pad} px).'
+            )
+
+        imagem_saida, _ = upsampler.enhance(imagem_array, outscale=self.scale)
+        return imagem_saida
+
+    @property
+    def has_target(self):
+        """Indica se o aprimorador trabalha com resolução alvo."""
+        return bool(
+            self.target_width or self.target_height or self.target_megapixels
+        )
+
+    def plan_target(self, width, height):
+        """
+        Planeja o caminho mais barato até a resolução alvo.
+
+        Args:
+            width (int): Largura da imagem de entrada.
+            height (int): Altura da imagem de entrada.
+
+        Returns:
+            dict: 'action' ('skip' se a imagem já atinge o alvo, 'resize'
+                  para só redimensionar com Lanczos ou 'model'), 'scale'
+                  (fator necessário), 'size' (largura, altura finais) e
+                  'model' (arquivo do modelo, se action == 'model').
+        """
+        fatores = []
+        if self.target_width:
+            fatores.append(self.target_width / width)
+        if self.target_height:
+            fatores.append(self.target_height / height)
+        if self.target_megapixels:
+            fatores.append(
+                math.sqrt(self.target_megapixels * 1e6 / (width * height))
+            )
+        fator = max(fatores)
+
+        plano = {
+            'action': 'model',
+            'scale': fator,
+            # Arredondar para cima para nunca ficar abaixo do alvo
+            'size': (
+                math.ceil(width * fator - 1e-6),
+                math.ceil(height * fator - 1e-6),
+            ),
+            'model': None,
+        }
+        if fator <= 1:
+            plano['action'] = 'skip'
+            plano['size'] = (width, height)
+        elif fator <= UPSCALE_SETTINGS['resize_only_max_scale']:
+            plano['action'] = 'resize'
+        elif self._auto_model:
+            plano['model'] = select_model(fator)
+        else:
+            plano['model'] = self._resolve_model()
+        return plano
+
+    def _target_enhancer(self, model_path, scale=None):
+        """
+        Obtém o aprimorador que executa um modelo na sua escala nativa.
+
+        Args:
+            model_path (str): Arquivo do modelo.
+            scale (int, optional): Escala de saída (padrão: a nativa).
+
+        Returns:
+            ImageEnhancer: Aprimorador sem alvo, reaproveitado entre imagens.
+        """
+        scale = scale or describe_model(model_path)['scale']
+        chave = (model_path, scale)
+        if chave not in self._target_enhancers:
+            enhancer = ImageEnhancer(
+                model_path=model_path,
+                scale=scale,
+                tile=self.tile,
+                tile_pad=self.tile_pad,
+                batch_size=1,
+                backend=self.backend,
+                workers=1,
+                use_cache=False,
+            )
+            enhancer.memory_share = self.memory_share
+            self._target_enhancers[chave] = enhancer
+        return self._target_enhancers[chave]
+
+    def _enhance_to_target(self, imagem_array):
+        """
+        Leva uma imagem à resolução alvo com o mínimo de processamento.
+
+        A rede roda na escala nativa do modelo escolhido e a saída é
+        redimensionada uma única vez para o tamanho final.
+
+        Args:
+            imagem_array (numpy.ndarray): Imagem RGB (H, W, 3) uint8.
+
+        Returns:
+            numpy.ndarray: Imagem no tamanho alvo.
+        """
+        altura, largura = imagem_array.shape[:2]
+        plano = self.plan_target(largura, altura)
+
+        if plano['action'] == 'skip':
+            return imagem_array
+        if plano['action'] == 'resize':
+            return cv2.resize(
+                imagem_array,
+                plano['size'],
+                interpolation=cv2.INTER_LANCZOS4,
+            )
+
+        saida = self._target_enhancer(plano['model']).enhance_array(
+            imagem_array
+        )
+        # INTER_AREA ao reduzir evita serrilhado; Lanczos se faltar escala
+        interpolacao = (
+            cv2.INTER_AREA
+            if saida.shape[1] >= plano['size'][0]
+            else cv2.INTER_LANCZOS4
+        )
+        return cv2.resize(saida, plano['size'], interpolation=interpolacao)
+
+    def _reaches_target(self, input_path):
+        """Indica se uma imagem já atinge a resolução alvo."""
+        tamanho = self._image_size(input_path)
+        return (
+            tamanho is not None
+            and self.plan_target(*tamanho)['action'] == 'skip'
+        )
+
     def enhance_image(self, input_path, output_path=None):
         """
         Aumenta a resolução de uma imagem usando o modelo carregado.
@@ -134,7 +762,8 @@ class ImageEnhancer:
             output_path (str, optional): Caminho para salvar a imagem processada.
 
         Returns:
-            str: Caminho da imagem processada.
+            str or None: Caminho da imagem processada, ou None se a imagem
+                         já atingir a resolução alvo (nada é gravado).
         """
         if output_path is None:
             directory = os.path.dirname(input_path)
@@ -142,6 +771,15 @@ class ImageEnhancer:
             name, ext = os.path.splitext(filename)
             output_path = os.path.join(directory, f'{name}_upscaled{ext}')
 
+        if self.has_target and self._reaches_target(input_path):
+            logger.info(
+                f'{input_path} já atinge a resolução alvo; nada a fazer.'
+            )
+            return None
+
+        if self._should_stream(input_path):
+            return self.enhance_image_streaming(input_path, output_path)
+
         log_process_start(
             logger,
             'enhance_image',
@@ -162,15 +800,10 @@ class ImageEnhancer:
             imagem_array = np.array(imagem)
 
             logger.info(f'Aumentando resolução da imagem: {input_path}...')
-            imagem_saida, _ = upsampler.enhance(
-                imagem_array, outscale=self.scale
-            )
-
-            logger.info(f'Convertendo de volta para imagem: {input_path}...')
-            imagem_final = Image.fromarray(imagem_saida)
+            imagem_saida = self.enhance_array(imagem_array)
 
             logger.info(f'Salvando imagem: {output_path}...')
-            imagem_final.save(output_path)
+            self._write_image(imagem_saida, output_path)
 
             log_process_end(logger, 'enhance_image')
             return output_path
@@ -182,13 +815,855 @@ class ImageEnhancer:
             )
             raise
 
-    def process_directory(self, input_dir, output_dir=None):
+    def enhance_video(self, input_path, output_path=None):
+        """
+        Aumenta a resolução de um vídeo, quadro a quadro.
+
+        Os quadros decodificados pelo ffmpeg passam por uma fila limitada
+        até a rede e seguem direto para o codificador, sem passar pelo
+        disco, e o áudio original é copiado para a saída. Um quadro igual
+        ao último quadro processado (diferença de até
+        UPSCALE_SETTINGS['video_static_tolerance'] por canal), como em
+        slides parados, reaproveita a saída anterior sem inferência.
+
+        Args:
+            input_path (str): Caminho do vídeo de entrada.
+            output_path (str, optional): Caminho para salvar o vídeo processado.
+
+        Returns:
+            str: Caminho do vídeo processado.
+        """
+        if output_path is None:
+            output_path = get_output_path(input_path, '_upscaled')
+
+        inicio = time.time()
+        log_process_start(
+            logger,
+            'enhance_video',
+            input_path=input_path,
+            output_path=output_path,
+            scale=self.scale,
+        )
+
+        try:
+            if not self.has_target:
+                self.load_model()
+
+            profundidade = max(1, UPSCALE_SETTINGS['queue_depth'])
+            tolerancia = UPSCALE_SETTINGS['video_static_tolerance']
+            leituras = deque()
+            escritas = deque()
+            referencia = None
+            saida = None
+            processados = 0
+            reaproveitados = 0
+
+            with VideoReader(input_path) as video, atomic_output(
+                output_path
+            ) as temp_path:
+                logger.info(
+                    f'Vídeo de entrada: {video.width}x{video.height}, '
+                    f'{video.fps:.2f} FPS, ~{video.frame_count} quadros'
+                )
+                quadros = iter(video)
+                codificador = None
+
+                try:
+                    with ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix='video-leitura'
+                    ) as leitor, ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix='video-escrita'
+                    ) as escritor, tqdm(
+                        total=video.frame_count, desc='Processando quadros'
+                    ) as barra:
+                        for _ in range(profundidade):
+                            leituras.append(leitor.submit(next, quadros, None))
+
+                        while leituras:
+                            quadro = leituras.popleft().result()
+                            if quadro is None:
+                                break
+                            leituras.append(leitor.submit(next, quadros, None))
+
+                            if referencia is not None and (
+                                cv2.absdiff(quadro, referencia).max()
+                                <= tolerancia
+                            ):
+                                reaproveitados += 1
+                            else:
+                                saida = self.enhance_array(quadro)
+                                referencia = quadro
+                                processados += 1
+
+                            if codificador is None:
+                                codificador = VideoWriter(
+                                    temp_path,
+                                    saida.shape[1],
+                                    saida.shape[0],
+                                    video.fps,
+                                    codec=UPSCALE_SETTINGS['video_codec'],
+                                    crf=UPSCALE_SETTINGS['video_crf'],
+                                    audio_path=(
+                                        input_path
+                                        if video.audio_codec
+                                        else None
+                                    ),
+                                    audio_codec=UPSCALE_SETTINGS[
+                                        'video_audio_codec'
+                                    ],
+                                )
+
+                            while len(escritas) >= profundidade:
+                                escritas.popleft().result()
+                            escritas.append(
+                                escritor.submit(codificador.write, saida)
+                            )
+                            barra.update(1)
+
+                        while escritas:
+                            escritas.popleft().result()
+                finally:
+                    if codificador is not None:
+                        codificador.close()
+
+                if codificador is None:
+                    raise ValueError(
+                        f'Nenhum quadro decodificado de {input_path}'
+                    )
+
+            duracao = time.time() - inicio
+            total = processados + reaproveitados
+            logger.info(
+                f'{total} quadros em {duracao:.1f}s '
+                f'({total / duracao:.2f} quadros/s), {reaproveitados} '
+                f'reaproveitados sem inferência.'
+            )
+            log_process_end(logger, 'enhance_video')
+            return output_path
+
+        except Exception as e:
+            logger.error(
+                f'Erro ao aumentar resolução do vídeo: {str(e)}',
+                exc_info=True,
+            )
+            raise
+
+    @staticmethod
+    def _image_size(input_path):
+        """Lê (largura, altura) sem decodificar a imagem (None se ilegível)."""
+        try:
+            with Image.open(input_path) as imagem:
+                return imagem.size
+        except Exception:
+            return None
+
+    def _image_megapixels(self, input_path):
+        """Tamanho de uma imagem em megapixels (0 se ilegível)."""
+        tamanho = self._image_size(input_path)
+        return tamanho[0] * tamanho[1] / 1e6 if tamanho else 0.0
+
+    def _should_stream(self, input_path):
+        """Indica se a imagem é grande o bastante para o modo em faixas."""
+        return (
+            self._image_megapixels(input_path)
+            >= UPSCALE_SETTINGS['stream_min_megapixels']
+        )
+
+    def enhance_image_streaming(self, input_path, output_path=None):
+        """
+        Aumenta a resolução de uma imagem grande sem carregá-la inteira.
+
+        A entrada é lida em faixas de linhas (mapeadas do arquivo quando
+        possível), cada faixa é processada com linhas de contexto acima e
+        abaixo, as sobreposições entre faixas vizinhas são mescladas
+        linearmente e a saída é gravada em PNG ou TIFF à medida que as
+        faixas ficam prontas. O pico de memória depende do tamanho da
+        faixa, não da imagem, exceto na leitura de formatos que o PIL só
+        decodifica inteiros (PNG, JPEG...), em que a imagem passa uma vez
+        pela memória antes do processamento (ver RowSource).
+
+        Args:
+            input_path (str): Caminho da imagem de entrada.
+            output_path (str, optional): Caminho da saída (PNG ou TIFF;
+                outros formatos são gravados como PNG).
+
+        Returns:
+            str: Caminho da imagem processada.
+        """
+        if output_path is None:
+            nome, ext = os.path.splitext(input_path)
+            output_path = f'{nome}_upscaled{ext}'
+
+        nome, ext = os.path.splitext(output_path)
+        if ext.lower() not in STREAM_FORMATS:
+            logger.warning(
+                f'Formato {ext} não pode ser gravado em faixas; salvando como PNG.'
+            )
+            ext = '.png'
+            output_path = nome + ext
+
+        if self.has_target:
+            # Faixas exigem escala inteira: usa a menor que atinge o alvo
+            plano = self.plan_target(*self._image_size(input_path))
+            if plano['action'] == 'skip':
+                return input_path
+            escala = math.ceil(plano['scale'])
+            logger.info(
+                f'Imagem grande com resolução alvo: processando em faixas '
+                f'com escala {escala}x.'
+            )
+            model_path = plano['model'] or (
+                select_model(escala)
+                if self._auto_model
+                else self._resolve_model()
+            )
+            return self._target_enhancer(
+                model_path, escala
+            ).enhance_image_streaming(input_path, output_path)
+
+        if int(self.scale) != self.scale:
+            raise ValueError('O modo em faixas exige uma escala inteira.')
+        escala = int(self.scale)
+
+        log_process_start(
+            logger,
+            'enhance_image_streaming',
+            input_path=input_path,
+            output_path=output_path,
+            scale=escala,
+        )
+
+        try:
+            self.load_model()
+
+            with RowSource(input_path) as fonte, atomic_output(
+                output_path
+            ) as temp_path:
+                STREAM_FORMATS[ext.lower()](
+                    temp_path,
+                    fonte.width * escala,
+                    fonte.height * escala,
+                    self._stream_strips(fonte, escala),
+                )
+
+            log_process_end(logger, 'enhance_image_streaming')
+            return output_path
+
+        except Exception as e:
+            logger.error(
+                f'Erro ao aumentar resolução em faixas: {str(e)}',
+                exc_info=True,
+            )
+            raise
+
+    def _stream_strips(self, fonte, escala):
+        """
+        Gera as faixas de saída de uma imagem, de cima para baixo.
+
+        Cada faixa de entrada [y0, y1) é processada junto com
+        UPSCALE_SETTINGS['stream_overlap'] linhas de contexto de cada lado.
+        As linhas previstas abaixo de y1 são guardadas e mescladas com o
+        início da faixa seguinte, com peso decrescente.
+
+        Args:
+            fonte (RowSource): Imagem de entrada.
+            escala (int): Fator de escala.
+
+        Yields:
+            numpy.ndarray: Faixa de saída (linhas, largura, 3) uint8.
+        """
+        sobreposicao = UPSCALE_SETTINGS['stream_overlap']
+        linhas_por_faixa = max(
+            2 * sobreposicao,
+            UPSCALE_SETTINGS['stream_strip_pixels'] // fonte.width,
+        )
+        total = math.ceil(fonte.height / linhas_por_faixa)
+
+        cauda = None
+        for y0 in tqdm(
+            range(0, fonte.height, linhas_por_faixa),
+            total=total,
+            desc='Processando faixas',
+        ):
+            y1 = min(fonte.height, y0 + linhas_por_faixa)
+            topo = max(0, y0 - sobreposicao)
+            base = min(fonte.height, y1 + sobreposicao)
+
+            saida = self.enhance_array(fonte.read(topo, base))
+            corpo = saida[(y0 - topo) * escala : (y1 - topo) * escala]
+
+            if cauda is not None:
+                n = min(len(cauda), len(corpo))
+                peso = 1 - (np.arange(n) + 0.5) / n
+                peso = peso[:, None, None]
+                mescla = cauda[:n] * peso + corpo[:n] * (1 - peso)
+                corpo[:n] = np.round(mescla).astype(np.uint8)
+
+            # Cópia para não manter a faixa inteira viva até a próxima
+            cauda = saida[(y1 - topo) * escala :].copy()
+            yield corpo
+
+    def _result_settings(self):
+        """
+        Opções que determinam o resultado (manifesto e cache).
+
+        Returns:
+            dict: Modelo e escala, ou modelo e resolução alvo.
+        """
+        if self.has_target:
+            return {
+                'model': (
+                    'auto'
+                    if self._auto_model
+                    else os.path.basename(self._resolve_model())
+                ),
+                'target': [
+                    self.target_width,
+                    self.target_height,
+                    self.target_megapixels,
+                ],
+            }
+        return {
+            'model': os.path.basename(self._resolve_model()),
+            'scale': self.scale,
+        }
+
+    def _cache_key(self, imagem_array, output_path):
+        """Chave do cache de resultados para uma imagem decodificada."""
+        opcoes = dict(self._result_settings(), backend=self.backend)
+        return ResultCache.make_key(
+            imagem_array, opcoes, os.path.splitext(output_path)[1]
+        )
+
+    def _write_result(self, imagem_array, output_path, chave=None):
+        """
+        Salva uma imagem processada e a adiciona ao cache de resultados.
+
+        Args:
+            imagem_array (numpy.ndarray): Imagem processada.
+            output_path (str): Caminho de saída.
+            chave (str, optional): Chave da entrada no cache.
+
+        Returns:
+            str: Caminho da imagem salva.
+        """
+        self._write_image(imagem_array, output_path)
+        if chave is not None and self.result_cache is not None:
+            try:
+                self.result_cache.store(chave, output_path)
+            except OSError as e:
+                logger.warning(f'Falha ao gravar no cache: {str(e)}')
+        return output_path
+
+    @staticmethod
+    def _copy_result(origem, output_path):
+        """
+        Grava como saída um resultado idêntico já conhecido.
+
+        Args:
+            origem (str or Future): Entrada do cache, ou a gravação ainda em
+                andamento de uma imagem idêntica nesta execução.
+            output_path (str): Caminho de saída.
+
+        Returns:
+            str: Caminho de saída.
+        """
+        if isinstance(origem, Future):
+            origem = origem.result()
+        return ResultCache.materialize(origem, output_path)
+
+    @staticmethod
+    def _read_unit(paths):
+        """
+        Decodifica as imagens de uma unidade de trabalho.
+
+        Executado nas threads de leitura do pipeline.
+
+        Args:
+            paths (list): Caminhos das imagens.
+
+        Returns:
+            list: Pares (caminho, numpy.ndarray) das imagens lidas.
+        """
+        itens = []
+        for path in paths:
+            try:
+                with Image.open(path) as imagem:
+                    itens.append((path, np.array(imagem.convert('RGB'))))
+            except Exception as e:
+                logger.error(f'Erro ao ler {os.path.basename(path)}: {str(e)}')
+        return itens
+
+    @staticmethod
+    def _write_image(imagem_array, output_path):
+        """
+        Codifica e salva uma imagem de forma atômica.
+
+        A imagem é gravada em um arquivo temporário e renomeada no final,
+        para que uma interrupção nunca deixe uma saída truncada.
+
+        Args:
+            imagem_array (numpy.ndarray): Imagem a ser salva.
+            output_path (str): Caminho final da imagem.
+
+        Returns:
+            str: Caminho da imagem salva.
+        """
+        with atomic_output(output_path) as temp_path:
+            Image.fromarray(imagem_array).save(temp_path)
+        return output_path
+
+    def _infer_unit(self, itens, em_lote):
+        """
+        Executa a rede sobre as imagens de uma unidade de trabalho.
+
+        Args:
+            itens (list): Pares (caminho, numpy.ndarray).
+            em_lote (bool): Se True, tenta uma única passagem para todas.
+
+        Returns:
+            list: Pares (caminho, numpy.ndarray) com as imagens processadas.
+        """
+        if em_lote and len(itens) > 1:
+            try:
+                saidas = self.enhance_arrays([a for _, a in itens])
+                return [(p, s) for (p, _), s in zip(itens, saidas)]
+            except Exception as e:
+                # Tentar novamente uma a uma (com tiles, se preciso)
+                logger.error(f'Erro ao processar lote: {str(e)}')
+
+        resultados = []
+        for path, imagem_array in itens:
+            try:
+                resultados.append((path, self.enhance_array(imagem_array)))
+            except Exception as e:
+                logger.error(
+                    f'Erro ao processar {os.path.basename(path)}: {str(e)}'
+                )
+        return resultados
+
+    def _run_pipeline(self, unidades, output_dir, on_saved=None):
+        """
+        Processa as unidades de trabalho em três estágios sobrepostos.
+
+        Um pool de leitura decodifica as próximas unidades enquanto a rede
+        processa a atual, e um pool de escrita codifica e salva os
+        resultados. No máximo UPSCALE_SETTINGS['queue_depth'] unidades
+        ficam decodificadas à espera e no máximo o mesmo número aguarda
+        gravação, o que limita a memória usada.
+
+        Imagens idênticas a outra da mesma execução esperam a gravação da
+        primeira; se ela falhar, as cópias também são contadas como falhas.
+
+        Args:
+            unidades (list): Pares (caminhos, em_lote).
+            output_dir (str): Diretório de saída.
+            on_saved (callable, optional): Chamado como
+                on_saved(input_path, output_path) após cada gravação.
+
+        Returns:
+            float: Megapixels de entrada processados.
+        """
+        profundidade = max(1, UPSCALE_SETTINGS['queue_depth'])
+        megapixels = 0.0
+        reaproveitadas = 0
+        falhas = 0
+        leituras = deque()
+        escritas = deque()
+        pendentes = iter(unidades)
+        cache = self.result_cache
+        # Chave -> gravação da primeira cópia processada nesta execução
+        em_voo = {}
+
+        def ler(caminhos):
+            itens = self._read_unit(caminhos)
+            chaves = {}
+            if cache is not None:
+                for path, imagem_array in itens:
+                    chaves[path] = self._cache_key(
+                        imagem_array,
+                        self._directory_output_path(path, output_dir),
+                    )
+            return itens, chaves
+
+        def agendar_leitura():
+            unidade = next(pendentes, None)
+            if unidade is not None:
+                caminhos, em_lote = unidade
+                leituras.append(
+                    (leitores.submit(ler, caminhos), caminhos, em_lote)
+                )
+
+        def agendar_escrita(funcao, args, caminho):
+            while len(escritas) >= profundidade:
+                concluir_escrita()
+            futuro = escritores.submit(funcao, *args)
+            escritas.append((futuro, caminho))
+            return futuro
+
+        def concluir_escrita():
+            nonlocal falhas
+            futuro, caminho = escritas.popleft()
+            try:
+                output_path = futuro.result()
+            except Exception as e:
+                logger.error(
+                    f'Erro ao salvar {os.path.basename(caminho)}: {str(e)}'
+                )
+                falhas += 1
+                return
+            if on_saved:
+                on_saved(caminho, output_path)
+
+        with ThreadPoolExecutor(
+            max_workers=UPSCALE_SETTINGS['read_workers'],
+            thread_name_prefix='upscale-leitura',
+        ) as leitores, ThreadPoolExecutor(
+            max_workers=UPSCALE_SETTINGS['write_workers'],
+            thread_name_prefix='upscale-escrita',
+        ) as escritores, tqdm(
+            total=sum(len(c) for c, _ in unidades),
+            desc='Processando imagens',
+        ) as barra:
+            for _ in range(profundidade):
+                agendar_leitura()
+
+            while leituras:
+                futuro, caminhos, em_lote = leituras.popleft()
+                itens, chaves = futuro.result()
+                agendar_leitura()
+                falhas += len(caminhos) - len(itens)
+
+                # Separar imagens já conhecidas (cache ou repetidas)
+                a_processar = []
+                repetidas = []
+                for path, imagem_array in itens:
+                    output_path = self._directory_output_path(path, output_dir)
+                    chave = chaves.get(path)
+                    origem = None
+                    if chave is not None:
+                        origem = em_voo.get(chave) or cache.lookup(
+                            chave, os.path.splitext(output_path)[1]
+                        )
+
+                    if origem is not None:
+                        agendar_escrita(
+                            self._copy_result, (origem, output_path), path
+                        )
+                        reaproveitadas += 1
+                    elif chave is not None and any(
+                        chaves[p] == chave for p, _ in a_processar
+                    ):
+                        repetidas.append((path, chave))
+                    else:
+                        a_processar.append((path, imagem_array))
+
+                processadas = self._infer_unit(a_processar, em_lote)
+                falhas += len(a_processar) - len(processadas)
+                for path, saida in processadas:
+                    output_path = self._directory_output_path(path, output_dir)
+                    chave = chaves.get(path)
+                    gravacao = agendar_escrita(
+                        self._write_result, (saida, output_path, chave), path
+                    )
+                    if chave is not None:
+                        em_voo[chave] = gravacao
+
+                for path, chave in repetidas:
+                    if chave not in em_voo:
+                        # A primeira cópia desta imagem falhou na inferência
+                        logger.error(
+                            f'Erro ao processar {os.path.basename(path)}: '
+                            'uma imagem idêntica falhou.'
+                        )
+                        falhas += 1
+                        continue
+                    agendar_escrita(
+                        self._copy_result,
+                        (
+                            em_voo[chave],
+                            self._directory_output_path(path, output_dir),
+                        ),
+                        path,
+                    )
+                    reaproveitadas += 1
+
+                megapixels += (
+                    sum(a.shape[0] * a.shape[1] for _, a in itens) / 1e6
+                )
+                barra.update(len(itens))
+
+            while escritas:
+                concluir_escrita()
+
+        if reaproveitadas:
+            logger.info(
+                f'{reaproveitadas} imagens idênticas reaproveitadas sem inferência.'
+            )
+        if falhas:
+            logger.warning(f'{falhas} imagens não puderam ser processadas.')
+        return megapixels
+
+    def _run_worker_pool(
+        self, paths, output_dir, workers, on_saved=None, use_cache=True
+    ):
+        """
+        Processa imagens em um pool de processos, cada um com o modelo.
+
+        Cada processo carrega a rede uma única vez e usa núcleos/workers
+        threads de PyTorch; as imagens são distribuídas pela fila do pool.
+
+        Args:
+            paths (list): Imagens de entrada.
+            output_dir (str): Diretório de saída.
+            workers (int): Número de processos.
+            on_saved (callable, optional): Chamado como
+                on_saved(input_path, output_path) após cada gravação.
+            use_cache (bool, optional): Se False, ignora o cache de
+                resultados (usado na calibração).
+
+        Returns:
+            list: Resultados de _upscale_worker_item das imagens processadas.
+        """
+        threads = max(1, get_cpu_count() // workers)
+        logger.info(f'Usando {workers} processos com {threads} threads cada.')
+        if not (self._auto_model and self.has_target):
+            self._export_onnx_for_workers()
+        opcoes = {
+            'model_path': (
+                'auto'
+                if self._auto_model and self.has_target
+                else self._resolve_model()
+            ),
+            'scale': self.scale,
+            'tile': self.tile,
+            'tile_pad': self.tile_pad,
+            'backend': self.backend,
+            'workers': 1,
+            'target_width': self.target_width,
+            'target_height': self.target_height,
+            'target_megapixels': self.target_megapixels,
+            'use_cache': use_cache and self.result_cache is not None,
+        }
+
+        resultados = []
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_upscale_worker,
+            initargs=(opcoes, threads, workers),
+        ) as executor, tqdm(
+            total=len(paths), desc='Processando imagens'
+        ) as barra:
+            futures = {
+                executor.submit(
+                    _upscale_worker_item,
+                    path,
+                    self._directory_output_path(path, output_dir),
+                ): path
+                for path in paths
+            }
+            for future in as_completed(futures):
+                try:
+                    resultado = future.result()
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    logger.error(
+                        f'Erro ao processar {os.path.basename(futures[future])}: '
+                        f'{str(e)}'
+                    )
+                    continue
+                finally:
+                    barra.update(1)
+
+                resultados.append(resultado)
+                if on_saved:
+                    on_saved(resultado['input_path'], resultado['output_path'])
+
+        reaproveitadas = sum(r['cached'] for r in resultados)
+        if reaproveitadas:
+            logger.info(
+                f'{reaproveitadas} imagens idênticas reaproveitadas sem inferência.'
+            )
+        return resultados
+
+    def _export_onnx_for_workers(self):
+        """
+        Exporta a rede para ONNX uma vez, antes de iniciar o pool.
+
+        Assim os processos do pool só abrem o arquivo exportado, em vez de
+        cada um exportar a mesma rede. Com modelo escolhido por imagem, ou
+        em GPU, não há nada a fazer aqui.
+        """
+        if (
+            self.backend != 'onnx'
+            or not onnx_available()
+            or torch.cuda.is_available()
+        ):
+            return
+
+        self._resolve_model()
+        if os.path.exists(onnx_cache_path(self.model_path)):
+            return
+
+        try:
+            export_onnx(
+                self._build_network(torch.device('cpu')), self.model_path
+            )
+        except Exception as e:
+            # Cada processo tenta de novo e, se falhar, usa eager
+            logger.warning(f'Falha ao exportar o modelo para ONNX: {str(e)}')
+
+    def _layout_key(self):
+        """Identifica máquina, modelo e backend no cache de layouts."""
+        return '|'.join(
+            [
+                platform.node(),
+                platform.machine(),
+                str(get_cpu_count()),
+                os.path.basename(self._resolve_model()),
+                self.backend,
+            ]
+        )
+
+    def calibrate_workers(self, sample_paths):
+        """
+        Mede a vazão com 1, 2, 4... processos e escolhe a melhor.
+
+        A medição usa só as primeiras UPSCALE_SETTINGS['calibration_images']
+        imagens, e os candidatos vão até esse número de processos, então o
+        custo é pequeno e fixo. Trabalhos que não passam do custo da
+        calibração não a executam e usam um único processo. O resultado é
+        gravado em cache para esta máquina, modelo e backend, então a
+        calibração só roda na primeira vez.
+
+        Args:
+            sample_paths (list): Imagens do trabalho; as primeiras são
+                usadas na medição.
+
+        Returns:
+            int: Número de processos com a maior vazão.
+        """
+        chave = self._layout_key()
+        layouts = _load_layouts()
+        if chave in layouts:
+            return layouts[chave]['workers']
+
+        nucleos = get_cpu_count()
+        amostra = sample_paths[: UPSCALE_SETTINGS['calibration_images']]
+        candidatos = [1]
+        while candidatos[-1] * 2 <= min(nucleos, len(amostra)):
+            candidatos.append(candidatos[-1] * 2)
+        if len(candidatos) == 1:
+            return 1
+
+        # Calibrar custaria mais do que processar o trabalho inteiro
+        if len(sample_paths) <= len(candidatos) * len(amostra):
+            logger.info(
+                'Trabalho pequeno demais para calibrar; usando 1 processo.'
+            )
+            return 1
+
+        logger.info(
+            f'Calibrando processos ({candidatos}) com {len(amostra)} imagens...'
+        )
+
+        vazoes = {}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for workers in candidatos:
+                resultados = self._run_worker_pool(
+                    amostra, temp_dir, workers, use_cache=False
+                )
+                if not resultados:
+                    continue
+
+                # Tempo de parede ~ processo mais ocupado (ignora a partida)
+                tempo_por_processo = defaultdict(float)
+                for r in resultados:
+                    tempo_por_processo[r['pid']] += r['seconds']
+                megapixels = sum(r['megapixels'] for r in resultados)
+                vazoes[workers] = megapixels / max(tempo_por_processo.values())
+                logger.info(f'{workers} processos: {vazoes[workers]:.3f} MP/s')
+
+        if not vazoes:
+            return 1
+
+        melhor = max(vazoes, key=vazoes.get)
+        layouts[chave] = {
+            'workers': melhor,
+            'threads': max(1, nucleos // melhor),
+            'throughput': {str(n): v for n, v in vazoes.items()},
+        }
+        _save_layouts(layouts)
+        logger.info(f'Layout escolhido: {melhor} processos.')
+        return melhor
+
+    def _resolve_workers(self, paths):
+        """
+        Determina quantos processos usar em process_directory.
+
+        Args:
+            paths (list): Imagens a processar.
+
+        Returns:
+            int: Número de processos (1 processa no próprio processo).
+        """
+        if torch.cuda.is_available():
+            # Na GPU um único processo já ocupa o dispositivo
+            return 1
+
+        workers = self.workers
+        if workers == 'auto':
+            workers = self.calibrate_workers(paths)
+        return max(1, min(int(workers), len(paths)))
+
+    def _plan_units(self, paths):
+        """
+        Agrupa as imagens nas unidades de trabalho do pipeline.
+
+        Args:
+            paths (list): Imagens a processar.
+
+        Returns:
+            list: Pares (caminhos, processar em lote).
+        """
+        # No modo alvo cada imagem pode usar um modelo diferente
+        if self.batch_size > 1 and not self.has_target:
+            lotes, individuais = self._plan_batches(paths)
+            logger.info(
+                f'{len(lotes)} lotes de até {self.batch_size} imagens; '
+                f'{len(individuais)} imagens processadas individualmente.'
+            )
+        else:
+            lotes, individuais = [], paths
+
+        unidades = [(lote, True) for lote in lotes]
+        unidades += [([caminho], False) for caminho in individuais]
+        return unidades
+
+    @staticmethod
+    def _directory_output_path(input_path, output_dir):
+        """Caminho de saída de uma imagem processada em lote de diretório."""
+        nome_arquivo, extensao = os.path.splitext(os.path.basename(input_path))
+        return os.path.join(output_dir, f'{nome_arquivo}_upscaled{extensao}')
+
+    def process_directory(self, input_dir, output_dir=None, resume=True):
         """
         Processa todas as imagens em um diretório para aumentar a resolução.
 
+        O progresso é registrado em um manifesto no diretório de saída; com
+        resume=True, imagens já processadas com o mesmo modelo e escala e
+        que não mudaram desde então são puladas.
+
+        Com um processo, as imagens passam pelo pipeline de leitura,
+        inferência e gravação sobrepostas, em lotes de batch_size. Com
+        workers > 1, cada processo recebe uma imagem por vez e não há
+        lotes nem pipeline: o paralelismo vem dos processos.
+
         Args:
             input_dir (str): Diretório com as imagens de entrada.
             output_dir (str, optional): Diretório onde as imagens processadas serão salvas.
+            resume (bool, optional): Se False, reprocessa todas as imagens.
 
         Returns:
             str: Diretório onde as imagens foram salvas.
@@ -203,9 +1678,16 @@ class ImageEnhancer:
             'process_directory',
             input_dir=input_dir,
             output_dir=output_dir,
+            resume=resume,
         )
 
         try:
+            removidos = remove_partial_files(output_dir)
+            if removidos:
+                logger.info(
+                    f'{removidos} saídas incompletas de uma execução anterior removidas.'
+                )
+
             # Listar todas as imagens na pasta
             files = os.listdir(input_dir)
             imagens = [
@@ -224,23 +1706,98 @@ class ImageEnhancer:
                 f'Encontradas {len(imagens)} imagens para processamento.'
             )
 
-            # Carregar modelo
-            self.load_model()
+            # Localizar o modelo (carregado depois, aqui ou nos processos)
+            self._resolve_model()
+
+            manifesto = UpscaleManifest(output_dir)
+            opcoes = self._result_settings()
+
+            caminhos = [os.path.join(input_dir, f) for f in imagens]
+            if resume:
+                caminhos = [
+                    c for c in caminhos if not manifesto.is_done(c, opcoes)
+                ]
+                if len(caminhos) < len(imagens):
+                    logger.info(
+                        f'{len(imagens) - len(caminhos)} imagens já processadas '
+                        'e inalteradas serão puladas.'
+                    )
 
-            # Processar cada imagem com feedback de progresso
-            for imagem in tqdm(imagens, desc='Processando imagens'):
-                input_path = os.path.join(input_dir, imagem)
-                nome_arquivo, extensao = os.path.splitext(imagem)
-                output_path = os.path.join(
-                    output_dir, f'{nome_arquivo}_upscaled{extensao}'
+            if self.has_target:
+                restantes = [
+                    c for c in caminhos if not self._reaches_target(c)
+                ]
+                if len(restantes) < len(caminhos):
+                    logger.info(
+                        f'{len(caminhos) - len(restantes)} imagens já atingem '
+                        'a resolução alvo e serão puladas.'
+                    )
+                caminhos = restantes
+
+            # Imagens muito grandes são processadas em faixas, uma a uma
+            grandes = [c for c in caminhos if self._should_stream(c)]
+            if grandes:
+                logger.info(
+                    f'{len(grandes)} imagens grandes serão processadas em faixas.'
                 )
+                caminhos = [c for c in caminhos if c not in grandes]
 
-                try:
-                    self.enhance_image(input_path, output_path)
-                except Exception as e:
-                    logger.error(f'Erro ao processar {imagem}: {str(e)}')
+            gravadas = []
+
+            def registrar(input_path, output_path):
+                manifesto.record(input_path, output_path, opcoes)
+                gravadas.append(input_path)
+                if len(gravadas) % MANIFEST_SAVE_INTERVAL == 0:
+                    manifesto.save()
+
+            workers = self._resolve_workers(caminhos) if caminhos else 1
+
+            inicio = time.time()
+            megapixels = 0.0
+            try:
+                for path in grandes:
+                    try:
+                        saida = self.enhance_image_streaming(
+                            path, self._directory_output_path(path, output_dir)
+                        )
+                    except Exception as e:
+                        logger.error(
+                            f'Erro ao processar {os.path.basename(path)}: {str(e)}'
+                        )
+                        continue
+                    registrar(path, saida)
+                    megapixels += self._image_megapixels(path)
+
+                if workers > 1:
+                    if self.batch_size > 1:
+                        logger.info(
+                            'Com vários processos as imagens são processadas '
+                            'uma a uma, sem lotes.'
+                        )
+                    resultados = self._run_worker_pool(
+                        caminhos, output_dir, workers, on_saved=registrar
+                    )
+                    megapixels += sum(r['megapixels'] for r in resultados)
+                elif caminhos:
+                    if not self.has_target:
+                        self.load_model()
+                    megapixels += self._run_pipeline(
+                        self._plan_units(caminhos),
+                        output_dir,
+                        on_saved=registrar,
+                    )
+            finally:
+                # Garante que o progresso sobreviva a uma interrupção
+                manifesto.save()
+
+            duracao = time.time() - inicio
+            if duracao > 0:
+                logger.info(
+                    f'Vazão: {megapixels / duracao:.3f} MP/s de entrada '
+                    f'({megapixels:.1f} MP em {duracao:.1f}s).'
+                )
 
-            log_process_end(logger, 'process_directory')
+            log_process_end(logger, 'process_directory', duracao)
             return output_dir
 
         except Exception as e:
@@ -0,0 +1,224 @@
+"""
+Backends de inferência em CPU para as redes de upscaling.
+"""
+
+import os
+import importlib.util
+
+import torch
+
+from config.settings import CACHE_DIR
+from utils.file_utils import atomic_output, ensure_dir_exists
+from utils.logging_utils import setup_logger
+
+logger = setup_logger('inference_backends')
+
+# Backends disponíveis, do mais simples ao mais otimizado
+BACKENDS = ('eager', 'channels_last', 'bf16', 'torchscript', 'compile', 'onnx')
+
+# Tamanho da entrada usada para rastrear/exportar a rede
+EXAMPLE_SIZE = 64
+
+# Diretório das redes exportadas para ONNX
+ONNX_CACHE_DIR = os.path.join(CACHE_DIR, 'onnx')
+
+
+def bf16_supported():
+    """
+    Verifica se a CPU executa operações bfloat16 de forma nativa.
+
+    Returns:
+        bool: True se o oneDNN suporta bfloat16 nesta CPU.
+    """
+    try:
+        return bool(torch.ops.mkldnn._is_mkldnn_bf16_supported())
+    except (AttributeError, RuntimeError):
+        return False
+
+
+def onnx_available():
+    """
+    Verifica se o ONNX Runtime está instalado.
+
+    Returns:
+        bool: True se onnxruntime pode ser importado.
+    """
+    return importlib.util.find_spec('onnxruntime') is not None
+
+
+def available_backends():
+    """
+    Lista os backends que podem ser usados neste sistema.
+
+    Returns:
+        list: Nomes dos backends disponíveis.
+    """
+    backends = list(BACKENDS)
+    if not bf16_supported():
+        backends.remove('bf16')
+    if not onnx_available():
+        backends.remove('onnx')
+    return backends
+
+
+class _ChannelsLastModel(torch.nn.Module):
+    """Executa a rede com tensores no formato channels_last (NHWC)."""
+
+    def __init__(self, model, dtype=None):
+        super().__init__()
+        self.model = model.to(memory_format=torch.channels_last)
+        self.dtype = dtype
+
+    def forward(self, x):
+        x = x.contiguous(memory_format=torch.channels_last)
+        if self.dtype is None:
+            return self.model(x).contiguous()
+
+        with torch.autocast('cpu', dtype=self.dtype):
+            saida = self.model(x)
+        return saida.float().contiguous()
+
+
+class _OnnxModel:
+    """Executa uma rede exportada para ONNX com o ONNX Runtime."""
+
+    def __init__(self, onnx_path):
+        import onnxruntime
+
+        opcoes = onnxruntime.SessionOptions()
+        opcoes.graph_optimization_level = (
+            onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        )
+        self.session = onnxruntime.InferenceSession(
+            onnx_path, opcoes, providers=['CPUExecutionProvider']
+        )
+        self.input_name = self.session.get_inputs()[0].name
+        # Os pesos ficam na sessão; o arquivo exportado dá o seu tamanho
+        self.memory_size = os.path.getsize(onnx_path)
+
+    def __call__(self, x):
+        entrada = x.detach().float().cpu().numpy()
+        saida = self.session.run(None, {self.input_name: entrada})[0]
+        return torch.from_numpy(saida).to(x.device)
+
+
+def _example_input():
+    """Entrada de exemplo com dimensões aceitas por qualquer escala nativa."""
+    return torch.rand(1, 3, EXAMPLE_SIZE, EXAMPLE_SIZE)
+
+
+def onnx_cache_path(model_path):
+    """
+    Caminho da exportação ONNX de um arquivo de pesos.
+
+    O nome inclui o tamanho e a data de modificação dos pesos, então uma
+    troca do arquivo gera uma nova exportação.
+
+    Args:
+        model_path (str): Arquivo de pesos.
+
+    Returns:
+        str: Caminho do arquivo ONNX.
+    """
+    stat = os.stat(model_path)
+    nome = os.path.splitext(os.path.basename(model_path))[0]
+    return os.path.join(
+        ONNX_CACHE_DIR, f'{nome}-{stat.st_size}-{stat.st_mtime_ns}.onnx'
+    )
+
+
+def export_onnx(model, model_path):
+    """
+    Exporta a rede para ONNX com altura e largura dinâmicas, se preciso.
+
+    A exportação é gravada com atomic_output: processos que exportam a
+    mesma rede ao mesmo tempo não leem arquivos incompletos, e o primeiro
+    arquivo gravado é mantido.
+
+    Args:
+        model (torch.nn.Module): Rede em fp32.
+        model_path (str): Arquivo de pesos da rede.
+
+    Returns:
+        str: Caminho do arquivo ONNX.
+    """
+    onnx_path = onnx_cache_path(model_path)
+    if os.path.exists(onnx_path):
+        return onnx_path
+
+    logger.info(f'Exportando modelo para ONNX: {onnx_path}')
+    ensure_dir_exists(ONNX_CACHE_DIR)
+    eixos = {0: 'lote', 2: 'altura', 3: 'largura'}
+    with atomic_output(onnx_path, keep_existing=True) as temp_path:
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                (_example_input(),),
+                temp_path,
+                input_names=['entrada'],
+                output_names=['saida'],
+                dynamic_axes={'entrada': eixos, 'saida': eixos},
+                opset_version=17,
+                dynamo=False,
+            )
+    return onnx_path
+
+
+def prepare_model(model, backend, model_path=None):
+    """
+    Prepara uma rede em fp32 para inferência em CPU com o backend pedido.
+
+    Se o backend não estiver disponível ou falhar ao ser preparado, a rede
+    original (eager) é devolvida e o motivo é registrado no log.
+
+    Args:
+        model (torch.nn.Module): Rede em fp32, em modo de avaliação.
+        backend (str): Um dos valores de BACKENDS.
+        model_path (str, optional): Arquivo de pesos; o ONNX exportado é
+                                    salvo em cache e reaproveitado.
+
+    Returns:
+        tuple: (modelo, backend) - Objeto chamável como a rede original e
+               o backend efetivamente usado.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f'Backend de inferência desconhecido: {backend}')
+
+    if backend == 'eager':
+        return model, 'eager'
+
+    try:
+        if backend == 'channels_last':
+            return _ChannelsLastModel(model), backend
+
+        if backend == 'bf16':
+            if not bf16_supported():
+                logger.warning('CPU sem suporte a bfloat16; usando eager.')
+                return model, 'eager'
+            return _ChannelsLastModel(model, torch.bfloat16), backend
+
+        if backend == 'torchscript':
+            with torch.no_grad():
+                rastreado = torch.jit.trace(
+                    model, _example_input(), check_trace=False
+                )
+            return torch.jit.optimize_for_inference(rastreado), backend
+
+        if backend == 'compile':
+            compilado = torch.compile(model, dynamic=True)
+            # A compilação é preguiçosa: forçar agora para detectar falhas
+            with torch.no_grad():
+                compilado(_example_input())
+            return compilado, backend
+
+        if not onnx_available():
+            logger.warning('onnxruntime não está instalado; usando eager.')
+            return model, 'eager'
+
+        return _OnnxModel(export_onnx(model, model_path)), backend
+
+    except Exception as e:
+        logger.warning(
+            f'Falha ao preparar o backend {backend}: {str(e)}; usando eager.'
+        )
+        return model, 'eager'
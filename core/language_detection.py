@@ -0,0 +1,176 @@
+"""
+Detecção do idioma de um arquivo uma única vez, com o resultado em cache.
+"""
+
+import os
+import json
+import hashlib
+
+import numpy as np
+import torch
+
+from config.settings import TRANSCRIPTION_SETTINGS, CACHE_DIR
+from core.batched_whisper import WINDOW_SECONDS, log_mel_batch
+from core.transcript_cache import media_hash
+from core.voice_activity import SAMPLE_RATE, detect_speech
+from utils.audio_stream import AudioReader, probe_duration
+from utils.file_utils import atomic_output, ensure_dir_exists
+from utils.logging_utils import setup_logger
+
+logger = setup_logger('language_detection')
+
+# Diretório dos idiomas detectados
+LANGUAGE_CACHE_DIR = os.path.join(CACHE_DIR, 'languages')
+
+
+def language_key(path, model_name):
+    """
+    Chave do idioma detectado de um arquivo de mídia.
+
+    Depende só do conteúdo do arquivo (media_hash) e do modelo que fez a
+    detecção.
+
+    Args:
+        path (str): Caminho do arquivo.
+        model_name (str): Nome do modelo Whisper.
+
+    Returns:
+        str: Chave hexadecimal.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    h.update(media_hash(path).encode())
+    h.update(model_name.encode())
+    return h.hexdigest()
+
+
+def load_language(key):
+    """
+    Lê o idioma detectado de um arquivo, se já existir.
+
+    Args:
+        key (str): Chave calculada por language_key.
+
+    Returns:
+        dict or None: 'language' e 'probability', ou None.
+    """
+    caminho = os.path.join(LANGUAGE_CACHE_DIR, f'{key}.json')
+    if not os.path.exists(caminho):
+        return None
+
+    try:
+        with open(caminho, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f'Idioma em cache inválido ({caminho}): {e}')
+        return None
+
+
+def save_language(key, language, probability):
+    """
+    Grava o idioma detectado de um arquivo.
+
+    Args:
+        key (str): Chave calculada por language_key.
+        language (str): Código do idioma.
+        probability (float): Probabilidade média do idioma nas amostras.
+    """
+    ensure_dir_exists(LANGUAGE_CACHE_DIR)
+    caminho = os.path.join(LANGUAGE_CACHE_DIR, f'{key}.json')
+    with atomic_output(caminho) as temp_path:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'language': language, 'probability': probability}, f)
+
+
+def sample_windows(path, candidates):
+    """
+    Lê janelas de WINDOW_SECONDS espalhadas pelo arquivo.
+
+    Arquivos com até candidates janelas são lidos do início, em janelas
+    consecutivas; nos maiores, cada janela é lida de uma posição do
+    arquivo (o ffmpeg pula direto até ela), então o custo não depende da
+    duração.
+
+    Args:
+        path (str): Caminho do arquivo de áudio ou vídeo.
+        candidates (int): Número de janelas.
+
+    Returns:
+        list: Amostras (numpy.ndarray a 16 kHz) de cada janela não vazia.
+    """
+    tamanho = int(WINDOW_SECONDS * SAMPLE_RATE)
+    duracao = probe_duration(path)
+    if duracao is None or duracao <= candidates * WINDOW_SECONDS:
+        with AudioReader(path) as reader:
+            audio = reader.read(candidates * tamanho)
+        janelas = [
+            audio[i : i + tamanho] for i in range(0, len(audio), tamanho)
+        ]
+    else:
+        janelas = []
+        for inicio in np.linspace(0, duracao - WINDOW_SECONDS, candidates):
+            with AudioReader(path, float(inicio)) as reader:
+                janelas.append(reader.read(tamanho))
+    return [janela for janela in janelas if len(janela)]
+
+
+def detect_language(model, path):
+    """
+    Detecta o idioma falado em um arquivo com poucas janelas de amostra.
+
+    Entre TRANSCRIPTION_SETTINGS['language_candidates'] janelas espalhadas
+    pelo arquivo, as 'language_samples' com mais fala (detect_speech, com
+    um único piso de ruído para todas) passam juntas pelo codificador, só
+    com seus trechos de fala; o idioma é o de maior probabilidade média
+    entre elas.
+
+    Args:
+        model (whisper.model.Whisper): Modelo carregado.
+        path (str): Caminho do arquivo de áudio ou vídeo.
+
+    Returns:
+        tuple: (idioma, probabilidade), ou (None, 0.0) se o arquivo não
+               tiver áudio.
+    """
+    if not model.is_multilingual:
+        return 'en', 1.0
+
+    janelas = sample_windows(
+        path, TRANSCRIPTION_SETTINGS['language_candidates']
+    )
+    if not janelas:
+        return None, 0.0
+
+    # Amostras com fala, detectadas no áudio das janelas juntas
+    audio = np.concatenate(janelas)
+    fala = np.zeros(len(audio), dtype=bool)
+    for inicio, fim in detect_speech(audio):
+        fala[int(inicio * SAMPLE_RATE) : int(fim * SAMPLE_RATE)] = True
+
+    amostras = []
+    origem = 0
+    for janela in janelas:
+        mascara = fala[origem : origem + len(janela)]
+        origem += len(janela)
+        amostras.append(
+            (int(mascara.sum()), janela[mascara] if mascara.any() else janela)
+        )
+
+    # As janelas com mais fala, só com os seus trechos de fala
+    amostras.sort(key=lambda amostra: amostra[0], reverse=True)
+    recortes = [
+        recorte
+        for _, recorte in amostras[
+            : TRANSCRIPTION_SETTINGS['language_samples']
+        ]
+    ]
+
+    mel = log_mel_batch(recortes, model.dims.n_mels, model.device)
+    with torch.no_grad():
+        _, probabilidades = model.detect_language(mel)
+
+    media = {
+        idioma: float(np.mean([p[idioma] for p in probabilidades]))
+        for idioma in probabilidades[0]
+    }
+    idioma = max(media, key=media.get)
+    return idioma, media[idioma]
@@ -0,0 +1,224 @@
+"""
+Registro de modelos compartilhado entre abas e execuções.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+
+import torch
+
+from config.settings import MODEL_REGISTRY
+from utils.logging_utils import setup_logger
+
+logger = setup_logger('model_registry')
+
+
+def model_memory_size(model):
+    """
+    Estima a memória ocupada pelos pesos de um modelo.
+
+    Args:
+        model: Módulo PyTorch, ou objeto com o atributo memory_size (como
+               as sessões ONNX); outros tipos contam 0.
+
+    Returns:
+        int: Tamanho aproximado em bytes.
+    """
+    if hasattr(model, 'memory_size'):
+        return model.memory_size
+
+    if not isinstance(model, torch.nn.Module):
+        return 0
+
+    tensores = list(model.parameters()) + list(model.buffers())
+    return sum(t.numel() * t.element_size() for t in tensores)
+
+
+class _PendingLoad:
+    """Carregamento em andamento, compartilhado por quem pede a mesma chave."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.model = None
+        self.error = None
+
+
+class ModelRegistry:
+    """
+    Cache de modelos por processo, com carregamento único e despejo LRU.
+
+    As chaves normalmente são tuplas (nome do modelo, dispositivo,
+    precisão). Pedidos simultâneos pela mesma chave esperam um único
+    carregamento. Quando a memória total passa de max_memory, os modelos
+    usados há mais tempo são descartados, e modelos ociosos por mais de
+    idle_timeout segundos são descarregados em segundo plano.
+    """
+
+    def __init__(self, max_memory=None, idle_timeout=None):
+        """
+        Inicializa o registro.
+
+        Args:
+            max_memory (int, optional): Limite de memória em bytes.
+            idle_timeout (float, optional): Tempo ocioso, em segundos, após o
+                                            qual um modelo é descarregado
+                                            (0 desativa).
+        """
+        self.max_memory = (
+            max_memory
+            if max_memory is not None
+            else MODEL_REGISTRY['max_memory_mb'] * 1024 * 1024
+        )
+        self.idle_timeout = (
+            idle_timeout
+            if idle_timeout is not None
+            else MODEL_REGISTRY['idle_timeout']
+        )
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._loading = {}
+        self._sweeper = None
+
+    def get(self, key, loader):
+        """
+        Obtém um modelo do cache, carregando-o uma única vez se necessário.
+
+        Args:
+            key (tuple): Chave do modelo (nome, dispositivo, precisão).
+            loader (callable): Função sem argumentos que carrega o modelo.
+
+        Returns:
+            object: O modelo carregado.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry['last_used'] = time.monotonic()
+                self._entries.move_to_end(key)
+                logger.info(f'Modelo reaproveitado do cache: {key}')
+                return entry['model']
+
+            pending = self._loading.get(key)
+            owner = pending is None
+            if owner:
+                pending = _PendingLoad()
+                self._loading[key] = pending
+
+        if not owner:
+            logger.info(f'Aguardando carregamento em andamento: {key}')
+            pending.event.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.model
+
+        try:
+            inicio = time.time()
+            model = loader()
+            logger.info(
+                f'Modelo {key} carregado em {time.time() - inicio:.2f}s.'
+            )
+        except BaseException as e:
+            pending.error = e
+            with self._lock:
+                del self._loading[key]
+            pending.event.set()
+            raise
+
+        with self._lock:
+            self._entries[key] = {
+                'model': model,
+                'size': model_memory_size(model),
+                'last_used': time.monotonic(),
+            }
+            del self._loading[key]
+            self._enforce_memory_limit()
+            self._start_sweeper()
+
+        pending.model = model
+        pending.event.set()
+        return model
+
+    def evict(self, key):
+        """
+        Remove um modelo do cache.
+
+        Args:
+            key (tuple): Chave do modelo.
+
+        Returns:
+            bool: True se o modelo estava no cache.
+        """
+        with self._lock:
+            removido = self._entries.pop(key, None) is not None
+        if removido:
+            self._release_memory()
+        return removido
+
+    def clear(self):
+        """Remove todos os modelos do cache."""
+        with self._lock:
+            self._entries.clear()
+        self._release_memory()
+
+    def memory_usage(self):
+        """
+        Calcula a memória total ocupada pelos modelos em cache.
+
+        Returns:
+            int: Memória em bytes.
+        """
+        with self._lock:
+            return sum(e['size'] for e in self._entries.values())
+
+    def _enforce_memory_limit(self):
+        """Descarta os modelos menos usados até respeitar o limite (com lock)."""
+        total = sum(e['size'] for e in self._entries.values())
+
+        # O modelo mais recente nunca é descartado, mesmo acima do limite
+        while total > self.max_memory and len(self._entries) > 1:
+            key, entry = self._entries.popitem(last=False)
+            total -= entry['size']
+            logger.info(f'Modelo removido do cache (LRU): {key}')
+
+    def _start_sweeper(self):
+        """Inicia a thread que descarrega modelos ociosos (com lock)."""
+        if not self.idle_timeout or self._sweeper is not None:
+            return
+
+        self._sweeper = threading.Thread(
+            target=self._sweep_idle, name='model-registry-sweeper', daemon=True
+        )
+        self._sweeper.start()
+
+    def _sweep_idle(self):
+        """Laço da thread de limpeza de modelos ociosos."""
+        intervalo = max(1.0, min(self.idle_timeout / 2, 60.0))
+
+        while True:
+            time.sleep(intervalo)
+            limite = time.monotonic() - self.idle_timeout
+
+            with self._lock:
+                ociosos = [
+                    key
+                    for key, entry in self._entries.items()
+                    if entry['last_used'] < limite
+                ]
+                for key in ociosos:
+                    del self._entries[key]
+                    logger.info(f'Modelo ocioso descarregado: {key}')
+
+            if ociosos:
+                self._release_memory()
+
+    @staticmethod
+    def _release_memory():
+        """Devolve ao sistema a memória de GPU liberada pelos modelos."""
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+
+# Instância única usada por toda a aplicação
+model_registry = ModelRegistry()
@@ -3,13 +3,48 @@ Módulo para transcrição de áudio/vídeo para texto.
 """
 
 import os
+import math
 import time
+import numpy as np
 import torch
 import whisper
 import datetime
-from moviepy import VideoFileClip
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from tqdm import tqdm
+from whisper.model import AudioEncoder, ModelDimensions, TextDecoder, Whisper
 
-from config.settings import TRANSCRIPTION_SETTINGS
+from config.settings import (
+    TRANSCRIPTION_SETTINGS,
+    TRANSCRIPTION_PRESETS,
+    MODEL_REGISTRY,
+)
+from core.batched_whisper import WINDOW_SECONDS, decode_batch, split_windows
+from core.language_detection import (
+    detect_language,
+    language_key,
+    load_language,
+    save_language,
+)
+from core.model_registry import model_registry
+from core.transcript_cache import TranscriptCache
+from core.transcript_checkpoint import (
+    load_checkpoint,
+    prune_checkpoints,
+    remove_checkpoint,
+    save_checkpoint,
+)
+from core.voice_activity import (
+    SAMPLE_RATE,
+    TimelineMap,
+    detect_speech,
+    find_split_points,
+    group_windows,
+    stream_blocks,
+)
+from core.weights_cache import contiguous_tensors, load_weights
 from utils.logging_utils import (
     setup_logger,
     log_process_start,
@@ -17,26 +52,121 @@ from utils.logging_utils import (
 )
 from utils.file_utils import (
     get_output_path,
-    create_temp_file,
     is_supported_file,
 )
+from utils.audio_stream import AudioReader
+from utils.system_utils import get_cpu_count
 
 logger = setup_logger('transcriber')
 
+# A partir deste número de parâmetros, o modelo é montado no dispositivo
+# meta: a primeira operação nesse dispositivo custa alguns segundos por
+# processo, menos que inicializar aleatoriamente os modelos 'small' e
+# maiores (que seriam descartados em seguida)
+META_MIN_PARAMS = 200_000_000
+
+# Transcritor de cada processo do pool (criado em _init_transcription_worker)
+_worker_transcriber = None
+
+
+def _init_transcription_worker(opcoes, threads):
+    """
+    Inicializa um processo do pool: limita as threads e carrega o modelo.
+
+    Args:
+        opcoes (dict): Argumentos para Transcriber.
+        threads (int): Threads de PyTorch neste processo.
+    """
+    global _worker_transcriber
+
+    torch.set_num_threads(threads)
+    _worker_transcriber = Transcriber(**opcoes)
+    _worker_transcriber.load_model()
+
+
+def _transcribe_chunk(audio):
+    """
+    Transcreve uma parte do áudio em um processo do pool.
+
+    Args:
+        audio (numpy.ndarray): Amostras a 16 kHz.
+
+    Returns:
+        dict: Resultado de model.transcribe, com tempos relativos à parte.
+    """
+    return _worker_transcriber._transcribe_audio(audio)
+
+
+@contextmanager
+def _torch_threads(threads):
+    """
+    Fixa o número de threads de PyTorch durante o bloco.
+
+    O valor vale para o processo inteiro (inclusive para o upscaler na
+    mesma interface), então o anterior é restaurado no fim.
+
+    Args:
+        threads (int): Threads de PyTorch dentro do bloco.
+    """
+    anterior = torch.get_num_threads()
+    torch.set_num_threads(threads)
+    try:
+        yield
+    finally:
+        torch.set_num_threads(anterior)
+
 
 class Transcriber:
     """Classe para transcrição de áudio/vídeo para texto."""
 
-    def __init__(self, model_name=None, language=None):
+    def __init__(
+        self,
+        model_name=None,
+        language=None,
+        use_vad=None,
+        preset=None,
+        use_cache=None,
+        use_batch=None,
+    ):
         """
         Inicializa o transcritor com o modelo e idioma especificados.
 
         Args:
             model_name (str, optional): Nome do modelo Whisper a ser usado.
-            language (str, optional): Código do idioma para transcrição.
+            language (str, optional): Código do idioma para transcrição;
+                                      'auto' detecta o idioma uma vez por
+                                      arquivo (veja resolve_language).
+            use_vad (bool, optional): Transcrever apenas os trechos com fala.
+            preset (str, optional): Preset de decodificação
+                                    (chave de TRANSCRIPTION_PRESETS).
+            use_cache (bool, optional): Reaproveitar transcrições do
+                                        mesmo conteúdo e opções.
+            use_batch (bool, optional): Decodificar janelas independentes
+                                        de 30 s em lotes.
+
+        Raises:
+            ValueError: Se o preset não existir.
         """
         self.model_name = model_name or TRANSCRIPTION_SETTINGS['model']
         self.language = language or TRANSCRIPTION_SETTINGS['language']
+        # Idioma passado ao Whisper; com 'auto', fixado por arquivo
+        self.decode_language = (
+            None if self.language == 'auto' else self.language
+        )
+        self.use_vad = (
+            TRANSCRIPTION_SETTINGS['vad'] if use_vad is None else use_vad
+        )
+        self.preset = preset or TRANSCRIPTION_SETTINGS['preset']
+        if self.preset not in TRANSCRIPTION_PRESETS:
+            raise ValueError(f'Preset de transcrição desconhecido: {preset}')
+        if use_cache is None:
+            use_cache = TRANSCRIPTION_SETTINGS['cache']
+        self.cache = TranscriptCache() if use_cache else None
+        self.use_batch = (
+            TRANSCRIPTION_SETTINGS['batched']
+            if use_batch is None
+            else use_batch
+        )
         self.model = None
         self.device = None
 
@@ -57,10 +187,11 @@ class Transcriber:
             self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
             logger.info(f'Usando dispositivo: {self.device}')
 
-            # Carregar o modelo
+            # Obter o modelo do registro compartilhado (carrega só uma vez)
             logger.info(f"Carregando modelo Whisper '{self.model_name}'...")
-            self.model = whisper.load_model(
-                self.model_name, device=self.device
+            self.model = model_registry.get(
+                (self.model_name, self.device, 'fp32'),
+                self._load_whisper,
             )
 
             log_process_end(logger, 'load_model')
@@ -70,38 +201,125 @@ class Transcriber:
             logger.error(f'Erro ao carregar modelo: {str(e)}', exc_info=True)
             raise
 
-    def extract_audio(self, video_path, audio_out=None):
+    def _checkpoint_path(self):
+        """
+        Localiza o arquivo de pesos do modelo Whisper, se já existir.
+
+        Returns:
+            str or None: Caminho do checkpoint, ou None se o modelo ainda
+                         não foi baixado.
+        """
+        if os.path.isfile(self.model_name):
+            return self.model_name
+        if self.model_name not in whisper._MODELS:
+            return None
+
+        download_root = os.path.join(
+            os.getenv(
+                'XDG_CACHE_HOME',
+                os.path.join(os.path.expanduser('~'), '.cache'),
+            ),
+            'whisper',
+        )
+        caminho = os.path.join(
+            download_root, os.path.basename(whisper._MODELS[self.model_name])
+        )
+        return caminho if os.path.isfile(caminho) else None
+
+    @staticmethod
+    def _empty_whisper(dims):
         """
-        Extrai o áudio de um arquivo de vídeo.
+        Cria um modelo Whisper sem alocar nem inicializar os parâmetros.
+
+        Equivale a Whisper(dims) com as camadas no dispositivo meta; os
+        buffers que não fazem parte do state dict são criados em CPU.
 
         Args:
-            video_path (str): Caminho do arquivo de vídeo.
-            audio_out (str, optional): Caminho para salvar o áudio extraído.
+            dims (whisper.model.ModelDimensions): Dimensões do modelo.
 
         Returns:
-            str: Caminho do arquivo de áudio extraído.
+            whisper.model.Whisper: Modelo à espera de load_state_dict
+                                   com assign=True.
         """
-        if audio_out is None:
-            audio_out = create_temp_file(suffix='.wav')
+        modelo = Whisper.__new__(Whisper)
+        torch.nn.Module.__init__(modelo)
+        modelo.dims = dims
+        with torch.device('meta'):
+            modelo.encoder = AudioEncoder(
+                dims.n_mels,
+                dims.n_audio_ctx,
+                dims.n_audio_state,
+                dims.n_audio_head,
+                dims.n_audio_layer,
+            )
+            modelo.decoder = TextDecoder(
+                dims.n_vocab,
+                dims.n_text_ctx,
+                dims.n_text_state,
+                dims.n_text_head,
+                dims.n_text_layer,
+            )
 
-        log_process_start(
-            logger, 'extract_audio', video_path=video_path, audio_out=audio_out
+        mascara = torch.empty(dims.n_text_ctx, dims.n_text_ctx)
+        modelo.decoder.register_buffer(
+            'mask', mascara.fill_(-float('inf')).triu_(1), persistent=False
+        )
+        cabecas = torch.zeros(dims.n_text_layer, dims.n_text_head, dtype=bool)
+        cabecas[dims.n_text_layer // 2 :] = True
+        modelo.register_buffer(
+            'alignment_heads', cabecas.to_sparse(), persistent=False
         )
+        return modelo
 
-        try:
-            logger.info(f'Extraindo áudio do vídeo: {video_path}')
-            clip = VideoFileClip(video_path)
-            clip.audio.write_audiofile(
-                audio_out, codec='pcm_s16le', logger=None
-            )
-            clip.close()
+    def _load_whisper(self):
+        """
+        Carrega o modelo Whisper a partir do cache de pesos mapeado.
 
-            log_process_end(logger, 'extract_audio')
-            return audio_out
+        Na primeira vez o modelo é carregado (e baixado, com verificação do
+        checksum) pelo whisper e convertido para o cache de pesos. Nas
+        seguintes, a rede usa diretamente os tensores mapeados do cache,
+        sem desserializar nem verificar de novo o checkpoint original.
 
-        except Exception as e:
-            logger.error(f'Erro ao extrair áudio: {str(e)}', exc_info=True)
-            raise
+        Returns:
+            whisper.model.Whisper: O modelo no dispositivo atual.
+        """
+        if not MODEL_REGISTRY['mmap_weights']:
+            return whisper.load_model(self.model_name, device=self.device)
+
+        fonte = self._checkpoint_path()
+        carregado = None
+        if fonte is None:
+            # Modelo ainda não baixado: deixar o whisper baixá-lo
+            carregado = whisper.load_model(self.model_name, device='cpu')
+            fonte = self._checkpoint_path()
+            if fonte is None:
+                return carregado.to(self.device)
+
+        def converter():
+            modelo = carregado
+            if modelo is None:
+                modelo = whisper.load_model(self.model_name, device='cpu')
+            return {
+                'dims': asdict(modelo.dims),
+                'model_state_dict': contiguous_tensors(modelo.state_dict()),
+            }
+
+        dados = load_weights(fonte, converter)
+        dims = ModelDimensions(**dados['dims'])
+        pesos = dados['model_state_dict']
+
+        if sum(v.numel() for v in pesos.values()) < META_MIN_PARAMS:
+            modelo = Whisper(dims)
+        else:
+            modelo = self._empty_whisper(dims)
+        modelo.load_state_dict(pesos, assign=True)
+
+        if self.model_name in whisper._ALIGNMENT_HEADS:
+            modelo.set_alignment_heads(
+                whisper._ALIGNMENT_HEADS[self.model_name]
+            )
+
+        return modelo.to(self.device)
 
     def format_timestamp(self, seconds):
         """
@@ -121,6 +339,24 @@ class Transcriber:
             f'{hours:02d}:{minutes:02d}:{int(seconds):02d},{milliseconds:03d}'
         )
 
+    def srt_entry(self, index, segment):
+        """
+        Formata um segmento como uma entrada de legenda SRT.
+
+        Args:
+            index (int): Número da entrada (a partir de 1).
+            segment (dict): Segmento de transcrição.
+
+        Returns:
+            str: Entrada SRT, terminada por uma linha em branco.
+        """
+        start_time = self.format_timestamp(segment['start'])
+        end_time = self.format_timestamp(segment['end'])
+        return (
+            f'{index}\n{start_time} --> {end_time}\n'
+            f"{segment['text'].strip()}\n\n"
+        )
+
     def create_srt(self, segments, output_path):
         """
         Cria um arquivo de legenda no formato SRT.
@@ -136,27 +372,683 @@ class Transcriber:
 
         with open(srt_path, 'w', encoding='utf-8') as f:
             for i, segment in enumerate(segments):
-                # Escrever número do segmento
-                f.write(f'{i+1}\n')
-
-                # Escrever timestamps
-                start_time = self.format_timestamp(segment['start'])
-                end_time = self.format_timestamp(segment['end'])
-                f.write(f'{start_time} --> {end_time}\n')
-
-                # Escrever texto
-                f.write(f"{segment['text'].strip()}\n\n")
+                f.write(self.srt_entry(i + 1, segment))
 
         logger.info(f'Arquivo de legendas SRT criado em: {srt_path}')
         return srt_path
 
-    def transcribe(self, input_path, output_path=None):
+    def _iter_speech(self, model, audio, device, contexto=None):
+        """
+        Transcreve apenas os trechos com fala do áudio, janela a janela.
+
+        Os trechos encontrados por detect_speech são concatenados em
+        janelas de até TRANSCRIPTION_SETTINGS['vad_max_window'] segundos
+        de fala, cada janela é transcrita separadamente (com o texto da
+        anterior como contexto) e os tempos dos segmentos são convertidos
+        de volta para o áudio original.
+
+        Args:
+            model (whisper.model.Whisper): Modelo carregado.
+            audio (numpy.ndarray): Amostras a 16 kHz.
+            device (str): Dispositivo do modelo.
+            contexto (str, optional): Texto que antecede o áudio.
+
+        Yields:
+            tuple: (segundos_processados, segmentos) de cada janela.
+        """
+        duracao = len(audio) / SAMPLE_RATE
+        trechos = detect_speech(audio)
+        fala = sum(fim - inicio for inicio, fim in trechos)
+        janelas = group_windows(
+            trechos, TRANSCRIPTION_SETTINGS['vad_max_window']
+        )
+        logger.info(
+            f'VAD: {fala:.1f}s de fala em {duracao:.1f}s de áudio, '
+            f'{len(janelas)} janelas.'
+        )
+
+        if fala >= duracao * 0.9:
+            # Quase sem silêncio: recortar não compensa
+            yield from self._iter_sequential(model, audio, device, contexto)
+            return
+
+        opcoes = self._decode_options(device)
+        anterior = contexto if opcoes['condition_on_previous_text'] else None
+        for janela in janelas:
+            recorte = self._window_audio(audio, janela)
+            resultado = model.transcribe(
+                recorte, verbose=None, initial_prompt=anterior, **opcoes
+            )
+            if opcoes['condition_on_previous_text'] and resultado['text']:
+                anterior = resultado['text']
+
+            yield janela[-1][1], self._to_original(
+                janela, resultado['segments']
+            )
+
+        yield duracao, []
+
+    def _iter_sequential(self, model, audio, device, contexto=None):
+        """
+        Transcreve o áudio em blocos consecutivos, entregando cada um.
+
+        Os blocos têm ~TRANSCRIPTION_SETTINGS['stream_block_seconds'] e são
+        cortados em pausas; o texto de um bloco é o contexto do seguinte
+        quando o preset condiciona no texto anterior.
+
+        Args:
+            model (whisper.model.Whisper): Modelo carregado.
+            audio (numpy.ndarray): Amostras a 16 kHz.
+            device (str): Dispositivo do modelo.
+            contexto (str, optional): Texto que antecede o áudio.
+
+        Yields:
+            tuple: (segundos_processados, segmentos) de cada bloco.
+        """
+        bloco = TRANSCRIPTION_SETTINGS['stream_block_seconds']
+        cortes = (
+            [0] + find_split_points(audio, bloco, bloco / 6) + [len(audio)]
+        )
+        opcoes = self._decode_options(device)
+        anterior = contexto if opcoes['condition_on_previous_text'] else None
+        for inicio, fim in zip(cortes, cortes[1:]):
+            resultado = model.transcribe(
+                audio[inicio:fim],
+                verbose=None,
+                initial_prompt=anterior,
+                **opcoes,
+            )
+            if opcoes['condition_on_previous_text'] and resultado['text']:
+                anterior = resultado['text']
+
+            deslocamento = inicio / SAMPLE_RATE
+            for segmento in resultado['segments']:
+                segmento['start'] += deslocamento
+                segmento['end'] += deslocamento
+            yield fim / SAMPLE_RATE, resultado['segments']
+
+    def _iter_batched(self, model, audio, device):
+        """
+        Transcreve o áudio em lotes de janelas independentes de até 30 s.
+
+        As janelas são cortadas em pausas (e, com VAD, contêm só os trechos
+        com fala); cada lote de TRANSCRIPTION_SETTINGS['batch_size']
+        janelas passa junto pelo codificador e pelo decodificador. Não há
+        contexto entre as janelas.
+
+        Args:
+            model (whisper.model.Whisper): Modelo carregado.
+            audio (numpy.ndarray): Amostras a 16 kHz.
+            device (str): Dispositivo do modelo.
+
+        Yields:
+            tuple: (segundos_processados, segmentos) de cada lote.
+        """
+        duracao = len(audio) / SAMPLE_RATE
+        trechos = detect_speech(audio) if self.use_vad else [(0.0, duracao)]
+        janelas = split_windows(audio, trechos)
+        tamanho = TRANSCRIPTION_SETTINGS['batch_size']
+        logger.info(
+            f'Decodificação em lotes: {len(janelas)} janelas, '
+            f'{tamanho} por lote.'
+        )
+
+        for i in range(0, len(janelas), tamanho):
+            lote = janelas[i : i + tamanho]
+            resultados = decode_batch(
+                model,
+                [self._window_audio(audio, janela) for janela in lote],
+                self.decode_language,
+                TRANSCRIPTION_PRESETS[self.preset],
+                device == 'cuda',
+            )
+
+            segmentos = []
+            for janela, resultado in zip(lote, resultados):
+                segmentos.extend(self._to_original(janela, resultado))
+            yield lote[-1][-1][1], segmentos
+
+        yield duracao, []
+
+    @staticmethod
+    def _window_audio(audio, janela):
+        """Concatena as amostras dos trechos (inicio, fim) de uma janela."""
+        return np.concatenate(
+            [
+                audio[int(inicio * SAMPLE_RATE) : int(fim * SAMPLE_RATE)]
+                for inicio, fim in janela
+            ]
+        )
+
+    @staticmethod
+    def _to_original(janela, segmentos):
+        """Converte os tempos dos segmentos de uma janela para o áudio."""
+        mapa = TimelineMap(janela)
+        for segmento in segmentos:
+            segmento['start'] = mapa.to_original(segmento['start'])
+            segmento['end'] = max(
+                segmento['start'], mapa.to_original(segmento['end'])
+            )
+        return segmentos
+
+    def _iter_local(self, audio, contexto=None):
+        """
+        Transcreve amostras de áudio neste processo, bloco a bloco.
+
+        Args:
+            audio (numpy.ndarray): Amostras a 16 kHz.
+            contexto (str, optional): Texto que antecede o áudio.
+
+        Yields:
+            tuple: (segundos_processados, segmentos) de cada bloco.
+        """
+        model, device = self.load_model()
+        if self.use_batch:
+            yield from self._iter_batched(model, audio, device)
+        elif self.use_vad:
+            yield from self._iter_speech(model, audio, device, contexto)
+        else:
+            yield from self._iter_sequential(model, audio, device, contexto)
+
+    def _iter_stream(self, reader, contexto=None):
+        """
+        Transcreve o áudio de um leitor neste processo, bloco a bloco.
+
+        O áudio é lido em blocos de ~'stream_block_seconds' (com lotes, o
+        suficiente para encher um lote de janelas) cortados em pausas, e
+        cada bloco é descartado depois de transcrito: a memória usada não
+        depende da duração da gravação. Os segmentos são entregues ao fim
+        de cada bloco.
+
+        Args:
+            reader (utils.audio_stream.AudioReader): Fonte das amostras.
+            contexto (str, optional): Texto que antecede o áudio.
+
+        Yields:
+            tuple: (segundos_processados, segmentos) de cada bloco, com
+                   tempos desde o início da leitura.
+        """
+        bloco = self._stream_block_seconds(self.use_batch)
+        for _, inicio, fim, amostras in stream_blocks(
+            reader, bloco, bloco / 6
+        ):
+            deslocamento = inicio / SAMPLE_RATE
+            segmentos = [
+                segmento
+                for _, novos in self._iter_local(amostras, contexto)
+                for segmento in novos
+            ]
+            for segmento in segmentos:
+                segmento['start'] += deslocamento
+                segmento['end'] += deslocamento
+            if segmentos:
+                contexto = ''.join(s['text'] for s in segmentos)
+
+            # Só entre blocos: uma retomada deste ponto lê os mesmos blocos
+            yield fim / SAMPLE_RATE, segmentos
+
+    @staticmethod
+    def _stream_block_seconds(batched):
+        """Duração dos blocos lidos; com lotes, o bastante para um lote."""
+        bloco = TRANSCRIPTION_SETTINGS['stream_block_seconds']
+        if batched:
+            bloco = max(
+                bloco, TRANSCRIPTION_SETTINGS['batch_size'] * WINDOW_SECONDS
+            )
+        return bloco
+
+    def _transcribe_audio(self, audio):
+        """
+        Transcreve amostras de áudio com o modelo carregado.
+
+        Args:
+            audio (numpy.ndarray): Amostras a 16 kHz.
+
+        Returns:
+            dict: 'text' e 'segments', no mesmo formato de model.transcribe.
+        """
+        segmentos = [s for _, novos in self._iter_local(audio) for s in novos]
+        return {
+            'text': ''.join(s['text'] for s in segmentos),
+            'segments': segmentos,
+        }
+
+    def _decode_options(self, device):
+        """
+        Monta as opções de model.transcribe: idioma, precisão e preset.
+
+        Args:
+            device (str): Dispositivo do modelo.
+
+        Returns:
+            dict: Argumentos nomeados para model.transcribe.
+        """
+        return {
+            'language': self.decode_language,
+            'fp16': device == 'cuda',
+            **TRANSCRIPTION_PRESETS[self.preset],
+        }
+
+    def _parallel_workers(self, duracao):
+        """
+        Decide quantos processos usar para um áudio.
+
+        Arquivos a partir de TRANSCRIPTION_SETTINGS['long_file_minutes']
+        são divididos entre processos em CPU, cada um com
+        'worker_threads' threads, dentro do total de 'threads'.
+
+        Args:
+            duracao (float): Duração do áudio em segundos.
+
+        Returns:
+            int: Número de processos (1 para transcrever no processo atual).
+        """
+        if torch.cuda.is_available():
+            return 1
+        if duracao < TRANSCRIPTION_SETTINGS['long_file_minutes'] * 60:
+            return 1
+
+        partes = math.ceil(
+            duracao / (TRANSCRIPTION_SETTINGS['chunk_minutes'] * 60)
+        )
+        return max(
+            1,
+            min(
+                partes,
+                self._thread_budget()
+                // TRANSCRIPTION_SETTINGS['worker_threads'],
+            ),
+        )
+
+    @staticmethod
+    def _thread_budget():
+        """Total de threads permitido: TRANSCRIPTION_SETTINGS['threads']."""
+        return max(1, min(TRANSCRIPTION_SETTINGS['threads'], get_cpu_count()))
+
+    def _iter_parallel(self, reader, workers):
+        """
+        Transcreve um áudio longo dividido entre vários processos.
+
+        O áudio é lido e cortado em pontos de silêncio a cada
+        ~'chunk_minutes'; cada parte inclui 'chunk_overlap' segundos das
+        vizinhas. Cada processo carrega seu próprio modelo (os pesos
+        mapeados são compartilhados entre eles) e usa sua fatia das
+        threads. No máximo duas partes por processo ficam na memória, e as
+        partes são entregues em ordem, assim que todas as anteriores
+        terminam.
+
+        Args:
+            reader (utils.audio_stream.AudioReader): Fonte das amostras.
+            workers (int): Número de processos.
+
+        Yields:
+            tuple: (segundos_processados, segmentos) de cada parte, com
+                   tempos desde o início da leitura.
+        """
+        threads = max(1, self._thread_budget() // workers)
+        logger.info(
+            f'Arquivo longo: partes de ~{TRANSCRIPTION_SETTINGS["chunk_minutes"]}'
+            f' min em {workers} processos com {threads} threads cada.'
+        )
+        opcoes = {
+            'model_name': self.model_name,
+            # Sem idioma detectado, o Whisper detecta em cada janela (None
+            # no Transcriber viraria o idioma padrão das configurações)
+            'language': self.decode_language or 'auto',
+            'use_vad': self.use_vad,
+            'preset': self.preset,
+            'use_cache': False,
+            'use_batch': self.use_batch,
+        }
+        partes = stream_blocks(
+            reader,
+            TRANSCRIPTION_SETTINGS['chunk_minutes'] * 60,
+            TRANSCRIPTION_SETTINGS['chunk_search_seconds'],
+            TRANSCRIPTION_SETTINGS['chunk_overlap'],
+        )
+
+        # Sem o with: se o consumidor parar antes do fim, não esperar as
+        # partes ainda na fila
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_transcription_worker,
+            initargs=(opcoes, threads),
+        )
+        try:
+            fila = deque()
+            ultimo = None
+            terminou = False
+            while fila or not terminou:
+                # Manter todos os processos ocupados, com memória limitada
+                while not terminou and len(fila) < 2 * workers:
+                    parte = next(partes, None)
+                    if parte is None:
+                        terminou = True
+                        break
+                    origem, inicio, fim, amostras = parte
+                    fila.append(
+                        (
+                            (
+                                origem,
+                                inicio,
+                                fim,
+                                origem + len(amostras) == fim,
+                            ),
+                            executor.submit(_transcribe_chunk, amostras),
+                        )
+                    )
+                if not fila:
+                    break
+
+                parte, future = fila.popleft()
+                segmentos = self._stitch_chunk(parte, future.result(), ultimo)
+                if segmentos:
+                    ultimo = segmentos[-1]
+                yield parte[2] / SAMPLE_RATE, segmentos
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _stitch_chunk(parte, resultado, anterior):
+        """
+        Ajusta os segmentos de uma parte para a transcrição completa.
+
+        Os tempos são deslocados para o áudio completo. Nas sobreposições,
+        cada segmento fica com a parte que contém o seu meio, e o primeiro
+        segmento da parte é descartado se repetir o texto do último
+        segmento da parte anterior.
+
+        Args:
+            parte (tuple): (origem, corte_inicial, corte_final, ultima),
+                           com as posições em amostras.
+            resultado (dict): Resultado da parte.
+            anterior (dict or None): Último segmento aceito até aqui.
+
+        Returns:
+            list: Segmentos aceitos, em ordem.
+        """
+        origem, corte_inicial, corte_final, ultima = parte
+        deslocamento = origem / SAMPLE_RATE
+        limite_inicial = corte_inicial / SAMPLE_RATE
+        limite_final = math.inf if ultima else corte_final / SAMPLE_RATE
+
+        aceitos = []
+        for segmento in resultado['segments']:
+            segmento['start'] += deslocamento
+            segmento['end'] += deslocamento
+            meio = (segmento['start'] + segmento['end']) / 2
+            if not limite_inicial <= meio < limite_final:
+                continue
+
+            # Frase repetida dos dois lados de um corte
+            if (
+                not aceitos
+                and anterior is not None
+                and segmento['text'].strip().lower()
+                == anterior['text'].strip().lower()
+            ):
+                continue
+            aceitos.append(segmento)
+        return aceitos
+
+    def _iter_blocks(self, reader, inicio=0.0, contexto=None):
+        """
+        Transcreve o áudio, entregando os segmentos à medida que saem.
+
+        Args:
+            reader (utils.audio_stream.AudioReader): Fonte das amostras,
+                já posicionada em inicio.
+            inicio (float, optional): Segundos já transcritos (ao retomar).
+            contexto (str, optional): Texto que antecede inicio, usado como
+                                      contexto do primeiro bloco.
+
+        Yields:
+            tuple: (segundos_processados, segmentos) em ordem, com tempos
+                   do áudio completo.
+        """
+        workers = self._parallel_workers((reader.duration or 0.0) - inicio)
+        if workers == 1:
+            threads = _torch_threads(self._thread_budget())
+            blocos = self._iter_stream(reader, contexto)
+        else:
+            threads = nullcontext()
+            blocos = self._iter_parallel(reader, workers)
+
+        with threads:
+            for processados, segmentos in blocos:
+                for segmento in segmentos:
+                    segmento['start'] += inicio
+                    segmento['end'] += inicio
+                yield inicio + processados, segmentos
+
+    def _cache_settings(self):
+        """Opções que afetam a transcrição, para a chave do cache."""
+        vad = False
+        if self.use_vad:
+            vad = {
+                k: v
+                for k, v in TRANSCRIPTION_SETTINGS.items()
+                if k.startswith('vad_')
+            }
+        return {
+            'model': self.model_name,
+            'language': self.decode_language,
+            'decoding': TRANSCRIPTION_PRESETS[self.preset],
+            'vad': vad,
+            'batched': self.use_batch,
+        }
+
+    def _open_audio(self, input_path, start=0.0):
+        """
+        Abre o áudio de um arquivo de áudio ou vídeo para leitura a 16 kHz.
+
+        O áudio é decodificado pelo ffmpeg direto do arquivo original, sem
+        WAV temporário, à medida que é lido.
+
+        Args:
+            input_path (str): Caminho do arquivo de entrada (áudio ou vídeo).
+            start (float, optional): Segundo a partir do qual ler.
+
+        Returns:
+            AudioReader: Leitor das amostras.
+
+        Raises:
+            ValueError: Se o formato do arquivo não for suportado.
+        """
+        # Verificar se é áudio ou vídeo
+        if is_supported_file(input_path, 'video'):
+            logger.info('Arquivo de entrada é um vídeo, lendo seu áudio...')
+        elif is_supported_file(input_path, 'audio'):
+            logger.info('Arquivo de entrada é um áudio.')
+        else:
+            raise ValueError(f'Formato de arquivo não suportado: {input_path}')
+        return AudioReader(input_path, start)
+
+    def _transcribe_file(self, input_path, on_block, key=None, resume=True):
+        """
+        Lê o áudio do arquivo em blocos e executa o modelo.
+
+        Com TRANSCRIPTION_SETTINGS['checkpoint'], o progresso é gravado a
+        cada 'checkpoint_interval' segundos (no fim de um bloco); se houver
+        um ponto de retomada da mesma chave e resume for verdadeiro, os
+        segmentos gravados são reaproveitados e a transcrição continua de
+        onde parou.
+
+        Args:
+            input_path (str): Caminho do arquivo de entrada (áudio ou vídeo).
+            on_block (callable): Chamado como on_block(processados, total,
+                segmentos) a cada bloco concluído, com tempos em segundos.
+            key (str, optional): Chave da transcrição, para os pontos de
+                                 retomada.
+            resume (bool, optional): Continuar de um ponto de retomada.
+
+        Returns:
+            dict: 'text', 'segments' e 'duration' da transcrição.
+        """
+        checkpoints = key is not None and TRANSCRIPTION_SETTINGS['checkpoint']
+        estado = None
+        if checkpoints and resume:
+            estado = load_checkpoint(key)
+
+        segmentos = []
+        retomado = 0.0
+        contexto = None
+        if estado is not None:
+            segmentos = estado['segments']
+            retomado = estado['processed']
+            contexto = estado['prompt']
+
+        inicio = time.time()
+        with self._open_audio(input_path, retomado) as reader:
+            # Duração desconhecida: o progresso só tem o total no fim
+            duracao_audio = reader.duration or 0.0
+            if estado is not None:
+                logger.info(
+                    f'Retomando a transcrição em {retomado:.1f}s '
+                    f'({len(segmentos)} segmentos já concluídos).'
+                )
+                on_block(retomado, duracao_audio, segmentos)
+
+            # Realizar a transcrição
+            logger.info('Iniciando transcrição...')
+            ultimo_ponto = time.time()
+            processados = retomado
+            with tqdm(
+                total=round(duracao_audio) or None,
+                initial=round(retomado),
+                unit='s',
+                desc='Transcrevendo',
+            ) as barra:
+                for processados, novos in self._iter_blocks(
+                    reader, retomado, contexto
+                ):
+                    for segmento in novos:
+                        segmento['id'] = len(segmentos)
+                        segmentos.append(segmento)
+                    if novos:
+                        contexto = ''.join(s['text'] for s in novos)
+                    on_block(processados, duracao_audio, novos)
+                    barra.update(round(processados) - barra.n)
+
+                    if (
+                        checkpoints
+                        and time.time() - ultimo_ponto
+                        >= TRANSCRIPTION_SETTINGS['checkpoint_interval']
+                    ):
+                        save_checkpoint(
+                            key,
+                            segmentos,
+                            processados,
+                            contexto,
+                            duracao_audio,
+                        )
+                        ultimo_ponto = time.time()
+
+        if checkpoints:
+            remove_checkpoint(key)
+
+        duracao_audio = max(duracao_audio, processados)
+        duracao = time.time() - inicio
+        transcrito = duracao_audio - retomado
+        logger.info(f'Transcrição concluída em {duracao:.2f} segundos.')
+        logger.info(
+            f'Fator de tempo real: {duracao / max(transcrito, 1e-6):.3f} '
+            f'({transcrito:.1f}s de áudio, preset {self.preset}, '
+            f'{self._thread_budget()} threads)'
+        )
+        return {
+            'text': ''.join(s['text'] for s in segmentos),
+            'segments': segmentos,
+            'duration': duracao_audio,
+        }
+
+    def resolve_language(self, input_path, detect=True):
+        """
+        Decide o idioma de um arquivo antes da transcrição.
+
+        Com o idioma 'auto', o idioma é detectado uma única vez, em poucas
+        janelas com fala (veja core.language_detection.detect_language), e
+        guardado em cache pelo conteúdo do arquivo; a transcrição inteira
+        usa esse idioma, em vez de o Whisper detectá-lo de novo.
+
+        Args:
+            input_path (str): Caminho do arquivo de entrada (áudio ou vídeo).
+            detect (bool, optional): Executar o modelo se o idioma ainda
+                                     não estiver no cache.
+
+        Returns:
+            str or None: Código do idioma (None se não foi possível
+                         detectá-lo: o Whisper detecta em cada janela).
+        """
+        if self.language != 'auto':
+            return self.language
+
+        chave = language_key(input_path, self.model_name)
+        salvo = load_language(chave)
+        if salvo is not None:
+            logger.info(f"Idioma detectado (cache): {salvo['language']}")
+            return salvo['language']
+        if not detect:
+            return None
+
+        inicio = time.time()
+        model, _ = self.load_model()
+        with _torch_threads(self._thread_budget()):
+            idioma, probabilidade = detect_language(model, input_path)
+        if idioma is None:
+            logger.warning('Não foi possível detectar o idioma.')
+            return None
+
+        save_language(chave, idioma, probabilidade)
+        logger.info(
+            f'Idioma detectado: {idioma} ({probabilidade:.0%}) em '
+            f'{time.time() - inicio:.2f} segundos.'
+        )
+        return idioma
+
+    def find_checkpoint(self, input_path):
+        """
+        Procura uma transcrição interrompida deste arquivo com as opções
+        atuais.
+
+        Args:
+            input_path (str): Caminho do arquivo de entrada (áudio ou vídeo).
+
+        Returns:
+            dict or None: Ponto de retomada ('processed' e 'duration' em
+                          segundos, 'segments' e 'prompt'), ou None.
+        """
+        if not TRANSCRIPTION_SETTINGS['checkpoint']:
+            return None
+        prune_checkpoints()
+        # Sem o idioma no cache, a transcrição nem chegou a começar
+        self.decode_language = self.resolve_language(input_path, detect=False)
+        if self.decode_language is None:
+            return None
+        return load_checkpoint(
+            TranscriptCache.make_key(input_path, self._cache_settings())
+        )
+
+    def transcribe(
+        self, input_path, output_path=None, progress_callback=None, resume=True
+    ):
         """
         Transcreve um arquivo de áudio ou vídeo para texto.
 
+        Os segmentos são acrescentados ao TXT e ao SRT assim que cada bloco
+        é transcrito, então uma interrupção preserva o que já foi feito; com
+        resume, uma transcrição interrompida do mesmo arquivo e opções
+        continua do último ponto de retomada (veja find_checkpoint).
+
         Args:
             input_path (str): Caminho do arquivo de entrada (áudio ou vídeo).
             output_path (str, optional): Caminho para salvar o texto transcrito.
+            progress_callback (callable, optional): Chamado como
+                progress_callback(processados, total, segmentos) a cada
+                bloco concluído: segundos de áudio já transcritos, duração
+                total e os novos segmentos.
+            resume (bool, optional): Continuar uma transcrição interrompida;
+                se False, o ponto de retomada existente é descartado.
 
         Returns:
             tuple: (output_path, srt_path, text) - Caminho do arquivo de texto, arquivo SRT e o texto transcrito.
@@ -166,6 +1058,7 @@ class Transcriber:
             output_path = get_output_path(
                 input_path, f'_transcricao_{timestamp}', '.txt'
             )
+        srt_path = os.path.splitext(output_path)[0] + '.srt'
 
         log_process_start(
             logger,
@@ -177,57 +1070,53 @@ class Transcriber:
         )
 
         try:
-            audio_path = None
-            is_temp = False
+            inicio = time.time()
+            self.decode_language = self.resolve_language(input_path)
+            chave = TranscriptCache.make_key(
+                input_path, self._cache_settings()
+            )
+            resultado = None
+            if self.cache is not None:
+                resultado = self.cache.load(chave)
 
-            # Verificar se é áudio ou vídeo
-            if is_supported_file(input_path, 'video'):
-                logger.info(
-                    'Arquivo de entrada é um vídeo, extraindo áudio...'
-                )
-                audio_path = create_temp_file(suffix='.wav')
-                self.extract_audio(input_path, audio_path)
-                is_temp = True
-            elif is_supported_file(input_path, 'audio'):
-                logger.info('Arquivo de entrada é um áudio.')
-                audio_path = input_path
-            else:
-                raise ValueError(
-                    f'Formato de arquivo não suportado: {input_path}'
-                )
+            with open(output_path, 'w', encoding='utf-8') as txt, open(
+                srt_path, 'w', encoding='utf-8'
+            ) as srt:
+                escritos = 0
 
-            # Carregar o modelo se ainda não foi carregado
-            model, device = self.load_model()
+                def on_block(processados, total, segmentos):
+                    nonlocal escritos
+                    for segmento in segmentos:
+                        escritos += 1
+                        txt.write(segmento['text'])
+                        srt.write(self.srt_entry(escritos, segmento))
+                    txt.flush()
+                    srt.flush()
+                    if progress_callback:
+                        progress_callback(processados, total, segmentos)
 
-            # Realizar a transcrição
-            logger.info('Iniciando transcrição...')
-            inicio = time.time()
-            resultado = model.transcribe(
-                audio_path,
-                language=self.language,
-                fp16=(device == 'cuda'),
-                verbose=False,
-            )
+                if resultado is not None:
+                    logger.info(
+                        'Transcrição encontrada no cache; o modelo não será executado.'
+                    )
+                    segmentos = resultado['segments']
+                    total = resultado.get('duration') or (
+                        segmentos[-1]['end'] if segmentos else 0.0
+                    )
+                    on_block(total, total, segmentos)
+                else:
+                    resultado = self._transcribe_file(
+                        input_path, on_block, chave, resume
+                    )
+                    if self.cache is not None:
+                        self.cache.save(chave, resultado)
             duracao = time.time() - inicio
-            logger.info(f'Transcrição concluída em {duracao:.2f} segundos.')
 
             texto = resultado.get('text')
             if not texto:
                 logger.warning('A transcrição não produziu texto.')
-
-            # Salvar o texto transcrito
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(texto)
             logger.info(f'Transcrição salva em: {output_path}')
-
-            # Criar arquivo de legendas SRT
-            segmentos = resultado.get('segments', [])
-            srt_path = self.create_srt(segmentos, output_path)
-
-            # Limpar arquivo temporário se necessário
-            if is_temp and audio_path and os.path.exists(audio_path):
-                logger.info(f'Removendo arquivo temporário: {audio_path}')
-                os.remove(audio_path)
+            logger.info(f'Arquivo de legendas SRT criado em: {srt_path}')
 
             log_process_end(logger, 'transcribe', duracao)
             return output_path, srt_path, texto
@@ -237,3 +1126,171 @@ class Transcriber:
                 f'Erro durante a transcrição: {str(e)}', exc_info=True
             )
             raise
+
+    def _iter_windows(self, input_path, resultado):
+        """
+        Lê um arquivo em blocos e entrega suas janelas de até 30 s.
+
+        Args:
+            input_path (str): Caminho do arquivo de entrada (áudio ou vídeo).
+            resultado (dict): Resultado do arquivo; 'duration' é atualizada
+                a cada bloco lido.
+
+        Yields:
+            tuple: (deslocamento, janela, amostras) - início do bloco em
+                   segundos, trechos (inicio, fim) da janela dentro do bloco
+                   e o áudio da janela.
+        """
+        bloco = self._stream_block_seconds(True)
+        with self._open_audio(input_path) as reader:
+            for _, inicio, fim, amostras in stream_blocks(
+                reader, bloco, bloco / 6
+            ):
+                duracao = len(amostras) / SAMPLE_RATE
+                trechos = (
+                    detect_speech(amostras)
+                    if self.use_vad
+                    else [(0.0, duracao)]
+                )
+                for janela in split_windows(amostras, trechos):
+                    yield (
+                        inicio / SAMPLE_RATE,
+                        janela,
+                        self._window_audio(amostras, janela),
+                    )
+                resultado['duration'] = fim / SAMPLE_RATE
+
+    def _decode_windows(self, model, device, idioma, lote, resultados):
+        """
+        Decodifica um lote de janelas e acrescenta os segmentos aos arquivos.
+
+        Args:
+            model (whisper.model.Whisper): Modelo carregado.
+            device (str): Dispositivo do modelo.
+            idioma (str or None): Idioma das janelas do lote.
+            lote (list): Tuplas (arquivo, deslocamento, janela, amostras).
+            resultados (list): Resultado de cada arquivo, por índice.
+        """
+        decodificados = decode_batch(
+            model,
+            [amostras for *_, amostras in lote],
+            idioma,
+            TRANSCRIPTION_PRESETS[self.preset],
+            device == 'cuda',
+        )
+        for (i, deslocamento, janela, _), segmentos in zip(
+            lote, decodificados
+        ):
+            for segmento in self._to_original(janela, segmentos):
+                segmento['start'] += deslocamento
+                segmento['end'] += deslocamento
+                resultados[i]['segments'].append(segmento)
+
+    def transcribe_files(self, input_paths):
+        """
+        Transcreve vários arquivos decodificando janelas de todos juntas.
+
+        As janelas de 30 s de todos os arquivos (com VAD, só as com fala)
+        formam uma única fila, decodificada em lotes de
+        TRANSCRIPTION_SETTINGS['batch_size'] como em use_batch; isso enche
+        os lotes mesmo quando cada arquivo é curto. Com o idioma 'auto',
+        cada lote só tem janelas de arquivos do mesmo idioma. Cada arquivo
+        é lido em blocos, como em _iter_stream, à medida que os lotes
+        consomem suas janelas: só os blocos atuais e um lote por idioma
+        ficam na memória. Arquivos já no cache não são decodificados.
+
+        Args:
+            input_paths (list): Arquivos de áudio ou vídeo.
+
+        Returns:
+            list: (output_path, srt_path, text) de cada arquivo, na ordem.
+        """
+        log_process_start(
+            logger,
+            'transcribe_files',
+            files=len(input_paths),
+            model=self.model_name,
+            language=self.language,
+        )
+
+        try:
+            inicio = time.time()
+            idiomas = [self.resolve_language(c) for c in input_paths]
+            configuracao = {**self._cache_settings(), 'batched': True}
+            chaves = [
+                TranscriptCache.make_key(
+                    caminho, {**configuracao, 'language': idioma}
+                )
+                for caminho, idioma in zip(input_paths, idiomas)
+            ]
+            resultados = [None] * len(input_paths)
+            if self.cache is not None:
+                resultados = [self.cache.load(chave) for chave in chaves]
+
+            pendentes = [i for i, r in enumerate(resultados) if r is None]
+            for i in pendentes:
+                resultados[i] = {'text': '', 'segments': [], 'duration': 0.0}
+
+            if pendentes:
+                model, device = self.load_model()
+                tamanho = TRANSCRIPTION_SETTINGS['batch_size']
+                logger.info(
+                    f'Decodificação em lotes: {len(pendentes)} arquivos, '
+                    f'{tamanho} janelas por lote.'
+                )
+
+                # Uma fila por idioma (decode_batch fixa um por lote), com
+                # no máximo um lote de janelas de um ou mais arquivos
+                filas = {}
+                with _torch_threads(self._thread_budget()), tqdm(
+                    unit='lote', desc='Transcrevendo'
+                ) as barra:
+                    for i in pendentes:
+                        fila = filas.setdefault(idiomas[i], [])
+                        for janela in self._iter_windows(
+                            input_paths[i], resultados[i]
+                        ):
+                            fila.append((i, *janela))
+                            if len(fila) == tamanho:
+                                self._decode_windows(
+                                    model, device, idiomas[i], fila, resultados
+                                )
+                                fila.clear()
+                                barra.update(1)
+
+                    for idioma, fila in filas.items():
+                        if fila:
+                            self._decode_windows(
+                                model, device, idioma, fila, resultados
+                            )
+                            barra.update(1)
+
+            timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+            saidas = []
+            for i, caminho in enumerate(input_paths):
+                resultado = resultados[i]
+                if i in pendentes:
+                    for n, segmento in enumerate(resultado['segments']):
+                        segmento['id'] = n
+                    resultado['text'] = ''.join(
+                        s['text'] for s in resultado['segments']
+                    )
+                    if self.cache is not None:
+                        self.cache.save(chaves[i], resultado)
+
+                output_path = get_output_path(
+                    caminho, f'_transcricao_{timestamp}', '.txt'
+                )
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    f.write(resultado['text'])
+                srt_path = self.create_srt(resultado['segments'], output_path)
+                saidas.append((output_path, srt_path, resultado['text']))
+
+            log_process_end(logger, 'transcribe_files', time.time() - inicio)
+            return saidas
+
+        except Exception as e:
+            logger.error(
+                f'Erro durante a transcrição: {str(e)}', exc_info=True
+            )
+            raise
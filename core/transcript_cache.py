@@ -0,0 +1,154 @@
+"""
+Cache de transcrições endereçado pelo conteúdo dos arquivos de mídia.
+"""
+
+import os
+import json
+import hashlib
+
+from config.settings import TRANSCRIPTION_SETTINGS, CACHE_DIR
+from utils.disk_cache import DiskCache
+from utils.file_utils import atomic_output, ensure_dir_exists
+from utils.logging_utils import setup_logger
+
+logger = setup_logger('transcript_cache')
+
+# Diretório padrão do cache de transcrições
+TRANSCRIPT_CACHE_DIR = os.path.join(CACHE_DIR, 'transcripts')
+
+# Arquivos até este tamanho são lidos inteiros para o hash
+FULL_HASH_MAX_BYTES = 64 * 1024 * 1024
+
+# Blocos lidos de arquivos maiores (espalhados pelo arquivo)
+SAMPLE_BLOCKS = 64
+SAMPLE_BLOCK_BYTES = 256 * 1024
+
+# Versão do formato das entradas (muda a chave de todas)
+CACHE_VERSION = 1
+
+
+def media_hash(path):
+    """
+    Calcula um hash rápido do conteúdo de um arquivo de mídia.
+
+    Arquivos pequenos são lidos inteiros; nos maiores, o hash combina o
+    tamanho com SAMPLE_BLOCKS blocos espalhados (incluindo o início e o
+    fim), o que evita ler gigabytes de vídeo a cada transcrição. Não
+    depende do nome nem da data do arquivo, então cópias do mesmo arquivo
+    têm o mesmo hash.
+
+    Args:
+        path (str): Caminho do arquivo.
+
+    Returns:
+        str: Hash hexadecimal.
+    """
+    tamanho = os.path.getsize(path)
+    h = hashlib.blake2b(digest_size=20)
+    h.update(str(tamanho).encode())
+
+    with open(path, 'rb') as f:
+        if tamanho <= FULL_HASH_MAX_BYTES:
+            for bloco in iter(lambda: f.read(1024 * 1024), b''):
+                h.update(bloco)
+        else:
+            passo = (tamanho - SAMPLE_BLOCK_BYTES) / (SAMPLE_BLOCKS - 1)
+            for i in range(SAMPLE_BLOCKS):
+                f.seek(int(i * passo))
+                h.update(f.read(SAMPLE_BLOCK_BYTES))
+    return h.hexdigest()
+
+
+class TranscriptCache(DiskCache):
+    """
+    Cache em disco de transcrições (texto e segmentos), com limite de
+    tamanho e LRU.
+
+    A chave combina o hash do arquivo de mídia com o modelo, o idioma e as
+    opções de decodificação; a entrada guarda os segmentos completos, de
+    onde o TXT e o SRT são gerados de novo sem executar o modelo.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        """
+        Inicializa o cache.
+
+        Args:
+            cache_dir (str, optional): Diretório do cache.
+            max_bytes (int, optional): Tamanho máximo em bytes.
+        """
+        super().__init__(
+            cache_dir or TRANSCRIPT_CACHE_DIR,
+            (
+                max_bytes
+                if max_bytes is not None
+                else TRANSCRIPTION_SETTINGS['cache_mb'] * 1024 * 1024
+            ),
+        )
+
+    @staticmethod
+    def make_key(input_path, settings):
+        """
+        Calcula a chave de um arquivo de mídia.
+
+        Args:
+            input_path (str): Arquivo de áudio ou vídeo.
+            settings (dict): Opções que afetam o resultado.
+
+        Returns:
+            str: Chave hexadecimal.
+        """
+        h = hashlib.blake2b(digest_size=20)
+        h.update(media_hash(input_path).encode())
+        h.update(
+            json.dumps(
+                {'versao': CACHE_VERSION, **settings}, sort_keys=True
+            ).encode()
+        )
+        return h.hexdigest()
+
+    def load(self, key):
+        """
+        Lê uma transcrição do cache e marca seu uso.
+
+        Args:
+            key (str): Chave calculada por make_key.
+
+        Returns:
+            dict or None: 'text', 'segments' e 'duration', ou None se não
+                          existir.
+        """
+        caminho = self.lookup(key, '.json')
+        if caminho is None:
+            return None
+
+        try:
+            with open(caminho, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f'Entrada inválida no cache ({caminho}): {e}')
+            return None
+
+    def save(self, key, resultado):
+        """
+        Grava uma transcrição no cache e aplica o limite de tamanho.
+
+        Args:
+            key (str): Chave calculada por make_key.
+            resultado (dict): 'text', 'segments' e 'duration' da transcrição.
+        """
+        caminho = self._entry_path(key, '.json')
+        ensure_dir_exists(os.path.dirname(caminho))
+        with atomic_output(caminho) as temp_path:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(
+                    {
+                        'text': resultado.get('text', ''),
+                        'segments': resultado.get('segments', []),
+                        'duration': resultado.get('duration'),
+                    },
+                    f,
+                    ensure_ascii=False,
+                    default=float,
+                )
+        self._track(caminho)
@@ -0,0 +1,125 @@
+"""
+Pontos de retomada de transcrições longas interrompidas.
+"""
+
+import os
+import json
+import time
+
+from config.settings import TRANSCRIPTION_SETTINGS, CACHE_DIR
+from utils.file_utils import atomic_output, ensure_dir_exists
+from utils.logging_utils import setup_logger
+
+logger = setup_logger('transcript_checkpoint')
+
+# Diretório dos pontos de retomada
+CHECKPOINT_DIR = os.path.join(CACHE_DIR, 'transcript_checkpoints')
+
+# Versão do formato dos pontos de retomada
+CHECKPOINT_VERSION = 1
+
+
+def checkpoint_path(key):
+    """
+    Caminho do ponto de retomada de uma transcrição.
+
+    Args:
+        key (str): Chave da transcrição (TranscriptCache.make_key).
+
+    Returns:
+        str: Caminho do arquivo JSON.
+    """
+    return os.path.join(CHECKPOINT_DIR, f'{key}.json')
+
+
+def load_checkpoint(key):
+    """
+    Lê o ponto de retomada de uma transcrição, se existir.
+
+    Args:
+        key (str): Chave da transcrição.
+
+    Returns:
+        dict or None: 'segments' (segmentos já concluídos), 'processed'
+                      (segundos de áudio já transcritos), 'prompt' (texto
+                      usado como contexto do próximo bloco) e 'duration'
+                      (duração do áudio); None se não houver ponto válido.
+    """
+    caminho = checkpoint_path(key)
+    if not os.path.exists(caminho):
+        return None
+
+    try:
+        with open(caminho, encoding='utf-8') as f:
+            estado = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f'Ponto de retomada inválido ({caminho}): {e}')
+        return None
+
+    if estado.get('version') != CHECKPOINT_VERSION:
+        return None
+    return estado
+
+
+def save_checkpoint(key, segments, processed, prompt, duration):
+    """
+    Grava o ponto de retomada de uma transcrição.
+
+    A gravação é atômica: uma interrupção durante a escrita mantém o ponto
+    anterior.
+
+    Args:
+        key (str): Chave da transcrição.
+        segments (list): Segmentos concluídos, com tempos do áudio completo.
+        processed (float): Segundos de áudio já transcritos.
+        prompt (str or None): Contexto para o próximo bloco.
+        duration (float): Duração do áudio, em segundos.
+    """
+    ensure_dir_exists(CHECKPOINT_DIR)
+    with atomic_output(checkpoint_path(key)) as temp_path:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(
+                {
+                    'version': CHECKPOINT_VERSION,
+                    'segments': segments,
+                    'processed': processed,
+                    'prompt': prompt,
+                    'duration': duration,
+                },
+                f,
+                ensure_ascii=False,
+                default=float,
+            )
+    logger.debug(f'Ponto de retomada gravado em {processed:.1f}s.')
+
+
+def remove_checkpoint(key):
+    """
+    Remove o ponto de retomada de uma transcrição.
+
+    Args:
+        key (str): Chave da transcrição.
+    """
+    try:
+        os.remove(checkpoint_path(key))
+    except FileNotFoundError:
+        pass
+
+
+def prune_checkpoints():
+    """
+    Remove pontos de retomada mais antigos que
+    TRANSCRIPTION_SETTINGS['checkpoint_max_days'].
+    """
+    if not os.path.isdir(CHECKPOINT_DIR):
+        return
+
+    limite = (
+        time.time() - TRANSCRIPTION_SETTINGS['checkpoint_max_days'] * 86400
+    )
+    for entrada in os.scandir(CHECKPOINT_DIR):
+        try:
+            if entrada.stat().st_mtime < limite:
+                os.remove(entrada.path)
+        except OSError:
+            continue
@@ -0,0 +1,122 @@
+"""
+Cache de resultados de upscaling endereçado pelo conteúdo das imagens.
+"""
+
+import os
+import sys
+import json
+import shutil
+import hashlib
+
+import numpy as np
+
+from config.settings import UPSCALE_SETTINGS, CACHE_DIR
+from utils.disk_cache import DiskCache
+from utils.file_utils import atomic_output, ensure_dir_exists
+
+# Diretório padrão do cache de resultados
+RESULT_CACHE_DIR = os.path.join(CACHE_DIR, 'upscale_results')
+
+# ioctl FICLONE do Linux (cópia por referência em btrfs, XFS...)
+FICLONE = 0x40049409
+
+
+def _clone_or_copy(origem, destino):
+    """
+    Copia origem para destino, compartilhando os blocos quando possível.
+
+    Com reflink a cópia não ocupa espaço novo; sem ele é uma cópia comum.
+    Ao contrário de um hard link, editar uma saída não altera o cache.
+    """
+    if sys.platform.startswith('linux'):
+        import fcntl
+
+        try:
+            with open(origem, 'rb') as src, open(destino, 'wb') as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return
+        except OSError:
+            pass
+    shutil.copyfile(origem, destino)
+
+
+class ResultCache(DiskCache):
+    """
+    Cache em disco de imagens processadas, com limite de tamanho e LRU.
+
+    A chave combina um hash dos pixels decodificados com as opções que
+    afetam o resultado (modelo, escala, backend, formato de saída), então
+    imagens idênticas em arquivos diferentes compartilham a mesma entrada.
+    O armazenamento e o descarte ficam em utils.disk_cache.DiskCache.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        """
+        Inicializa o cache.
+
+        Args:
+            cache_dir (str, optional): Diretório do cache.
+            max_bytes (int, optional): Tamanho máximo em bytes.
+        """
+        super().__init__(
+            cache_dir or RESULT_CACHE_DIR,
+            (
+                max_bytes
+                if max_bytes is not None
+                else UPSCALE_SETTINGS['result_cache_mb'] * 1024 * 1024
+            ),
+        )
+
+    @staticmethod
+    def make_key(imagem_array, settings, ext):
+        """
+        Calcula a chave de uma imagem decodificada.
+
+        Args:
+            imagem_array (numpy.ndarray): Pixels da imagem de entrada.
+            settings (dict): Opções que afetam o resultado.
+            ext (str): Extensão do arquivo de saída.
+
+        Returns:
+            str: Chave hexadecimal.
+        """
+        h = hashlib.blake2b(digest_size=20)
+        h.update(repr(imagem_array.shape).encode())
+        h.update(np.ascontiguousarray(imagem_array))
+        h.update(json.dumps(settings, sort_keys=True).encode())
+        h.update(ext.lower().encode())
+        return h.hexdigest()
+
+    @staticmethod
+    def materialize(origem, output_path):
+        """
+        Grava uma cópia de um resultado já conhecido em output_path.
+
+        Args:
+            origem (str): Entrada do cache ou saída idêntica já gravada.
+            output_path (str): Caminho de saída.
+
+        Returns:
+            str: Caminho de saída.
+        """
+        with atomic_output(output_path) as temp_path:
+            _clone_or_copy(origem, temp_path)
+        return output_path
+
+    def store(self, key, output_path):
+        """
+        Adiciona um resultado ao cache e aplica o limite de tamanho.
+
+        Args:
+            key (str): Chave calculada por make_key.
+            output_path (str): Imagem gerada.
+        """
+        ext = os.path.splitext(output_path)[1]
+        caminho = self._entry_path(key, ext)
+        if os.path.exists(caminho):
+            return
+
+        ensure_dir_exists(os.path.dirname(caminho))
+        with atomic_output(caminho) as temp_path:
+            _clone_or_copy(output_path, temp_path)
+        self._track(caminho)
@@ -0,0 +1,88 @@
+"""
+Manifesto de progresso para upscaling incremental de diretórios.
+"""
+
+import os
+import json
+
+from utils.file_utils import atomic_output
+from utils.logging_utils import setup_logger
+
+logger = setup_logger('upscale_manifest')
+
+MANIFEST_FILENAME = 'upscale_manifest.json'
+
+
+class UpscaleManifest:
+    """
+    Registro das imagens já processadas em um diretório de saída.
+
+    Cada entrada guarda o tamanho e a data de modificação da imagem de
+    entrada, o modelo, a escala e o caminho de saída, permitindo que uma
+    nova execução pule o que já foi feito e refaça o que mudou.
+    """
+
+    def __init__(self, output_dir):
+        """
+        Carrega o manifesto de um diretório de saída, se existir.
+
+        Args:
+            output_dir (str): Diretório de saída do processamento.
+        """
+        self.path = os.path.join(output_dir, MANIFEST_FILENAME)
+        self.entries = {}
+
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f'Manifesto ignorado ({self.path}): {e}')
+
+    @staticmethod
+    def _signature(input_path):
+        """Tamanho e data de modificação de um arquivo de entrada."""
+        stat = os.stat(input_path)
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    def is_done(self, input_path, settings):
+        """
+        Verifica se uma entrada já foi processada com as mesmas opções.
+
+        Args:
+            input_path (str): Caminho da imagem de entrada.
+            settings (dict): Opções que afetam o resultado (modelo, escala).
+
+        Returns:
+            bool: True se a entrada não mudou e a saída ainda existe.
+        """
+        entry = self.entries.get(os.path.basename(input_path))
+        if entry is None:
+            return False
+
+        return (
+            entry.get('input') == self._signature(input_path)
+            and entry.get('settings') == settings
+            and os.path.exists(entry.get('output', ''))
+        )
+
+    def record(self, input_path, output_path, settings):
+        """
+        Registra uma imagem processada.
+
+        Args:
+            input_path (str): Caminho da imagem de entrada.
+            output_path (str): Caminho da imagem gerada.
+            settings (dict): Opções usadas no processamento.
+        """
+        self.entries[os.path.basename(input_path)] = {
+            'input': self._signature(input_path),
+            'settings': settings,
+            'output': output_path,
+        }
+
+    def save(self):
+        """Grava o manifesto de forma atômica."""
+        with atomic_output(self.path) as temp_path:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=1)
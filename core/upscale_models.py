@@ -0,0 +1,266 @@
+"""
+Catálogo de modelos de upscaling: detecção de arquitetura e escolha do modelo.
+"""
+
+import os
+
+import torch
+from basicsr.archs.rrdbnet_arch import RRDBNet
+from realesrgan.archs.srvgg_arch import SRVGGNetCompact
+
+from core.weights_cache import contiguous_tensors, load_weights
+from utils.logging_utils import setup_logger
+
+logger = setup_logger('upscale_models')
+
+# Diretório padrão dos pesos
+MODELS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models'
+)
+
+# Memória de ativação aproximada em fp32, em bytes por pixel de entrada,
+# medida em CPU para cada arquitetura e escala nativa
+ACTIVATION_BYTES_PER_PIXEL = {
+    ('rrdbnet', 4): 15000,
+    ('rrdbnet', 2): 3900,
+    ('srvgg', 4): 1500,
+}
+
+# Valor usado para combinações não medidas (o mais conservador)
+DEFAULT_BYTES_PER_PIXEL = max(ACTIVATION_BYTES_PER_PIXEL.values())
+
+# Cache das descrições, por (caminho, tamanho, mtime)
+_descricoes = {}
+
+
+def load_state_dict(model_path, device='cpu'):
+    """
+    Lê os pesos de um arquivo de modelo Real-ESRGAN.
+
+    Na primeira leitura, os pesos usados (params_ema ou params) são
+    gravados no cache de pesos; as leituras seguintes mapeiam esse arquivo
+    em memória em vez de desserializar o checkpoint inteiro.
+
+    Args:
+        model_path (str): Caminho do arquivo .pth.
+        device (str or torch.device, optional): Dispositivo de destino.
+
+    Returns:
+        dict: Dicionário de pesos da rede.
+    """
+
+    def converter():
+        checkpoint = torch.load(model_path, map_location='cpu')
+        for chave in ('params_ema', 'params'):
+            if chave in checkpoint:
+                checkpoint = checkpoint[chave]
+                break
+        return contiguous_tensors(checkpoint)
+
+    pesos = load_weights(model_path, converter)
+    if torch.device(device).type != 'cpu':
+        pesos = {k: v.to(device) for k, v in pesos.items()}
+    return pesos
+
+
+def describe_weights(pesos):
+    """
+    Identifica a arquitetura, a escala nativa e o custo de uma rede.
+
+    Args:
+        pesos (dict): Dicionário de pesos (state dict).
+
+    Returns:
+        dict: 'arch' ('rrdbnet' ou 'srvgg'), 'scale' (escala nativa),
+              'kwargs' (argumentos do construtor) e 'macs' (multiplicações
+              por pixel de entrada).
+
+    Raises:
+        ValueError: Se a arquitetura não for reconhecida.
+    """
+    if 'conv_first.weight' in pesos:
+        conv_first = pesos['conv_first.weight']
+        num_out_ch = pesos['conv_last.weight'].shape[0]
+        # RRDBNet x2 e x1 reorganizam a entrada com pixel_unshuffle
+        fator = conv_first.shape[1] // num_out_ch
+        escala = {1: 4, 4: 2, 16: 1}.get(fator)
+        if escala is None:
+            raise ValueError(
+                f'Entrada da RRDBNet não reconhecida: {conv_first.shape[1]} canais'
+            )
+
+        blocos = {int(k.split('.')[1]) for k in pesos if k.startswith('body.')}
+        kwargs = {
+            'num_in_ch': num_out_ch,
+            'num_out_ch': num_out_ch,
+            'scale': escala,
+            'num_feat': conv_first.shape[0],
+            'num_block': len(blocos),
+            'num_grow_ch': pesos['body.0.rdb1.conv1.weight'].shape[0],
+        }
+
+        # O corpo roda em (escala / 4)² da resolução de entrada; conv_up1
+        # em 4x esse tamanho e conv_up2, conv_hr e conv_last em 16x
+        resolucao = (escala / 4) ** 2
+        ampliacao = {
+            'conv_up1': 4,
+            'conv_up2': 16,
+            'conv_hr': 16,
+            'conv_last': 16,
+        }
+        macs = 0
+        for chave, tensor in pesos.items():
+            if not chave.endswith('.weight') or tensor.dim() != 4:
+                continue
+            camada = chave.split('.')[0]
+            macs += tensor.numel() * resolucao * ampliacao.get(camada, 1)
+        return {
+            'arch': 'rrdbnet',
+            'scale': escala,
+            'kwargs': kwargs,
+            'macs': macs,
+        }
+
+    if 'body.0.weight' in pesos:
+        convs = sorted(
+            (int(k.split('.')[1]), t)
+            for k, t in pesos.items()
+            if k.startswith('body.') and k.endswith('.weight') and t.dim() == 4
+        )
+        ativacoes = [
+            k
+            for k, t in pesos.items()
+            if k.startswith('body.') and k.endswith('.weight') and t.dim() == 1
+        ]
+        num_in_ch = convs[0][1].shape[1]
+        ultima = convs[-1][1]
+        escala = int(round((ultima.shape[0] / num_in_ch) ** 0.5))
+        kwargs = {
+            'num_in_ch': num_in_ch,
+            'num_out_ch': num_in_ch,
+            'num_feat': convs[0][1].shape[0],
+            'num_conv': len(convs) - 2,
+            'upscale': escala,
+            'act_type': 'prelu' if ativacoes else 'relu',
+        }
+        # Todas as convoluções rodam na resolução de entrada
+        macs = sum(t.numel() for _, t in convs)
+        return {
+            'arch': 'srvgg',
+            'scale': escala,
+            'kwargs': kwargs,
+            'macs': macs,
+        }
+
+    raise ValueError('Arquitetura de modelo não reconhecida.')
+
+
+def describe_model(model_path):
+    """
+    Descreve um arquivo de modelo, com cache por tamanho e data do arquivo.
+
+    Args:
+        model_path (str): Caminho do arquivo .pth.
+
+    Returns:
+        dict: Descrição retornada por describe_weights.
+    """
+    estado = os.stat(model_path)
+    chave = (os.path.abspath(model_path), estado.st_size, estado.st_mtime_ns)
+    if chave not in _descricoes:
+        _descricoes[chave] = describe_weights(load_state_dict(model_path))
+    return _descricoes[chave]
+
+
+def build_network(descricao):
+    """
+    Cria a rede correspondente a uma descrição (sem pesos carregados).
+
+    Args:
+        descricao (dict): Descrição retornada por describe_weights.
+
+    Returns:
+        torch.nn.Module: A rede.
+    """
+    if descricao['arch'] == 'srvgg':
+        return SRVGGNetCompact(**descricao['kwargs'])
+    return RRDBNet(**descricao['kwargs'])
+
+
+def activation_bytes_per_pixel(descricao):
+    """
+    Estima a memória de ativação em fp32 por pixel de entrada.
+
+    Args:
+        descricao (dict): Descrição retornada por describe_weights.
+
+    Returns:
+        int: Bytes por pixel de entrada.
+    """
+    return ACTIVATION_BYTES_PER_PIXEL.get(
+        (descricao['arch'], descricao['scale']), DEFAULT_BYTES_PER_PIXEL
+    )
+
+
+def list_models(models_dir=MODELS_DIR):
+    """
+    Lista os arquivos de modelo disponíveis.
+
+    Args:
+        models_dir (str, optional): Diretório dos modelos.
+
+    Returns:
+        list: Nomes dos arquivos .pth, em ordem alfabética.
+    """
+    if not os.path.isdir(models_dir):
+        return []
+    return sorted(
+        f for f in os.listdir(models_dir) if f.lower().endswith('.pth')
+    )
+
+
+def select_model(scale, models_dir=MODELS_DIR):
+    """
+    Escolhe o modelo mais barato que atende à escala pedida.
+
+    Modelos com escala nativa igual ou maior que a pedida são preferidos;
+    entre eles vence o de menor custo por pixel. Se nenhum alcança a
+    escala pedida, usa o mais barato entre os de maior escala nativa.
+
+    Args:
+        scale (float): Escala pedida.
+        models_dir (str, optional): Diretório dos modelos.
+
+    Returns:
+        str: Caminho do modelo escolhido.
+
+    Raises:
+        FileNotFoundError: Se nenhum modelo utilizável for encontrado.
+    """
+    candidatos = []
+    for nome in list_models(models_dir):
+        caminho = os.path.join(models_dir, nome)
+        try:
+            descricao = describe_model(caminho)
+        except Exception as e:
+            logger.warning(f'Modelo ignorado ({nome}): {str(e)}')
+            continue
+        candidatos.append((descricao, caminho))
+
+    if not candidatos:
+        raise FileNotFoundError(
+            f'Nenhum modelo de upscaling encontrado em: {models_dir}'
+        )
+
+    suficientes = [c for c in candidatos if c[0]['scale'] >= scale]
+    if not suficientes:
+        maior = max(d['scale'] for d, _ in candidatos)
+        suficientes = [c for c in candidatos if c[0]['scale'] == maior]
+    descricao, caminho = min(suficientes, key=lambda c: c[0]['macs'])
+
+    logger.info(
+        f'Modelo escolhido para escala {scale}x: {os.path.basename(caminho)} '
+        f"({descricao['arch']} x{descricao['scale']}, "
+        f"{descricao['macs'] / 1e6:.1f} MMAC/pixel)"
+    )
+    return caminho
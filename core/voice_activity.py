@@ -0,0 +1,241 @@
+"""
+Detecção de fala por energia, para pular trechos silenciosos antes do Whisper.
+"""
+
+import numpy as np
+
+from config.settings import TRANSCRIPTION_SETTINGS
+
+# Taxa de amostragem do áudio entregue ao Whisper
+SAMPLE_RATE = 16000
+
+# Duração de cada quadro de análise, em segundos
+FRAME_SECONDS = 0.03
+
+# Energia abaixo da qual um quadro nunca é considerado fala (dBFS)
+ABSOLUTE_FLOOR_DB = -60.0
+
+
+def frame_energy_db(audio, frame_len):
+    """
+    Calcula a energia RMS de quadros consecutivos do áudio.
+
+    Args:
+        audio (numpy.ndarray): Amostras float32 em [-1, 1].
+        frame_len (int): Amostras por quadro.
+
+    Returns:
+        numpy.ndarray: Energia de cada quadro, em dBFS.
+    """
+    n = len(audio) // frame_len
+    quadros = audio[: n * frame_len].reshape(n, frame_len)
+    rms = np.sqrt(np.mean(np.square(quadros), axis=1))
+    return 20 * np.log10(rms + 1e-10)
+
+
+def detect_speech(audio, sample_rate=SAMPLE_RATE):
+    """
+    Encontra os trechos com fala de um áudio.
+
+    Um quadro é fala quando sua energia passa do piso de ruído (percentil
+    10 das energias) por TRANSCRIPTION_SETTINGS['vad_margin_db']. Pausas
+    menores que 'vad_min_silence' são unidas à fala ao redor, trechos
+    menores que 'vad_min_speech' são descartados e cada trecho recebe
+    'vad_padding' segundos de margem dos dois lados.
+
+    Args:
+        audio (numpy.ndarray): Amostras float32 em [-1, 1].
+        sample_rate (int, optional): Taxa de amostragem.
+
+    Returns:
+        list: Pares (inicio, fim) em segundos, em ordem.
+    """
+    frame_len = int(sample_rate * FRAME_SECONDS)
+    duracao = len(audio) / sample_rate
+    energia = frame_energy_db(audio, frame_len)
+    if len(energia) == 0:
+        return []
+
+    piso = np.percentile(energia, 10)
+    limiar = max(
+        piso + TRANSCRIPTION_SETTINGS['vad_margin_db'], ABSOLUTE_FLOOR_DB
+    )
+    fala = np.concatenate(([0], (energia > limiar).astype(np.int8), [0]))
+    bordas = np.flatnonzero(np.diff(fala)) * FRAME_SECONDS
+    inicios, fins = bordas[::2], bordas[1::2]
+
+    padding = TRANSCRIPTION_SETTINGS['vad_padding']
+    trechos = []
+    for inicio, fim in zip(inicios - padding, fins + padding):
+        if trechos and inicio - trechos[-1][1] < (
+            TRANSCRIPTION_SETTINGS['vad_min_silence']
+        ):
+            trechos[-1][1] = fim
+        else:
+            trechos.append([inicio, fim])
+
+    return [
+        (max(0.0, float(inicio)), min(duracao, float(fim)))
+        for inicio, fim in trechos
+        if fim - inicio - 2 * padding
+        >= TRANSCRIPTION_SETTINGS['vad_min_speech']
+    ]
+
+
+def find_split_points(
+    audio, chunk_seconds, search_seconds, sample_rate=SAMPLE_RATE
+):
+    """
+    Escolhe onde dividir um áudio longo em partes de ~chunk_seconds.
+
+    Cada corte fica no ponto mais silencioso (energia média em meio
+    segundo) a até search_seconds do tamanho desejado, para não cortar
+    palavras no meio.
+
+    Args:
+        audio (numpy.ndarray): Amostras float32 em [-1, 1].
+        chunk_seconds (float): Duração desejada de cada parte.
+        search_seconds (float): Distância máxima do corte ao alvo.
+        sample_rate (int, optional): Taxa de amostragem.
+
+    Returns:
+        list: Índices das amostras de corte, em ordem (sem 0 e o fim).
+    """
+    frame_len = int(sample_rate * FRAME_SECONDS)
+    energia = frame_energy_db(audio, frame_len)
+    janela = max(1, int(0.5 / FRAME_SECONDS))
+    energia = np.convolve(energia, np.ones(janela) / janela, mode='same')
+
+    duracao = len(audio) / sample_rate
+    cortes = []
+    anterior = 0.0
+    while duracao - anterior > chunk_seconds + search_seconds:
+        alvo = anterior + chunk_seconds
+        i0 = int((alvo - search_seconds) / FRAME_SECONDS)
+        i1 = int((alvo + search_seconds) / FRAME_SECONDS)
+        quadro = i0 + int(np.argmin(energia[i0:i1]))
+        anterior = (quadro + 0.5) * FRAME_SECONDS
+        cortes.append(int(anterior * sample_rate))
+    return cortes
+
+
+def stream_blocks(
+    reader,
+    chunk_seconds,
+    search_seconds,
+    overlap_seconds=0.0,
+    sample_rate=SAMPLE_RATE,
+):
+    """
+    Divide um áudio lido aos pedaços em blocos de ~chunk_seconds.
+
+    Os cortes são escolhidos como em find_split_points, mas só com o
+    trecho já lido: a memória usada fica limitada a um bloco (mais a busca
+    e a sobreposição), qualquer que seja a duração do áudio.
+
+    Args:
+        reader (utils.audio_stream.AudioReader): Fonte das amostras.
+        chunk_seconds (float): Duração desejada de cada bloco.
+        search_seconds (float): Distância máxima do corte ao alvo.
+        overlap_seconds (float, optional): Segundos dos blocos vizinhos
+            incluídos antes e depois de cada bloco.
+        sample_rate (int, optional): Taxa de amostragem.
+
+    Yields:
+        tuple: (origem, inicio, fim, amostras) - índices (desde o início da
+               leitura) da primeira amostra entregue, do início e do fim do
+               bloco, e as amostras de origem até fim mais a sobreposição.
+    """
+    necessario = int((chunk_seconds + search_seconds + 1) * sample_rate)
+    sobra = int(overlap_seconds * sample_rate)
+    buffer = np.zeros(0, dtype=np.float32)
+    base = 0  # Índice da primeira amostra ainda não entregue
+    prefixo = 0  # Amostras de sobreposição mantidas antes de base
+    terminou = False
+
+    while True:
+        while not terminou and len(buffer) - prefixo < necessario + sobra:
+            dados = reader.read(necessario + sobra - (len(buffer) - prefixo))
+            if len(dados) == 0:
+                terminou = True
+            else:
+                buffer = np.concatenate((buffer, dados))
+
+        restante = len(buffer) - prefixo
+        if restante == 0:
+            return
+        if restante < necessario:
+            yield base - prefixo, base, base + restante, buffer
+            return
+
+        corte = find_split_points(
+            buffer[prefixo:], chunk_seconds, search_seconds, sample_rate
+        )[0]
+        yield base - prefixo, base, base + corte, buffer[
+            : prefixo + corte + sobra
+        ]
+
+        manter = min(sobra, prefixo + corte)
+        buffer = buffer[prefixo + corte - manter :].copy()
+        prefixo = manter
+        base += corte
+
+
+def group_windows(trechos, max_seconds=30.0):
+    """
+    Agrupa trechos de fala consecutivos em janelas para o Whisper.
+
+    Cada janela soma no máximo max_seconds de fala; um trecho maior que
+    isso fica sozinho na sua janela (o Whisper o divide internamente).
+
+    Args:
+        trechos (list): Pares (inicio, fim) em segundos.
+        max_seconds (float, optional): Duração máxima de fala por janela.
+
+    Returns:
+        list: Listas de pares (inicio, fim), uma por janela.
+    """
+    janelas = []
+    total = 0.0
+    for inicio, fim in trechos:
+        if janelas and total + (fim - inicio) <= max_seconds:
+            janelas[-1].append((inicio, fim))
+            total += fim - inicio
+        else:
+            janelas.append([(inicio, fim)])
+            total = fim - inicio
+    return janelas
+
+
+class TimelineMap:
+    """
+    Converte tempos do áudio recortado (trechos concatenados) para tempos
+    do áudio original.
+    """
+
+    def __init__(self, trechos):
+        """
+        Args:
+            trechos (list): Pares (inicio, fim) originais, na ordem em que
+                            foram concatenados.
+        """
+        self._partes = []
+        posicao = 0.0
+        for inicio, fim in trechos:
+            self._partes.append((posicao, inicio, fim))
+            posicao += fim - inicio
+
+    def to_original(self, t):
+        """
+        Converte um tempo do áudio recortado para o áudio original.
+
+        Args:
+            t (float): Segundos desde o início do áudio recortado.
+
+        Returns:
+            float: Segundos desde o início do áudio original.
+        """
+        for posicao, inicio, fim in self._partes:
+            if t <= posicao + (fim - inicio):
+                return inicio + max(0.0, t - posicao)
+        return self._partes[-1][2]
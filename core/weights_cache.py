@@ -0,0 +1,99 @@
+"""
+Cache de pesos convertidos para carregamento mapeado em memória.
+"""
+
+import os
+import re
+
+import torch
+
+from config.settings import CACHE_DIR, MODEL_REGISTRY
+from utils.file_utils import atomic_output, ensure_dir_exists
+from utils.logging_utils import setup_logger
+
+logger = setup_logger('weights_cache')
+
+# Diretório dos checkpoints convertidos
+WEIGHTS_CACHE_DIR = os.path.join(CACHE_DIR, 'weights')
+
+
+def cached_weights_path(source_path):
+    """
+    Caminho do checkpoint convertido de um arquivo de pesos.
+
+    O nome inclui o tamanho e a data de modificação do original, então uma
+    troca do arquivo gera uma nova conversão.
+
+    Args:
+        source_path (str): Arquivo de pesos original.
+
+    Returns:
+        str: Caminho do checkpoint convertido.
+    """
+    stat = os.stat(source_path)
+    nome = os.path.splitext(os.path.basename(source_path))[0]
+    return os.path.join(
+        WEIGHTS_CACHE_DIR, f'{nome}-{stat.st_size}-{stat.st_mtime_ns}.pt'
+    )
+
+
+def load_weights(source_path, convert):
+    """
+    Carrega pesos mapeados em memória, convertendo-os na primeira vez.
+
+    O checkpoint convertido contém apenas tensores contíguos (e metadados
+    simples) no formato zip do PyTorch, que torch.load lê com mmap=True:
+    os tensores apontam para as páginas do arquivo em vez de serem
+    copiados, e processos que carregam o mesmo modelo compartilham essas
+    páginas pelo cache do sistema operacional.
+
+    Args:
+        source_path (str): Arquivo de pesos original.
+        convert (callable): Função sem argumentos que lê o original e
+            devolve o dicionário a ser gravado.
+
+    Returns:
+        dict: Dicionário devolvido por convert, com tensores mapeados.
+    """
+    if not MODEL_REGISTRY['mmap_weights']:
+        return convert()
+
+    destino = cached_weights_path(source_path)
+    if not os.path.exists(destino):
+        logger.info(f'Convertendo pesos para leitura mapeada: {destino}')
+        dados = convert()
+        ensure_dir_exists(WEIGHTS_CACHE_DIR)
+        # Outro processo pode ter gravado (e aberto) a mesma conversão
+        with atomic_output(destino, keep_existing=True) as temp_path:
+            torch.save(dados, temp_path)
+        _remove_stale(destino)
+
+    return torch.load(
+        destino, map_location='cpu', mmap=True, weights_only=True
+    )
+
+
+def _remove_stale(destino):
+    """Remove conversões antigas do mesmo arquivo de pesos."""
+    nome = os.path.basename(destino).rsplit('-', 2)[0]
+    # Só <nome>-<tamanho>-<data>.pt: 'large' não pode casar com 'large-v3'
+    padrao = re.compile(re.escape(nome) + r'-\d+-\d+\.pt')
+    for entrada in os.scandir(WEIGHTS_CACHE_DIR):
+        if entrada.path != destino and padrao.fullmatch(entrada.name):
+            try:
+                os.remove(entrada.path)
+            except OSError:
+                pass
+
+
+def contiguous_tensors(state_dict):
+    """
+    Copia um state dict para tensores contíguos em CPU.
+
+    Args:
+        state_dict (dict): Pesos da rede.
+
+    Returns:
+        dict: Pesos prontos para serem gravados.
+    """
+    return {k: v.detach().cpu().contiguous() for k, v in state_dict.items()}
@@ -6,6 +6,7 @@ Este arquivo inicializa o ambiente e lança a interface gráfica.
 import sys
 import os
 import logging
+import multiprocessing
 
 # Configurar ambiente de execução
 def setup_environment():
@@ -59,4 +60,6 @@ def main():
 
 
 if __name__ == '__main__':
+    # Necessário para pools de processos no executável congelado
+    multiprocessing.freeze_support()
     main()
@@ -7,6 +7,7 @@ import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
 import threading
+import time
 from PIL import Image, ImageTk
 import sys
 
@@ -19,14 +20,16 @@ from ui.widgets import (
 )
 from ui.theme import setup_modern_theme, COLORS
 from core.video_processor import VideoProcessor
-from core.frame_extractor import FrameExtractor
-from core.image_enhancer import ImageEnhancer
+from core.frame_extractor import FrameExtractor, parse_timecode, parse_roi
+from core.image_enhancer import ImageEnhancer, parse_target
+from core.upscale_models import list_models
 from core.transcriber import Transcriber
 from config.settings import (
     VIDEO_SETTINGS,
     FRAME_EXTRACTION,
     UPSCALE_SETTINGS,
     TRANSCRIPTION_SETTINGS,
+    TRANSCRIPTION_PRESETS,
     SUPPORTED_EXTENSIONS,
 )
 from utils.logging_utils import setup_logger
@@ -325,13 +328,40 @@ class FrameExtractorTab(ProcessingTab):
 
     def _create_widgets(self):
         """Cria os widgets específicos para a aba de extração de frames."""
+        # Modos de operação
+        self.operation_mode = tk.StringVar(value='file')
+
+        ttk.Radiobutton(
+            self.controls_frame,
+            text='Processar um vídeo',
+            variable=self.operation_mode,
+            value='file',
+            command=self._update_selector_mode,
+        ).pack(padx=5, pady=5, anchor='w')
+
+        ttk.Radiobutton(
+            self.controls_frame,
+            text='Processar pasta de vídeos',
+            variable=self.operation_mode,
+            value='dir',
+            command=self._update_selector_mode,
+        ).pack(padx=5, pady=5, anchor='w')
+
+        # Container para os seletores
+        self.selector_container = ttk.Frame(self.controls_frame)
+        self.selector_container.pack(fill='x', padx=5, pady=5)
+
         # Seletor de arquivo
         self.file_selector = FileSelector(
-            self.controls_frame,
+            self.selector_container,
             file_types=[('Arquivos de vídeo', '*.mp4 *.mov *.avi *.mkv')],
             title='Selecione o arquivo de vídeo',
         )
-        self.file_selector.pack(fill='x', padx=5, pady=5)
+
+        # Seletor de diretório
+        self.dir_selector = DirectorySelector(
+            self.selector_container, title='Selecione a pasta com vídeos'
+        )
 
         # Opções de extração
         ttk.Label(self.options_frame, text='Método de extração:').grid(
@@ -356,11 +386,17 @@ class FrameExtractorTab(ProcessingTab):
             variable=self.extraction_method,
             value='diferenca',
         ).grid(row=0, column=3, padx=5, pady=5, sticky='w')
+        ttk.Radiobutton(
+            self.options_frame,
+            text='Diferença (duas passagens)',
+            variable=self.extraction_method,
+            value='duas_passagens',
+        ).grid(row=0, column=4, padx=5, pady=5, sticky='w')
 
         # Frame para opções adicionais
         self.adv_options_frame = ttk.Frame(self.options_frame)
         self.adv_options_frame.grid(
-            row=1, column=0, columnspan=4, padx=5, pady=5, sticky='w'
+            row=1, column=0, columnspan=5, padx=5, pady=5, sticky='w'
         )
 
         # Opções para detecção de cenas
@@ -400,6 +436,31 @@ class FrameExtractorTab(ProcessingTab):
             variable=self.use_threshold_detector,
         ).grid(row=2, column=0, columnspan=2, padx=5, pady=5, sticky='w')
 
+        # Trecho do vídeo e região de interesse
+        ttk.Label(self.adv_options_frame, text='Início (s ou MM:SS):').grid(
+            row=0, column=2, padx=5, pady=5, sticky='w'
+        )
+        self.start_time = tk.StringVar()
+        ttk.Entry(
+            self.adv_options_frame, textvariable=self.start_time, width=10
+        ).grid(row=0, column=3, padx=5, pady=5, sticky='w')
+
+        ttk.Label(self.adv_options_frame, text='Fim (s ou MM:SS):').grid(
+            row=1, column=2, padx=5, pady=5, sticky='w'
+        )
+        self.end_time = tk.StringVar()
+        ttk.Entry(
+            self.adv_options_frame, textvariable=self.end_time, width=10
+        ).grid(row=1, column=3, padx=5, pady=5, sticky='w')
+
+        ttk.Label(
+            self.adv_options_frame, text='Região (x,y,largura,altura):'
+        ).grid(row=2, column=2, padx=5, pady=5, sticky='w')
+        self.roi = tk.StringVar()
+        ttk.Entry(
+            self.adv_options_frame, textvariable=self.roi, width=18
+        ).grid(row=2, column=3, padx=5, pady=5, sticky='w')
+
         # Botão para processar
         self.process_button = ttk.Button(
             self.controls_frame,
@@ -408,42 +469,89 @@ class FrameExtractorTab(ProcessingTab):
         )
         self.process_button.pack(pady=10)
 
+        # Inicializar o seletor apropriado
+        self._update_selector_mode()
+
+    def _update_selector_mode(self):
+        """Atualiza o seletor de acordo com o modo selecionado."""
+        mode = self.operation_mode.get()
+
+        # Limpar o container
+        for child in self.selector_container.winfo_children():
+            child.pack_forget()
+
+        # Mostrar o seletor apropriado
+        if mode == 'file':
+            self.file_selector.pack(fill='x')
+        else:
+            self.dir_selector.pack(fill='x')
+
     def _extract_frames(self):
         """Inicia a extração de frames."""
-        video_path = self.file_selector.get_path()
+        mode = self.operation_mode.get()
 
-        if not video_path:
-            messagebox.showerror('Erro', 'Selecione um arquivo de vídeo.')
-            return
+        if mode == 'file':
+            video_path = self.file_selector.get_path()
+            if not video_path:
+                messagebox.showerror('Erro', 'Selecione um arquivo de vídeo.')
+                return
+        else:
+            video_path = self.dir_selector.get_path()
+            if not video_path:
+                messagebox.showerror('Erro', 'Selecione uma pasta.')
+                return
 
         if not os.path.exists(video_path):
             messagebox.showerror(
-                'Erro', f'Arquivo não encontrado: {video_path}'
+                'Erro', f'Caminho não encontrado: {video_path}'
             )
             return
 
+        try:
+            start = parse_timecode(self.start_time.get())
+            end = parse_timecode(self.end_time.get())
+            roi = parse_roi(self.roi.get())
+        except ValueError as e:
+            messagebox.showerror('Erro', f'Opção inválida: {e}')
+            return
+
         # Desabilitar botão durante o processamento
         self.process_button.configure(state='disabled')
         self.set_status('Extraindo frames...')
         self.start_progress()
 
         # Iniciar o processamento em uma thread separada
+        target = (
+            self._run_frame_extraction
+            if mode == 'file'
+            else self._run_batch_extraction
+        )
         threading.Thread(
-            target=self._run_frame_extraction, args=(video_path,), daemon=True
+            target=target,
+            args=(video_path, start, end, roi),
+            daemon=True,
         ).start()
 
-    def _run_frame_extraction(self, video_path):
+    def _run_frame_extraction(
+        self, video_path, start=None, end=None, roi=None
+    ):
         """
         Executa a extração de frames em uma thread separada.
 
         Args:
             video_path (str): Caminho do vídeo para extrair frames.
+            start (float, optional): Início do trecho em segundos.
+            end (float, optional): Fim do trecho em segundos.
+            roi (tuple, optional): Região de interesse (x, y, largura, altura).
         """
         try:
             # Criar extrator de frames com as opções selecionadas
             extractor = FrameExtractor(
                 threshold=self.threshold.get(),
                 max_frames=FRAME_EXTRACTION['max_frames'],
+                start=start,
+                end=end,
+                roi=roi,
             )
 
             # Escolher o método de extração
@@ -465,6 +573,12 @@ class FrameExtractorTab(ProcessingTab):
                     diff_threshold=int(self.threshold.get()),
                     min_scene_length=FRAME_EXTRACTION['min_scene_length'],
                 )
+            elif method == 'duas_passagens':
+                output_dir = extractor.detect_scenes_two_pass(
+                    video_path,
+                    diff_threshold=int(self.threshold.get()),
+                    min_scene_length=FRAME_EXTRACTION['min_scene_length'],
+                )
 
             # Atualizar a UI na thread principal
             self.after(0, self._extraction_finished, output_dir)
@@ -474,6 +588,94 @@ class FrameExtractorTab(ProcessingTab):
             logger.error(f'Erro ao extrair frames: {str(e)}', exc_info=True)
             self.after(0, self._processing_error, str(e))
 
+    def _run_batch_extraction(self, video_dir, start=None, end=None, roi=None):
+        """
+        Executa a extração de frames de uma pasta de vídeos em uma thread separada.
+
+        Args:
+            video_dir (str): Pasta com os vídeos.
+            start (float, optional): Início do trecho em segundos.
+            end (float, optional): Fim do trecho em segundos.
+            roi (tuple, optional): Região de interesse (x, y, largura, altura).
+        """
+        try:
+            extractor = FrameExtractor(
+                threshold=self.threshold.get(),
+                max_frames=FRAME_EXTRACTION['max_frames'],
+                start=start,
+                end=end,
+                roi=roi,
+            )
+
+            method = self.extraction_method.get()
+            kwargs = {}
+            if method == 'cenas':
+                kwargs[
+                    'usar_threshold_detector'
+                ] = self.use_threshold_detector.get()
+            elif method == 'regulares':
+                kwargs['intervalo'] = self.interval.get()
+            elif method in ('diferenca', 'duas_passagens'):
+                kwargs['diff_threshold'] = int(self.threshold.get())
+                kwargs['min_scene_length'] = FRAME_EXTRACTION[
+                    'min_scene_length'
+                ]
+
+            resumo = extractor.extract_batch(
+                video_dir,
+                method=method,
+                progress_callback=lambda atual, total, resultado: self.after(
+                    0, self._batch_progress, atual, total, resultado
+                ),
+                **kwargs,
+            )
+
+            self.after(0, self._batch_finished, resumo)
+
+        except Exception as e:
+            logger.error(f'Erro ao extrair frames: {str(e)}', exc_info=True)
+            self.after(0, self._processing_error, str(e))
+
+    def _batch_progress(self, current, total, result):
+        """
+        Callback para quando um vídeo do lote é concluído.
+
+        Args:
+            current (int): Número de vídeos concluídos.
+            total (int): Número total de vídeos.
+            result (dict): Resultado do vídeo concluído.
+        """
+        self.set_progress(current, total)
+        nome = os.path.basename(result['video_path'])
+        situacao = 'falhou' if result['error'] else 'concluído'
+        self.set_status(f'[{current}/{total}] {nome} {situacao}')
+
+    def _batch_finished(self, summary):
+        """
+        Callback para quando a extração em lote é concluída.
+
+        Args:
+            summary (dict): Resumo retornado por FrameExtractor.extract_batch.
+        """
+        self.process_button.configure(state='normal')
+        self.stop_progress()
+        self.set_status('Extração em lote concluída!')
+
+        mensagem = (
+            f"Vídeos processados: {summary['processed']}/{summary['videos']}\n"
+            f"Frames salvos: {summary['frames_saved']}\n"
+            f"Velocidade: {summary['fps']:.1f} fps\n"
+            f"Salvos em:\n{summary['output_dir']}"
+        )
+        if summary['failures']:
+            falhas = '\n'.join(
+                os.path.basename(path) for path, _ in summary['failures']
+            )
+            mensagem += f'\n\nFalhas:\n{falhas}'
+            messagebox.showwarning('Concluído com falhas', mensagem)
+        else:
+            messagebox.showinfo('Concluído', mensagem)
+
     def _extraction_finished(self, output_dir):
         """
         Callback para quando a extração é concluída com sucesso.
@@ -534,6 +736,14 @@ class ImageUpscalerTab(ProcessingTab):
             command=self._update_selector_mode,
         ).pack(padx=5, pady=5, anchor='w')
 
+        ttk.Radiobutton(
+            self.controls_frame,
+            text='Processar um vídeo',
+            variable=self.operation_mode,
+            value='video',
+            command=self._update_selector_mode,
+        ).pack(padx=5, pady=5, anchor='w')
+
         # Container para os seletores
         self.selector_container = ttk.Frame(self.controls_frame)
         self.selector_container.pack(fill='x', padx=5, pady=5)
@@ -550,6 +760,13 @@ class ImageUpscalerTab(ProcessingTab):
             self.selector_container, title='Selecione a pasta com imagens'
         )
 
+        # Seletor de vídeo
+        self.video_selector = FileSelector(
+            self.selector_container,
+            file_types=[('Vídeos', '*.mp4 *.avi *.mov *.mkv')],
+            title='Selecione o vídeo',
+        )
+
         # Opções de upscaling
         ttk.Label(self.options_frame, text='Fator de escala:').grid(
             row=0, column=0, padx=5, pady=5, sticky='w'
@@ -565,6 +782,37 @@ class ImageUpscalerTab(ProcessingTab):
         )
         self.scale_spin.grid(row=0, column=1, padx=5, pady=5, sticky='w')
 
+        ttk.Label(self.options_frame, text='Tile (px):').grid(
+            row=1, column=0, padx=5, pady=5, sticky='w'
+        )
+        self.tile = tk.StringVar(value=str(UPSCALE_SETTINGS['tile']))
+        tile_combo = ttk.Combobox(
+            self.options_frame, textvariable=self.tile, width=6
+        )
+        tile_combo['values'] = ('auto', '0', '128', '256', '512')
+        tile_combo.grid(row=1, column=1, padx=5, pady=5, sticky='w')
+
+        ttk.Label(self.options_frame, text='Modelo:').grid(
+            row=2, column=0, padx=5, pady=5, sticky='w'
+        )
+        self.model_name = tk.StringVar(value=UPSCALE_SETTINGS['model_name'])
+        model_combo = ttk.Combobox(
+            self.options_frame,
+            textvariable=self.model_name,
+            state='readonly',
+            width=28,
+        )
+        model_combo['values'] = ['auto'] + list_models()
+        model_combo.grid(row=2, column=1, padx=5, pady=5, sticky='w')
+
+        ttk.Label(
+            self.options_frame, text='Resolução alvo (ex: 1920x, 8mp):'
+        ).grid(row=3, column=0, padx=5, pady=5, sticky='w')
+        self.target = tk.StringVar()
+        ttk.Entry(self.options_frame, textvariable=self.target, width=12).grid(
+            row=3, column=1, padx=5, pady=5, sticky='w'
+        )
+
         # Botão para processar
         self.process_button = ttk.Button(
             self.controls_frame,
@@ -587,6 +835,8 @@ class ImageUpscalerTab(ProcessingTab):
         # Mostrar o seletor apropriado
         if mode == 'file':
             self.file_selector.pack(fill='x')
+        elif mode == 'video':
+            self.video_selector.pack(fill='x')
         else:
             self.dir_selector.pack(fill='x')
 
@@ -600,6 +850,11 @@ class ImageUpscalerTab(ProcessingTab):
             if not path:
                 messagebox.showerror('Erro', 'Selecione uma imagem.')
                 return
+        elif mode == 'video':
+            path = self.video_selector.get_path()
+            if not path:
+                messagebox.showerror('Erro', 'Selecione um vídeo.')
+                return
         else:
             path = self.dir_selector.get_path()
             if not path:
@@ -610,6 +865,19 @@ class ImageUpscalerTab(ProcessingTab):
             messagebox.showerror('Erro', f'Caminho não encontrado: {path}')
             return
 
+        tile = self.tile.get().strip()
+        if tile != 'auto':
+            if not tile.isdigit():
+                messagebox.showerror('Erro', f'Tile inválido: {tile}')
+                return
+            tile = int(tile)
+
+        try:
+            target = parse_target(self.target.get())
+        except ValueError as e:
+            messagebox.showerror('Erro', f'Opção inválida: {e}')
+            return
+
         # Desabilitar botão durante o processamento
         self.process_button.configure(state='disabled')
         self.set_status('Processando imagens...')
@@ -617,25 +885,37 @@ class ImageUpscalerTab(ProcessingTab):
 
         # Iniciar o processamento em uma thread separada
         threading.Thread(
-            target=self._run_image_processing, args=(path, mode), daemon=True
+            target=self._run_image_processing,
+            args=(path, mode, tile, target),
+            daemon=True,
         ).start()
 
-    def _run_image_processing(self, path, mode):
+    def _run_image_processing(self, path, mode, tile='auto', target=None):
         """
         Executa o processamento de imagens em uma thread separada.
 
         Args:
             path (str): Caminho da imagem ou diretório.
-            mode (str): Modo de operação ('file' ou 'dir').
+            mode (str): Modo de operação ('file', 'dir' ou 'video').
+            tile (int or str, optional): Tamanho do tile ou 'auto'.
+            target (dict, optional): Resolução alvo (ver parse_target).
         """
         try:
             # Criar enhancer com as opções selecionadas
-            enhancer = ImageEnhancer(scale=self.scale_factor.get())
+            enhancer = ImageEnhancer(
+                model_path=self.model_name.get(),
+                scale=self.scale_factor.get(),
+                tile=tile,
+                **(target or {}),
+            )
 
             # Processar de acordo com o modo
             if mode == 'file':
                 output_path = enhancer.enhance_image(path)
                 self.after(0, self._processing_finished_file, output_path)
+            elif mode == 'video':
+                output_path = enhancer.enhance_video(path)
+                self.after(0, self._processing_finished_video, output_path)
             else:
                 output_dir = enhancer.process_directory(path)
                 self.after(0, self._processing_finished_dir, output_dir)
@@ -650,16 +930,41 @@ class ImageUpscalerTab(ProcessingTab):
         Callback para quando o processamento de um arquivo é concluído.
 
         Args:
-            output_path (str): Caminho da imagem processada.
+            output_path (str or None): Caminho da imagem processada, ou None
+                se ela já atingia a resolução alvo.
         """
         self.process_button.configure(state='normal')
         self.stop_progress()
+        if output_path is None:
+            self.set_status('Imagem ignorada: já atinge a resolução alvo.')
+            messagebox.showinfo(
+                'Concluído',
+                'A imagem já atinge a resolução alvo.\n'
+                'Nenhum arquivo foi gerado.',
+            )
+            return
+
         self.set_status('Processamento concluído!')
         messagebox.showinfo(
             'Concluído',
             f'Imagem processada com sucesso!\nSalva em:\n{output_path}',
         )
 
+    def _processing_finished_video(self, output_path):
+        """
+        Callback para quando o processamento de um vídeo é concluído.
+
+        Args:
+            output_path (str): Caminho do vídeo processado.
+        """
+        self.process_button.configure(state='normal')
+        self.stop_progress()
+        self.set_status('Processamento concluído!')
+        messagebox.showinfo(
+            'Concluído',
+            f'Vídeo processado com sucesso!\nSalvo em:\n{output_path}',
+        )
+
     def _processing_finished_dir(self, output_dir):
         """
         Callback para quando o processamento de um diretório é concluído.
@@ -735,6 +1040,33 @@ class TranscriptionTab(ProcessingTab):
         language_combo['values'] = ('pt', 'en', 'es', 'fr', 'de', 'it', 'auto')
         language_combo.grid(row=1, column=1, padx=5, pady=5, sticky='w')
 
+        ttk.Label(self.options_frame, text='Preset:').grid(
+            row=2, column=0, padx=5, pady=5, sticky='w'
+        )
+        self.preset = tk.StringVar(value=TRANSCRIPTION_SETTINGS['preset'])
+        preset_combo = ttk.Combobox(
+            self.options_frame,
+            textvariable=self.preset,
+            state='readonly',
+            width=10,
+        )
+        preset_combo['values'] = list(TRANSCRIPTION_PRESETS)
+        preset_combo.grid(row=2, column=1, padx=5, pady=5, sticky='w')
+
+        self.use_vad = tk.BooleanVar(value=TRANSCRIPTION_SETTINGS['vad'])
+        ttk.Checkbutton(
+            self.options_frame,
+            text='Pular silêncios (transcrever só a fala)',
+            variable=self.use_vad,
+        ).grid(row=3, column=0, columnspan=2, padx=5, pady=5, sticky='w')
+
+        self.use_batch = tk.BooleanVar(value=TRANSCRIPTION_SETTINGS['batched'])
+        ttk.Checkbutton(
+            self.options_frame,
+            text='Decodificar em lotes (mais rápido, sem contexto entre trechos)',
+            variable=self.use_batch,
+        ).grid(row=4, column=0, columnspan=2, padx=5, pady=5, sticky='w')
+
         # Botão para processar
         self.process_button = ttk.Button(
             self.controls_frame,
@@ -778,32 +1110,104 @@ class TranscriptionTab(ProcessingTab):
             )
             return
 
+        # Criar transcritor com as opções selecionadas
+        transcriber = Transcriber(
+            model_name=self.model.get(),
+            language=self.language.get(),
+            use_vad=self.use_vad.get(),
+            preset=self.preset.get(),
+            use_batch=self.use_batch.get(),
+        )
+
         # Desabilitar botão durante o processamento
         self.process_button.configure(state='disabled')
-        self.set_status('Transcrevendo arquivo...')
+        self.set_status('Procurando transcrição interrompida...')
         self.start_progress()
+
+        # O ponto de retomada exige o hash do arquivo: fora da interface
+        threading.Thread(
+            target=self._find_checkpoint,
+            args=(transcriber, file_path),
+            daemon=True,
+        ).start()
+
+    def _find_checkpoint(self, transcriber, file_path):
+        """
+        Procura um ponto de retomada do arquivo em uma thread separada.
+
+        Args:
+            transcriber (Transcriber): Transcritor configurado.
+            file_path (str): Caminho do arquivo a ser transcrito.
+        """
+        try:
+            ponto = transcriber.find_checkpoint(file_path)
+        except Exception as e:
+            logger.error(
+                f'Erro ao procurar transcrição interrompida: {str(e)}',
+                exc_info=True,
+            )
+            self.after(0, self._processing_error, str(e))
+            return
+
+        self.after(0, self._start_transcription, transcriber, file_path, ponto)
+
+    def _start_transcription(self, transcriber, file_path, ponto):
+        """
+        Oferece a retomada, se houver, e inicia a transcrição.
+
+        Args:
+            transcriber (Transcriber): Transcritor configurado.
+            file_path (str): Caminho do arquivo a ser transcrito.
+            ponto (dict or None): Ponto de retomada encontrado.
+        """
+        resume = False
+        self._transcription_offset = 0.0
+        if ponto is not None:
+            resume = messagebox.askyesno(
+                'Transcrição interrompida',
+                'Este arquivo tem uma transcrição interrompida em '
+                f"{self._format_duration(ponto['processed'])} de "
+                f"{self._format_duration(ponto['duration'])}.\n"
+                'Deseja continuar de onde parou?',
+            )
+            if resume:
+                self._transcription_offset = ponto['processed']
+
+        self.set_status('Transcrevendo arquivo...')
         self.transcription_text.delete(1.0, tk.END)
+        self._transcription_start = time.time()
 
         # Iniciar o processamento em uma thread separada
         threading.Thread(
-            target=self._run_transcription, args=(file_path,), daemon=True
+            target=self._run_transcription,
+            args=(transcriber, file_path, resume),
+            daemon=True,
         ).start()
 
-    def _run_transcription(self, file_path):
+    def _run_transcription(self, transcriber, file_path, resume):
         """
         Executa a transcrição em uma thread separada.
 
         Args:
+            transcriber (Transcriber): Transcritor configurado.
             file_path (str): Caminho do arquivo a ser transcrito.
+            resume (bool): Continuar a transcrição interrompida do arquivo.
         """
         try:
-            # Criar transcritor com as opções selecionadas
-            transcriber = Transcriber(
-                model_name=self.model.get(), language=self.language.get()
-            )
+            # Mostrar cada bloco da transcrição quando concluído
+            def progresso(processados, total, segmentos):
+                self.after(
+                    0,
+                    self._transcription_progress,
+                    processados,
+                    total,
+                    segmentos,
+                )
 
             # Transcrever o arquivo
-            output_path, srt_path, text = transcriber.transcribe(file_path)
+            output_path, srt_path, text = transcriber.transcribe(
+                file_path, progress_callback=progresso, resume=resume
+            )
 
             # Atualizar a UI na thread principal
             self.after(
@@ -817,6 +1221,44 @@ class TranscriptionTab(ProcessingTab):
             )
             self.after(0, self._processing_error, str(e))
 
+    def _transcription_progress(self, processed, total, segments):
+        """
+        Callback para quando um bloco do áudio é transcrito.
+
+        Args:
+            processed (float): Segundos de áudio já transcritos.
+            total (float): Duração total do áudio, em segundos.
+            segments (list): Segmentos do bloco concluído.
+        """
+        status = f'Transcrevendo: {self._format_duration(processed)}'
+        # Sem a duração total a barra segue indeterminada e não há como
+        # estimar o tempo restante
+        if total > 0:
+            self.set_progress(int(processed), int(total))
+            status += f' de {self._format_duration(total)}'
+            # Ao retomar, o primeiro bloco só repete o já transcrito
+            feito = processed - self._transcription_offset
+            if feito > 0:
+                decorrido = time.time() - self._transcription_start
+                restante = max(0.0, decorrido * (total - processed) / feito)
+                status += f' (restam ~{self._format_duration(restante)})'
+        self.set_status(status)
+
+        # Texto parcial, no fim da área de transcrição
+        self.transcription_text.insert(
+            tk.END, ''.join(s['text'] for s in segments)
+        )
+        self.transcription_text.see(tk.END)
+
+    @staticmethod
+    def _format_duration(seconds):
+        """Formata segundos como MM:SS (ou H:MM:SS)."""
+        minutos, segundos = divmod(int(seconds), 60)
+        horas, minutos = divmod(minutos, 60)
+        if horas:
+            return f'{horas}:{minutos:02d}:{segundos:02d}'
+        return f'{minutos:02d}:{segundos:02d}'
+
     def _transcription_finished(self, output_path, srt_path, text):
         """
         Callback para quando a transcrição é concluída com sucesso.
@@ -328,9 +328,24 @@ class ProcessingTab(ttk.Frame):
 
     def start_progress(self):
         """Inicia a animação da barra de progresso."""
+        self.progress.configure(mode='indeterminate', value=0)
         self.progress.start()
         self.update_idletasks()
 
+    def set_progress(self, current, total):
+        """
+        Exibe progresso determinado na barra de progresso.
+
+        Args:
+            current (int): Quantidade de itens concluídos.
+            total (int): Quantidade total de itens.
+        """
+        self.progress.stop()
+        self.progress.configure(
+            mode='determinate', maximum=max(total, 1), value=current
+        )
+        self.update_idletasks()
+
     def stop_progress(self):
         """Para a animação da barra de progresso."""
         self.progress.stop()
@@ -0,0 +1,140 @@
+"""
+Leitura de áudio por pipe do ffmpeg, em pedaços de tamanho limitado.
+"""
+
+import os
+import re
+import threading
+import subprocess
+from collections import deque
+
+import numpy as np
+import imageio_ffmpeg
+
+# Taxa de amostragem entregue ao Whisper
+SAMPLE_RATE = 16000
+
+
+def probe_duration(path):
+    """
+    Lê a duração de um arquivo de mídia no cabeçalho mostrado pelo ffmpeg.
+
+    Args:
+        path (str): Caminho do arquivo.
+
+    Returns:
+        float or None: Duração em segundos, ou None se for desconhecida.
+    """
+    saida = subprocess.run(
+        [imageio_ffmpeg.get_ffmpeg_exe(), '-hide_banner', '-i', path],
+        capture_output=True,
+        text=True,
+        errors='replace',
+    ).stderr
+    encontrado = re.search(r'Duration: (\d+):(\d+):(\d+(?:\.\d+)?)', saida)
+    if encontrado is None:
+        return None
+    horas, minutos, segundos = encontrado.groups()
+    return int(horas) * 3600 + int(minutos) * 60 + float(segundos)
+
+
+class AudioReader:
+    """
+    Decodifica o áudio de um arquivo (de áudio ou vídeo) em PCM mono de
+    16 kHz, lido aos pedaços de um pipe do ffmpeg.
+
+    Só o pedaço pedido fica na memória, então o consumo não depende da
+    duração da gravação, e vídeos não precisam de um WAV temporário.
+    """
+
+    def __init__(self, path, start=0.0, sample_rate=SAMPLE_RATE):
+        """
+        Inicia o processo do ffmpeg.
+
+        Args:
+            path (str): Caminho do arquivo.
+            start (float, optional): Segundo a partir do qual ler.
+            sample_rate (int, optional): Taxa de amostragem da saída.
+
+        Raises:
+            FileNotFoundError: Se o arquivo não existir.
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        self.duration = probe_duration(path)
+
+        comando = [imageio_ffmpeg.get_ffmpeg_exe(), '-nostdin']
+        if start:
+            comando += ['-ss', f'{start:.3f}']
+        comando += [
+            '-i',
+            path,
+            '-vn',
+            '-f',
+            's16le',
+            '-ac',
+            '1',
+            '-acodec',
+            'pcm_s16le',
+            '-ar',
+            str(sample_rate),
+            '-loglevel',
+            'error',
+            '-',
+        ]
+        self._processo = subprocess.Popen(
+            comando, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+
+        # Ler o stderr enquanto o ffmpeg roda: com o pipe cheio ele trava
+        self._erros = deque(maxlen=20)
+        self._leitor = threading.Thread(target=self._read_stderr, daemon=True)
+        self._leitor.start()
+
+    def _read_stderr(self):
+        """Guarda as últimas linhas do stderr do ffmpeg."""
+        for linha in self._processo.stderr:
+            self._erros.append(linha.decode(errors='replace').strip())
+
+    def read(self, n_samples=None):
+        """
+        Lê as próximas amostras.
+
+        Args:
+            n_samples (int, optional): Número de amostras; None lê até o fim.
+
+        Returns:
+            numpy.ndarray: Amostras float32 em [-1, 1]; menos que n_samples
+                           (ou vazio) no fim do áudio.
+
+        Raises:
+            RuntimeError: Se o ffmpeg terminar com erro.
+        """
+        if n_samples is None:
+            dados = self._processo.stdout.read()
+        else:
+            dados = self._processo.stdout.read(n_samples * 2)
+
+        if n_samples is None or len(dados) < n_samples * 2:
+            if self._processo.wait() != 0:
+                self._leitor.join()
+                erro = ' '.join(self._erros)
+                raise RuntimeError(f'Falha ao decodificar o áudio: {erro}')
+
+        dados = dados[: len(dados) // 2 * 2]
+        return np.frombuffer(dados, np.int16).astype(np.float32) / 32768.0
+
+    def close(self):
+        """Encerra o processo do ffmpeg."""
+        if self._processo.poll() is None:
+            self._processo.kill()
+        self._processo.wait()
+        self._processo.stdout.close()
+        self._leitor.join()
+        self._processo.stderr.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
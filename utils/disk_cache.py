@@ -0,0 +1,108 @@
+"""
+Armazenamento em disco com limite de tamanho e descarte LRU.
+"""
+
+import os
+import threading
+
+from utils.logging_utils import setup_logger
+
+logger = setup_logger('disk_cache')
+
+
+class DiskCache:
+    """
+    Entradas em arquivos, indexadas por chaves hexadecimais.
+
+    Cada entrada fica em cache_dir/<2 primeiros caracteres>/<chave><ext>.
+    A data de modificação de uma entrada marca seu último uso; quando o
+    total passa de max_bytes, as entradas mais antigas são removidas.
+    Vários processos podem usar o mesmo diretório ao mesmo tempo. Como as
+    chaves são calculadas e as entradas gravadas fica a cargo de quem usa
+    o armazenamento.
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        """
+        Inicializa o armazenamento.
+
+        Args:
+            cache_dir (str): Diretório das entradas.
+            max_bytes (int): Tamanho máximo em bytes.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total = None
+
+    def _entry_path(self, key, ext):
+        """Caminho da entrada de uma chave."""
+        return os.path.join(self.cache_dir, key[:2], key + ext.lower())
+
+    def lookup(self, key, ext):
+        """
+        Procura uma entrada e marca seu uso.
+
+        Args:
+            key (str): Chave da entrada.
+            ext (str): Extensão do arquivo da entrada.
+
+        Returns:
+            str or None: Caminho da entrada, ou None se não existir.
+        """
+        caminho = self._entry_path(key, ext)
+        try:
+            os.utime(caminho)
+        except OSError:
+            return None
+        return caminho
+
+    def _track(self, caminho):
+        """Soma uma nova entrada ao total e aplica o limite de tamanho."""
+        with self._lock:
+            if self._total is None:
+                self._total = sum(size for _, size, _ in self._scan())
+            else:
+                self._total += os.path.getsize(caminho)
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _scan(self):
+        """Lista as entradas como (caminho, tamanho, último uso)."""
+        entradas = []
+        if not os.path.isdir(self.cache_dir):
+            return entradas
+
+        for subdir in os.scandir(self.cache_dir):
+            if not subdir.is_dir():
+                continue
+            for entrada in os.scandir(subdir.path):
+                try:
+                    stat = entrada.stat()
+                except OSError:
+                    continue
+                entradas.append((entrada.path, stat.st_size, stat.st_mtime))
+        return entradas
+
+    def _evict(self):
+        """Remove as entradas usadas há mais tempo até respeitar o limite."""
+        entradas = sorted(self._scan(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entradas)
+        removidas = 0
+
+        for caminho, size, _ in entradas:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(caminho)
+            except OSError:
+                continue
+            total -= size
+            removidas += 1
+
+        self._total = total
+        if removidas:
+            logger.info(
+                f'{removidas} entradas removidas de {self.cache_dir} (limite '
+                f'de {self.max_bytes / 1024 / 1024:.0f} MB).'
+            )
@@ -4,6 +4,8 @@ Funções utilitárias para manipulação de arquivos.
 
 import os
 import tempfile
+import threading
+from contextlib import contextmanager
 from config.settings import (
     SUPPORTED_EXTENSIONS,
 )  # Certificar que SUPPORTED_EXTENSIONS está definido corretamente
@@ -73,6 +75,71 @@ def create_temp_file(suffix=None):
     return temp_path
 
 
+# Marcador dos arquivos temporários de saídas ainda incompletas
+PARTIAL_MARKER = '.parcial'
+
+
+@contextmanager
+def atomic_output(output_path, keep_existing=False):
+    """
+    Fornece um caminho temporário que substitui output_path ao final.
+
+    O arquivo só aparece com o nome definitivo depois de escrito por
+    completo; se ocorrer um erro, o temporário é removido. O temporário é
+    próprio de cada processo e thread, então escritas simultâneas do mesmo
+    arquivo (por exemplo, processos que convertem os mesmos pesos) não se
+    misturam: a última a terminar prevalece.
+
+    Com keep_existing, usado em saídas endereçadas pelo conteúdo, um
+    output_path que já existe é mantido e o temporário é descartado: o
+    arquivo gravado por outro escritor é equivalente e pode estar aberto
+    (no Windows, um arquivo mapeado em memória não pode ser substituído).
+
+    Args:
+        output_path (str): Caminho final do arquivo.
+        keep_existing (bool, optional): Não substituir um output_path que
+                                        já exista.
+
+    Yields:
+        str: Caminho temporário, com a mesma extensão, onde escrever.
+    """
+    directory, filename = os.path.split(output_path)
+    name, ext = os.path.splitext(filename)
+    dono = f'{os.getpid()}-{threading.get_ident()}'
+    temp_path = os.path.join(directory, f'.{name}-{dono}{PARTIAL_MARKER}{ext}')
+
+    try:
+        yield temp_path
+        if not (keep_existing and os.path.exists(output_path)):
+            try:
+                os.replace(temp_path, output_path)
+            except PermissionError:
+                # Outro escritor terminou primeiro e o arquivo está em uso
+                if not (keep_existing and os.path.exists(output_path)):
+                    raise
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def remove_partial_files(directory):
+    """
+    Remove saídas incompletas deixadas por uma execução interrompida.
+
+    Args:
+        directory (str): Diretório a ser limpo.
+
+    Returns:
+        int: Número de arquivos removidos.
+    """
+    removidos = 0
+    for filename in os.listdir(directory):
+        if filename.startswith('.') and PARTIAL_MARKER in filename:
+            os.remove(os.path.join(directory, filename))
+            removidos += 1
+    return removidos
+
+
 def ensure_dir_exists(directory):
     """
     Garante que um diretório existe, criando-o se necessário.
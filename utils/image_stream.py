@@ -0,0 +1,287 @@
+"""
+Leitura e escrita de imagens em faixas de linhas, sem carregá-las inteiras.
+"""
+
+import os
+import zlib
+import struct
+import tempfile
+
+import numpy as np
+import tifffile
+from PIL import Image
+
+# Assinatura de arquivos PNG
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Linhas decodificadas por vez ao converter imagens comprimidas
+DECODE_ROWS = 256
+
+
+def _raw_layout(imagem):
+    """
+    Obtém a disposição dos pixels de uma imagem RGB não comprimida.
+
+    Args:
+        imagem (PIL.Image.Image): Imagem aberta (ainda não carregada).
+
+    Returns:
+        tuple or None: (offset, stride, rawmode, orientacao), ou None se a
+                       imagem não puder ser mapeada diretamente do arquivo.
+    """
+    if imagem.mode != 'RGB' or not imagem.tile:
+        return None
+
+    largura, altura = imagem.size
+    tiles = sorted(imagem.tile, key=lambda t: t[1][1])
+    primeiro = tiles[0]
+
+    layout = None
+    for codec, extents, offset, args in tiles:
+        if codec != 'raw' or extents[0] != 0 or extents[2] != largura:
+            return None
+        if isinstance(args, str):
+            args = (args, 0, 1)
+        rawmode, stride, orientacao = (tuple(args) + (0, 1))[:3]
+        stride = stride or largura * 3
+        if rawmode not in ('RGB', 'BGR'):
+            return None
+
+        # As faixas precisam estar contíguas no arquivo
+        esperado = primeiro[2] + extents[1] * stride
+        if offset != esperado or (orientacao != 1 and len(tiles) > 1):
+            return None
+        layout = (primeiro[2], stride, rawmode, orientacao)
+
+    if tiles[-1][1][3] != altura:
+        return None
+    return layout
+
+
+class RowSource:
+    """
+    Acesso a faixas de linhas de uma imagem, em RGB uint8.
+
+    Formatos não comprimidos (BMP, PPM, TIFF sem compressão) são mapeados
+    direto do arquivo. Os demais são decodificados uma vez para um arquivo
+    temporário mapeado em memória, de modo que a imagem decodificada não
+    fique na memória durante o processamento. TIFFs comprimidos são
+    decodificados por segmento, com memória limitada; PNG, JPEG e outros
+    formatos que o PIL só decodifica inteiros passam pela memória uma vez
+    durante essa conversão.
+    """
+
+    def __init__(self, path):
+        """
+        Abre a imagem.
+
+        Args:
+            path (str): Caminho da imagem.
+        """
+        self._temp_path = None
+
+        with Image.open(path) as imagem:
+            self.width, self.height = imagem.size
+            layout = _raw_layout(imagem)
+
+        if layout is not None:
+            offset, stride, rawmode, orientacao = layout
+            self._rows = np.memmap(
+                path,
+                dtype=np.uint8,
+                mode='r',
+                offset=offset,
+                shape=(self.height, stride),
+            )
+            self._bgr = rawmode == 'BGR'
+            self._bottom_up = orientacao == -1
+        else:
+            self._rows = self._decode_to_disk(path)
+            self._bgr = False
+            self._bottom_up = False
+
+    def _decode_to_disk(self, path):
+        """
+        Decodifica a imagem para um arquivo temporário mapeado.
+
+        TIFFs RGB de 8 bits são decodificados por segmento (faixa ou tile)
+        direto no arquivo. Nos demais formatos a imagem é decodificada
+        inteira pelo PIL, e só a conversão para RGB é feita por faixa, para
+        não criar uma segunda cópia da imagem.
+        """
+        descritor, self._temp_path = tempfile.mkstemp(suffix='.rgb')
+        os.close(descritor)
+
+        linhas = np.memmap(
+            self._temp_path,
+            dtype=np.uint8,
+            mode='w+',
+            shape=(self.height, self.width * 3),
+        )
+        if not self._decode_tiff(path, linhas):
+            with Image.open(path) as imagem:
+                imagem.load()
+                for y0 in range(0, self.height, DECODE_ROWS):
+                    y1 = min(self.height, y0 + DECODE_ROWS)
+                    faixa = imagem.crop((0, y0, self.width, y1))
+                    if faixa.mode != 'RGB':
+                        faixa = faixa.convert('RGB')
+                    linhas[y0:y1] = np.asarray(faixa).reshape(y1 - y0, -1)
+        linhas.flush()
+        return linhas
+
+    def _decode_tiff(self, path, linhas):
+        """
+        Decodifica um TIFF RGB de 8 bits segmento a segmento no mapeamento.
+
+        Args:
+            path (str): Caminho da imagem.
+            linhas (numpy.memmap): Destino (altura, largura * 3).
+
+        Returns:
+            bool: False se o arquivo não for um TIFF nesse formato.
+        """
+        try:
+            tif = tifffile.TiffFile(path)
+        except (tifffile.TiffFileError, OSError):
+            return False
+
+        with tif:
+            pagina = tif.pages[0]
+            if pagina.shape != (self.height, self.width, 3) or (
+                pagina.dtype != np.uint8
+            ):
+                return False
+            pagina.asarray(out=linhas.reshape(self.height, self.width, 3))
+        return True
+
+    def read(self, y0, y1):
+        """
+        Lê as linhas [y0, y1) da imagem.
+
+        Args:
+            y0 (int): Primeira linha.
+            y1 (int): Linha final (exclusiva).
+
+        Returns:
+            numpy.ndarray: Faixa RGB (y1 - y0, largura, 3) uint8.
+        """
+        if self._bottom_up:
+            faixa = self._rows[self.height - y1 : self.height - y0][::-1]
+        else:
+            faixa = self._rows[y0:y1]
+
+        faixa = faixa[:, : self.width * 3].reshape(y1 - y0, self.width, 3)
+        if self._bgr:
+            faixa = faixa[..., ::-1]
+        return np.ascontiguousarray(faixa)
+
+    def close(self):
+        """Libera o mapeamento e remove o arquivo temporário, se houver."""
+        self._rows = None
+        if self._temp_path and os.path.exists(self._temp_path):
+            os.remove(self._temp_path)
+            self._temp_path = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _png_chunk(arquivo, tipo, dados):
+    """Grava um chunk PNG (tamanho, tipo, dados e CRC)."""
+    arquivo.write(struct.pack('>I', len(dados)))
+    arquivo.write(tipo)
+    arquivo.write(dados)
+    arquivo.write(struct.pack('>I', zlib.crc32(tipo + dados) & 0xFFFFFFFF))
+
+
+def write_png_rows(path, width, height, blocks, level=6):
+    """
+    Grava um PNG RGB a partir de faixas de linhas, à medida que chegam.
+
+    Args:
+        path (str): Arquivo de saída.
+        width (int): Largura da imagem.
+        height (int): Altura da imagem.
+        blocks (iterable): Faixas (linhas, width, 3) uint8, de cima para baixo.
+        level (int, optional): Nível de compressão zlib.
+
+    Raises:
+        ValueError: Se o total de linhas recebidas for diferente de height.
+    """
+    compressor = zlib.compressobj(level)
+    linhas = 0
+
+    with open(path, 'wb') as f:
+        f.write(PNG_SIGNATURE)
+        _png_chunk(
+            f, b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+        )
+
+        for bloco in blocks:
+            n = bloco.shape[0]
+            dados = np.empty((n, 1 + width * 3), dtype=np.uint8)
+            # Filtro Sub: cada byte menos o byte do pixel à esquerda
+            dados[:, 0] = 1
+            bruto = bloco.reshape(n, -1)
+            dados[:, 1:4] = bruto[:, :3]
+            np.subtract(bruto[:, 3:], bruto[:, :-3], out=dados[:, 4:])
+
+            comprimido = compressor.compress(dados.tobytes())
+            if comprimido:
+                _png_chunk(f, b'IDAT', comprimido)
+            linhas += n
+
+        _png_chunk(f, b'IDAT', compressor.flush())
+        _png_chunk(f, b'IEND', b'')
+
+    if linhas != height:
+        raise ValueError(
+            f'PNG incompleto: {linhas} de {height} linhas recebidas.'
+        )
+
+
+def write_tiff_rows(path, width, height, blocks, tile=256):
+    """
+    Grava um TIFF RGB em tiles a partir de faixas de linhas.
+
+    Apenas uma faixa de tile de altura fica em memória por vez.
+
+    Args:
+        path (str): Arquivo de saída.
+        width (int): Largura da imagem.
+        height (int): Altura da imagem.
+        blocks (iterable): Faixas (linhas, width, 3) uint8, de cima para baixo.
+        tile (int, optional): Lado dos tiles (múltiplo de 16).
+    """
+
+    def faixa_em_tiles(faixa):
+        for x0 in range(0, width, tile):
+            parte = faixa[:, x0 : x0 + tile]
+            bloco = np.zeros((tile, tile, 3), dtype=np.uint8)
+            bloco[: parte.shape[0], : parte.shape[1]] = parte
+            yield bloco
+
+    def tiles():
+        pendente = np.empty((0, width, 3), dtype=np.uint8)
+        for bloco in blocks:
+            pendente = np.concatenate([pendente, bloco])
+            while len(pendente) >= tile:
+                yield from faixa_em_tiles(pendente[:tile])
+                pendente = pendente[tile:]
+        if len(pendente):
+            yield from faixa_em_tiles(pendente)
+
+    tifffile.imwrite(
+        path,
+        tiles(),
+        shape=(height, width, 3),
+        dtype=np.uint8,
+        tile=(tile, tile),
+        photometric='rgb',
+        compression='zlib',
+        bigtiff=height * width * 3 > 2**32 - 2**26,
+    )
@@ -0,0 +1,64 @@
+"""
+Funções utilitárias para consultar recursos do sistema.
+"""
+
+import os
+import sys
+import ctypes
+
+
+def get_cpu_count():
+    """
+    Obtém o número de núcleos de CPU que este processo pode usar.
+
+    Returns:
+        int: Número de núcleos (respeitando a afinidade do processo).
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def get_available_memory():
+    """
+    Obtém a quantidade de memória RAM disponível no sistema.
+
+    Usa /proc/meminfo no Linux e GlobalMemoryStatusEx no Windows, com
+    os.sysconf como último recurso.
+
+    Returns:
+        int: Memória disponível em bytes (0 se não for possível determinar).
+    """
+    if sys.platform.startswith('linux'):
+        try:
+            with open('/proc/meminfo', encoding='utf-8') as f:
+                for linha in f:
+                    if linha.startswith('MemAvailable:'):
+                        return int(linha.split()[1]) * 1024
+        except OSError:
+            pass
+
+    if sys.platform == 'win32':
+
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [
+                ('dwLength', ctypes.c_ulong),
+                ('dwMemoryLoad', ctypes.c_ulong),
+                ('ullTotalPhys', ctypes.c_ulonglong),
+                ('ullAvailPhys', ctypes.c_ulonglong),
+                ('ullTotalPageFile', ctypes.c_ulonglong),
+                ('ullAvailPageFile', ctypes.c_ulonglong),
+                ('ullTotalVirtual', ctypes.c_ulonglong),
+                ('ullAvailVirtual', ctypes.c_ulonglong),
+                ('ullAvailExtendedVirtual', ctypes.c_ulonglong),
+            ]
+
+        status = MEMORYSTATUSEX()
+        status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return int(status.ullAvailPhys)
+
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (ValueError, OSError, AttributeError):
+        return 0
@@ -0,0 +1,272 @@
+"""
+Leitura e escrita de quadros de vídeo por pipes do ffmpeg.
+"""
+
+import re
+import queue
+import subprocess
+import threading
+
+import numpy as np
+import imageio_ffmpeg
+
+# Quadros-chave iniciais usados para decidir como amostrar o vídeo
+SAMPLE_PROBE_FRAMES = 3
+
+
+class VideoReader:
+    """
+    Decodifica um vídeo quadro a quadro, em RGB uint8.
+
+    Os quadros chegam do ffmpeg por um pipe, um de cada vez, sem passar
+    pelo disco.
+    """
+
+    def __init__(self, path):
+        """
+        Abre o vídeo e lê seus metadados.
+
+        Args:
+            path (str): Caminho do vídeo.
+        """
+        self._frames = imageio_ffmpeg.read_frames(path)
+        meta = next(self._frames)
+
+        self.width, self.height = meta['size']
+        self.fps = meta['fps'] or 30.0
+        self.duration = meta['duration']
+        self.audio_codec = meta.get('audio_codec')
+
+    @property
+    def frame_count(self):
+        """int: Número estimado de quadros (pela duração)."""
+        return int(round(self.fps * self.duration))
+
+    def __iter__(self):
+        forma = (self.height, self.width, 3)
+        for dados in self._frames:
+            yield np.frombuffer(dados, dtype=np.uint8).reshape(forma)
+
+    def close(self):
+        """Encerra o processo do ffmpeg."""
+        self._frames.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class VideoWriter:
+    """
+    Codifica quadros RGB uint8 em um vídeo, opcionalmente com o áudio de
+    outro arquivo.
+    """
+
+    def __init__(
+        self,
+        path,
+        width,
+        height,
+        fps,
+        codec='libx264',
+        crf=18,
+        audio_path=None,
+        audio_codec='copy',
+    ):
+        """
+        Inicia o processo do ffmpeg.
+
+        Args:
+            path (str): Arquivo de saída.
+            width (int): Largura dos quadros.
+            height (int): Altura dos quadros.
+            fps (float): Quadros por segundo.
+            codec (str, optional): Codec de vídeo do ffmpeg.
+            crf (int, optional): Qualidade constante (menor é melhor).
+            audio_path (str, optional): Arquivo de onde copiar o áudio.
+            audio_codec (str, optional): Codec de áudio ('copy' mantém o
+                                         original sem recodificar).
+        """
+        self._frames = imageio_ffmpeg.write_frames(
+            path,
+            (width, height),
+            fps=fps,
+            codec=codec,
+            quality=None,
+            macro_block_size=2,
+            output_params=['-crf', str(crf)],
+            audio_path=audio_path,
+            audio_codec=audio_codec if audio_path else None,
+        )
+        self._frames.send(None)
+
+    def write(self, quadro):
+        """
+        Envia um quadro ao codificador.
+
+        Args:
+            quadro (numpy.ndarray): Quadro (altura, largura, 3) uint8.
+        """
+        self._frames.send(np.ascontiguousarray(quadro))
+
+    def close(self):
+        """Finaliza o arquivo e espera o ffmpeg terminar."""
+        self._frames.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def sample_frames(path, step, fps, size, crop=None, start=0.0):
+    """
+    Decodifica só uma amostra dos quadros de um vídeo, em tons de cinza.
+
+    Os pacotes descartados são removidos antes do decodificador (filtro
+    de bitstream noise), então não custam decodificação. Em vídeos com
+    GOP longo (H.264, HEVC...) só os quadros-chave são decodificados; se
+    os primeiros quadros-chave estiverem a menos de step quadros uns dos
+    outros (codecs só intra, como MJPEG), a leitura recomeça mantendo um
+    a cada step pacotes.
+
+    Args:
+        path (str): Caminho do vídeo.
+        step (int): Distância desejada, em quadros, entre amostras.
+        fps (float): Quadros por segundo do vídeo.
+        size (tuple): (largura, altura) das amostras.
+        crop (tuple, optional): Região (x, y, largura, altura) recortada
+                                antes da redução.
+        start (float, optional): Segundo a partir do qual amostrar; o
+                                 ffmpeg busca direto até ele.
+
+    Yields:
+        tuple: (segundos, quadro) - tempo da amostra desde o primeiro
+               quadro do vídeo e a imagem (altura, largura) uint8.
+
+    Raises:
+        RuntimeError: Se o ffmpeg terminar com erro.
+    """
+    filtros = []
+    if crop is not None:
+        x, y, largura, altura = crop
+        filtros.append(f'crop={largura}:{altura}:{x}:{y}')
+    filtros += [f'scale={size[0]}:{size[1]}:flags=area', 'format=gray']
+    descartes = ['not(key)', f'not(key)+gt(mod(n\\,{step})\\,0)']
+
+    for tentativa, descarte in enumerate(descartes):
+        amostras = _read_samples(
+            path, descarte, ','.join(filtros), size, start
+        )
+        try:
+            iniciais = []
+            for amostra in amostras:
+                iniciais.append(amostra)
+                if len(iniciais) == SAMPLE_PROBE_FRAMES:
+                    break
+
+            tempos = [segundos for segundos, _ in iniciais]
+            if (
+                tentativa == 0
+                and len(tempos) > 1
+                and min(np.diff(tempos)) * fps < step
+            ):
+                # Quadros-chave densos: decodificar um a cada step
+                continue
+
+            # Após a busca os tempos já contam a partir de start; sem ela,
+            # a partir do primeiro quadro-chave
+            inicio = start - (tempos[0] if tempos and not start else 0.0)
+            for segundos, quadro in iniciais:
+                yield inicio + segundos, quadro
+            for segundos, quadro in amostras:
+                yield inicio + segundos, quadro
+            return
+        finally:
+            amostras.close()
+
+
+def _read_samples(path, descarte, filtros, size, start=0.0):
+    """
+    Executa o ffmpeg descartando pacotes antes da decodificação.
+
+    O tempo de cada quadro vem do filtro showinfo, lido do stderr por uma
+    thread (o que também impede o pipe de encher e travar o ffmpeg).
+
+    Args:
+        path (str): Caminho do vídeo.
+        descarte (str): Expressão 'drop' do filtro de bitstream noise.
+        filtros (str): Filtros de vídeo aplicados antes do showinfo.
+        size (tuple): (largura, altura) dos quadros de saída.
+        start (float, optional): Segundo onde começar a leitura.
+
+    Yields:
+        tuple: (segundos, quadro) de cada quadro decodificado, com tempos
+               desde start.
+
+    Raises:
+        RuntimeError: Se o ffmpeg terminar com erro.
+    """
+    comando = [imageio_ffmpeg.get_ffmpeg_exe(), '-hide_banner', '-nostdin']
+    if start:
+        comando += ['-ss', f'{start:.3f}']
+    processo = subprocess.Popen(
+        comando
+        + [
+            '-nostats',
+            '-bsf:v',
+            f'noise=drop={descarte}',
+            '-i',
+            path,
+            '-an',
+            '-sn',
+            '-vf',
+            f'{filtros},showinfo',
+            '-fps_mode',
+            'passthrough',
+            '-f',
+            'rawvideo',
+            '-',
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    tempos = queue.Queue()
+    erros = []
+
+    def ler_stderr():
+        for linha in processo.stderr:
+            linha = linha.decode(errors='replace')
+            encontrado = re.search(r'pts_time:(\S+)', linha)
+            if encontrado and 'showinfo' in linha:
+                tempos.put(float(encontrado.group(1)))
+            else:
+                erros.append(linha.strip())
+                del erros[:-20]
+
+    leitor = threading.Thread(target=ler_stderr, daemon=True)
+    leitor.start()
+
+    tamanho = size[0] * size[1]
+    try:
+        while True:
+            dados = processo.stdout.read(tamanho)
+            if len(dados) < tamanho:
+                break
+            quadro = np.frombuffer(dados, np.uint8).reshape(size[1], size[0])
+            yield tempos.get(), quadro
+
+        if processo.wait() != 0:
+            raise RuntimeError(
+                f'Falha ao amostrar o vídeo: {" ".join(erros[-3:])}'
+            )
+    finally:
+        if processo.poll() is None:
+            processo.kill()
+        processo.wait()
+        processo.stdout.close()
+        leitor.join()
+        processo.stderr.close()